@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Tuple
+from .config import settings
+
+
+class TTLCache:
+    """
+    Process-local LRU cache whose entries also expire after `ttl` seconds.
+
+    Each worker process has its own copy, so writes made through another process
+    are only seen here once the TTL runs out.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (True, value) on a hit and (False, None) on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters, for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+
+# Novel list pages keyed by their query parameters, and novel details keyed by id. Both hold
+# what every user shares; each user's counters are overlaid per request.
+novel_list_cache = TTLCache("novel_list", settings.NOVEL_CACHE_MAX_ENTRIES, settings.NOVEL_CACHE_TTL_SECONDS)
+novel_detail_cache = TTLCache("novel_detail", settings.NOVEL_CACHE_MAX_ENTRIES, settings.NOVEL_CACHE_TTL_SECONDS)
+# Search totals and facet counts keyed by the search filters, shared by every page of a search
+search_facet_cache = TTLCache("search_facets", settings.NOVEL_CACHE_MAX_ENTRIES, settings.NOVEL_CACHE_TTL_SECONDS)
+# Rendered continue-reading responses, keyed by user and query parameters
+reading_cache = TTLCache("reading", settings.NOVEL_CACHE_MAX_ENTRIES, settings.NOVEL_CACHE_TTL_SECONDS)
+
+
+def invalidate_novel(novel_id: Any = None) -> None:
+    """
+    Forget what is cached about a novel after a write. Any novel can appear in any
+    list page or search, so those entries are all dropped; without an id every
+    detail is too.
+    """
+    novel_list_cache.clear()
+    search_facet_cache.clear()
+    reading_cache.clear()
+    if novel_id is None:
+        novel_detail_cache.clear()
+    else:
+        novel_detail_cache.invalidate(str(novel_id))
+
+
+def invalidate_reading() -> None:
+    """Forget the continue-reading responses after a user's progress changed."""
+    reading_cache.clear()
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every novel cache."""
+    return {cache.name: cache.stats() for cache in (novel_list_cache, novel_detail_cache, search_facet_cache, reading_cache)}
@@ -16,6 +16,83 @@ class Settings(BaseSettings):
     # MongoDB settings
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "webnovel_manager")
+    # Connection pool of the Motor client
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    MONGODB_MAX_IDLE_TIME_MS: int | None = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS")) if os.getenv("MONGODB_MAX_IDLE_TIME_MS") else None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int | None = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS")) if os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS") else None
+    # Wire compression in order of preference, e.g. "zstd,snappy,zlib"; zstd needs the zstandard
+    # package and snappy python-snappy, unavailable ones are skipped
+    MONGODB_COMPRESSORS: str = os.getenv("MONGODB_COMPRESSORS", "")
+    # Read preference of every route, and of the read-only listing routes (novel summaries,
+    # search, chapter lists) which tolerate slightly stale data and can use secondaries
+    MONGODB_READ_PREFERENCE: str = os.getenv("MONGODB_READ_PREFERENCE", "primary")
+    MONGODB_LISTING_READ_PREFERENCE: str = os.getenv("MONGODB_LISTING_READ_PREFERENCE", "secondaryPreferred")
+    MONGODB_LISTING_READ_CONCERN: str = os.getenv("MONGODB_LISTING_READ_CONCERN", "local")
+    # How far behind the primary a secondary may be to serve listing reads (-1: no limit, else >= 90)
+    MONGODB_LISTING_MAX_STALENESS_SECONDS: int = int(os.getenv("MONGODB_LISTING_MAX_STALENESS_SECONDS", "-1"))
+
+    # In-process cache of novel list and detail responses
+    NOVEL_CACHE_TTL_SECONDS: float = float(os.getenv("NOVEL_CACHE_TTL_SECONDS", "30"))
+    NOVEL_CACHE_MAX_ENTRIES: int = int(os.getenv("NOVEL_CACHE_MAX_ENTRIES", "512"))
+
+    # Change-stream driven cache invalidation (needs a replica set)
+    CHANGE_STREAMS_ENABLED: bool = os.getenv("CHANGE_STREAMS_ENABLED", "false").lower() == "true"
+
+    # Documents per cursor batch and per bulk_write in schema migrations (app.db.migrations)
+    MIGRATION_BATCH_SIZE: int = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+
+    # User of requests without an X-User-Id header, and owner of the progress migrated from
+    # the time progress was global
+    DEFAULT_USER_ID: str = os.getenv("DEFAULT_USER_ID", "default")
+
+    # Requests using more MongoDB commands than this are logged
+    DB_OPERATIONS_WARN_THRESHOLD: int = int(os.getenv("DB_OPERATIONS_WARN_THRESHOLD", "10"))
+
+    # Shared HTTP clients (app.services.http_client), one per host: HTTP/2 when the h2 package
+    # is installed, connections per host, idle connections kept per host and for how long
+    HTTP_CLIENT_HTTP2: bool = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", "10"))
+    HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST: int = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST", "5"))
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    # Default request timeout; scrapers pass their own
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", "30"))
+
+    # On-disk cache of fetched pages (app.services.http_cache), revalidated with ETag /
+    # Last-Modified: where and how many compressed bytes it keeps, and how many parse results
+    # are kept in memory to skip parsing pages whose body did not change
+    HTTP_CACHE_ENABLED: bool = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    HTTP_CACHE_DIR: str = os.getenv("HTTP_CACHE_DIR", "storage/http_cache")
+    HTTP_CACHE_MAX_BYTES: int = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    HTTP_CACHE_PARSED_ENTRIES: int = int(os.getenv("HTTP_CACHE_PARSED_ENTRIES", "256"))
+
+    # Default politeness limits per scraped host, for scrapers whose ScraperConfig sets none
+    HOST_REQUESTS_PER_SECOND: float = float(os.getenv("HOST_REQUESTS_PER_SECOND", "2"))
+    HOST_BURST: int = int(os.getenv("HOST_BURST", "4"))
+    HOST_MAX_CONCURRENCY: int = int(os.getenv("HOST_MAX_CONCURRENCY", "4"))
+    # Pause of a host answering 429/503 without Retry-After, and the longest Retry-After honored
+    HOST_THROTTLE_BACKOFF_SECONDS: float = float(os.getenv("HOST_THROTTLE_BACKOFF_SECONDS", "10"))
+    HOST_RETRY_AFTER_MAX_SECONDS: float = float(os.getenv("HOST_RETRY_AFTER_MAX_SECONDS", "300"))
+
+    # AIMD tuning of each scraped host's concurrency (app.services.adaptive_concurrency): requests per
+    # evaluation window, bounds, error rate and p95 latency growth still counted as healthy, the
+    # cut on 429/5xx/timeouts, and how often learned limits are saved to MongoDB
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = os.getenv("ADAPTIVE_CONCURRENCY_ENABLED", "true").lower() == "true"
+    ADAPTIVE_WINDOW: int = int(os.getenv("ADAPTIVE_WINDOW", "20"))
+    ADAPTIVE_MIN_CONCURRENCY: int = int(os.getenv("ADAPTIVE_MIN_CONCURRENCY", "1"))
+    ADAPTIVE_MAX_CONCURRENCY: int = int(os.getenv("ADAPTIVE_MAX_CONCURRENCY", "16"))
+    ADAPTIVE_ERROR_RATE_THRESHOLD: float = float(os.getenv("ADAPTIVE_ERROR_RATE_THRESHOLD", "0.05"))
+    ADAPTIVE_LATENCY_TOLERANCE: float = float(os.getenv("ADAPTIVE_LATENCY_TOLERANCE", "2.0"))
+    ADAPTIVE_DECREASE_FACTOR: float = float(os.getenv("ADAPTIVE_DECREASE_FACTOR", "0.5"))
+    ADAPTIVE_SAVE_INTERVAL_SECONDS: float = float(os.getenv("ADAPTIVE_SAVE_INTERVAL_SECONDS", "30"))
+
+    # Shared Chromium for the Playwright scrapers: pages leased at once, leases of a page before
+    # its context is replaced, and the longest wait for a free page
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+    BROWSER_PAGE_MAX_USES: int = int(os.getenv("BROWSER_PAGE_MAX_USES", "50"))
+    BROWSER_POOL_LEASE_TIMEOUT_SECONDS: float = float(os.getenv("BROWSER_POOL_LEASE_TIMEOUT_SECONDS", "120"))
+    # Launch the browser at startup rather than on the first scrape that needs it
+    BROWSER_POOL_PREWARM: bool = os.getenv("BROWSER_POOL_PREWARM", "true").lower() == "true"
 
     # DeepL settings
     DEEPL_API_KEY: str | None = os.getenv("DEEPL_API_KEY")
@@ -0,0 +1,29 @@
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize documents read from MongoDB (ObjectIds, datetimes) with orjson."""
+    return orjson.dumps(content, default=_default)
+
+
+class MongoJSONResponse(JSONResponse):
+    """
+    JSON response for hot read endpoints. The content is shaped by a Mongo projection
+    and was validated when it was written, so FastAPI's response_model validation is
+    skipped; the response_model is only used for the OpenAPI schema. Already rendered
+    bytes (e.g. from a cache) are sent as they are.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
@@ -0,0 +1,19 @@
+import re
+from typing import Optional
+from fastapi import Header, HTTPException, status
+from .config import settings
+
+# Ids are chosen by the clients (one per household member), so only their shape is checked
+USER_ID_RE = re.compile(r"^[A-Za-z0-9_.@-]{1,64}$")
+
+
+def get_user_id(x_user_id: Optional[str] = Header(None, description="Reader whose progress is read and written")) -> str:
+    """Dependency giving the user of the request, from the X-User-Id header or DEFAULT_USER_ID."""
+    if x_user_id is None or x_user_id == "":
+        return settings.DEFAULT_USER_ID
+    if not USER_ID_RE.match(x_user_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="X-User-Id must be 1 to 64 letters, digits or any of _.@-"
+        )
+    return x_user_id
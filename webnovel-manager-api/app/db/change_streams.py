@@ -0,0 +1,124 @@
+import asyncio
+from typing import Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+from ..core.cache import invalidate_novel, invalidate_reading
+from .database import NOVEL_COLLECTION, READING_PROGRESS_COLLECTION
+
+# Server errors meaning the saved resume token can no longer be used
+STALE_TOKEN_CODES = {260, 280, 286}  # InvalidResumeToken, ChangeStreamFatalError, ChangeStreamHistoryLost
+# Change streams need a replica set or sharded cluster
+NOT_SUPPORTED_CODES = {40573}
+
+# Collections whose writes invalidate cached responses
+WATCHED_COLLECTIONS = [NOVEL_COLLECTION, READING_PROGRESS_COLLECTION]
+
+# Longest wait for new events
+MAX_AWAIT_TIME_MS = 1000
+RETRY_DELAY = 5
+
+
+class ChangeStreamWatcher:
+    """
+    Watches the `novels` and `reading_progress` collections and invalidates this process's
+    caches when another worker (or this one) writes to them.
+
+    Chapter writes are covered too: every chapter write path also updates the novel
+    document (counters or last_updated_chapters). Progress writes clear the
+    continue-reading cache.
+
+    Each process watches from the moment it starts: its caches start empty, so there is
+    nothing to invalidate for earlier writes. The resume token is kept in memory only, so
+    the stream picks up where it stopped after a network error.
+    """
+
+    def __init__(self):
+        self.events = 0
+        self.running = False
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._token: Optional[Dict[str, Any]] = None
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        """Start watching in a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self) -> None:
+        """Stop watching."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        """Whether the watcher is running and how many events it handled."""
+        return {
+            "running": self.running,
+            "watching": WATCHED_COLLECTIONS,
+            "events": self.events,
+            "has_resume_token": self._token is not None,
+            "last_error": self.last_error
+        }
+
+    def _handle(self, change: Dict[str, Any]) -> None:
+        self.events += 1
+        collection = change.get("ns", {}).get("coll")
+        document_key = change.get("documentKey")
+        if collection == READING_PROGRESS_COLLECTION:
+            invalidate_reading()
+        elif collection == NOVEL_COLLECTION and document_key is not None:
+            invalidate_novel(document_key["_id"])
+        else:
+            # drop, rename or invalidate: anything cached may be wrong
+            invalidate_novel()
+
+    async def _run(self, db: AsyncIOMotorDatabase) -> None:
+        pipeline = [{"$match": {"$or": [
+            {"ns.coll": {"$in": WATCHED_COLLECTIONS}},
+            {"operationType": {"$in": ["dropDatabase", "invalidate"]}}
+        ]}}]
+        while True:
+            try:
+                async with db.watch(
+                    pipeline,
+                    resume_after=self._token,
+                    max_await_time_ms=MAX_AWAIT_TIME_MS
+                ) as stream:
+                    self.running = True
+                    self.last_error = None
+                    print("Change stream watcher started")
+                    while stream.alive:
+                        change = await stream.try_next()
+                        if change is not None:
+                            self._handle(change)
+                        # The post-batch token also advances while idle
+                        self._token = stream.resume_token
+            except asyncio.CancelledError:
+                self.running = False
+                raise
+            except OperationFailure as e:
+                self.running = False
+                self.last_error = str(e)
+                if e.code in NOT_SUPPORTED_CODES:
+                    print(f"Change streams are not available on this deployment, watcher stopped: {e}")
+                    return
+                if e.code in STALE_TOKEN_CODES:
+                    print(f"Resume token is no longer valid, restarting the change stream: {e}")
+                    self._token = None
+                    # Events since the token are lost
+                    invalidate_novel()
+                    continue
+                print(f"Change stream error, retrying in {RETRY_DELAY}s: {e}")
+            except PyMongoError as e:
+                self.running = False
+                self.last_error = str(e)
+                print(f"Change stream error, retrying in {RETRY_DELAY}s: {e}")
+            # The stream resumes from the last token, so no event is lost across retries
+            await asyncio.sleep(RETRY_DELAY)
+
+
+change_stream_watcher = ChangeStreamWatcher()
@@ -1,22 +1,84 @@
+import importlib.util
+from typing import Any, Dict, List
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
 from ..core.config import settings
+from .monitoring import operation_counter, pool_stats
+
+NOVEL_COLLECTION = "novels"
+CHAPTER_COLLECTION = "chapters"
+MIGRATIONS_COLLECTION = "migrations"
+READING_PROGRESS_COLLECTION = "reading_progress"
+SCRAPER_LIMITS_COLLECTION = "scraper_limits"
+
+# Python module each wire compressor needs; zlib is always available
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
 
 class Database:
     client: AsyncIOMotorClient | None = None
     db = None
+    # Same database with the listing read preference and read concern
+    listing_db = None
+    # Wire compressors the client was built with
+    compressors: List[str] = []
 
 db_manager = Database()
 
+def available_compressors() -> List[str]:
+    """The configured compressors whose Python module is installed, in order of preference."""
+    compressors = []
+    for name in filter(None, (c.strip() for c in settings.MONGODB_COMPRESSORS.split(","))):
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None or importlib.util.find_spec(module) is None:
+            print(f"MongoDB compressor {name} is not available, skipping it")
+            continue
+        compressors.append(name)
+    return compressors
+
+def client_options() -> Dict[str, Any]:
+    """Keyword arguments of the Motor client built from settings."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+        "event_listeners": [operation_counter, pool_stats],
+    }
+    if settings.MONGODB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGODB_MAX_IDLE_TIME_MS
+    if settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+def listing_database(db):
+    """`db` reading with the listing read preference and read concern."""
+    max_staleness = settings.MONGODB_LISTING_MAX_STALENESS_SECONDS
+    mode = read_pref_mode_from_name(settings.MONGODB_LISTING_READ_PREFERENCE)
+    return db.with_options(
+        read_preference=make_read_preference(mode, None, max_staleness),
+        read_concern=ReadConcern(settings.MONGODB_LISTING_READ_CONCERN)
+    )
+
 def connect_to_mongo():
     print(f"Connecting to MongoDB at {settings.MONGODB_URL}...")
-    db_manager.client = AsyncIOMotorClient(settings.MONGODB_URL)
+    options = client_options()
+    db_manager.client = AsyncIOMotorClient(settings.MONGODB_URL, **options)
     db_manager.db = db_manager.client[settings.MONGODB_DB_NAME]
-    print(f"Connected to MongoDB database: {settings.MONGODB_DB_NAME}")
+    db_manager.listing_db = listing_database(db_manager.db)
+    db_manager.compressors = options.get("compressors", [])
+    print(
+        f"Connected to MongoDB database: {settings.MONGODB_DB_NAME} "
+        f"(pool {options['minPoolSize']}-{options['maxPoolSize']}, compressors {db_manager.compressors})"
+    )
 
 def close_mongo_connection():
     print("Closing MongoDB connection...")
     if db_manager.client:
         db_manager.client.close()
+    db_manager.listing_db = None
     print("MongoDB connection closed.")
 
 def get_database():
@@ -26,4 +88,14 @@ def get_database():
         # Optionally, you could try to connect here, but it's better to manage lifecycle explicitly
         # connect_to_mongo()
         raise RuntimeError("Database connection not available.")
-    return db_manager.db 
\ No newline at end of file
+    return db_manager.db
+
+def get_listing_database():
+    """
+    Database for read-only listing routes (novel summaries, search, chapter lists), which
+    may be served by secondaries. Routes that read back their own writes use get_database.
+    """
+    db = get_database()
+    if db_manager.listing_db is None:
+        db_manager.listing_db = listing_database(db)
+    return db_manager.listing_db
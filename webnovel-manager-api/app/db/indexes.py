@@ -0,0 +1,128 @@
+from typing import Dict, List, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+from .database import NOVEL_COLLECTION, CHAPTER_COLLECTION, READING_PROGRESS_COLLECTION
+
+# Server error codes raised when an index with the same name or keys exists with other options
+INDEX_CONFLICT_CODES = (85, 86)
+
+# Every index the application relies on, per collection. Applied at startup by ensure_indexes.
+INDEXES: Dict[str, List[IndexModel]] = {
+    NOVEL_COLLECTION: [
+        # Rejects duplicate novels atomically; create_novel's find_one only spares the scrape
+        IndexModel([("source_url", ASCENDING)], unique=True, name="source_url_unique"),
+        # Type filter in get_novels
+        IndexModel([("type", ASCENDING)], name="type"),
+        # Keyset pagination in get_novels: one (sort key, _id) index per sortable field
+        IndexModel([("added_at", DESCENDING), ("_id", DESCENDING)], name="added_at_id"),
+        IndexModel([("last_updated_chapters", DESCENDING), ("_id", DESCENDING)], name="last_updated_chapters_id"),
+        IndexModel([("title", ASCENDING), ("_id", ASCENDING)], name="title_id"),
+        # Library search: one text index (a collection can only have one) plus the facet filters
+        IndexModel(
+            [("title", TEXT), ("author", TEXT), ("description", TEXT), ("tags", TEXT)],
+            weights={"title": 10, "author": 5, "tags": 3, "description": 1},
+            # Titles and descriptions mix English and Spanish, so no language-specific stemming
+            default_language="none",
+            name="search_text"
+        ),
+        IndexModel([("tags", ASCENDING)], name="tags"),
+        IndexModel([("source_name", ASCENDING), ("status", ASCENDING)], name="source_name_status"),
+    ],
+    CHAPTER_COLLECTION: [
+        # Every chapter lookup, page and sort is keyed by (novel_id, chapter_number)
+        IndexModel([("novel_id", ASCENDING), ("chapter_number", ASCENDING)], unique=True, name="novel_id_chapter_number"),
+    ],
+    READING_PROGRESS_COLLECTION: [
+        # One progress document per user and novel; versioned upserts rely on it being unique
+        IndexModel([("user_id", ASCENDING), ("novel_id", ASCENDING)], unique=True, name="user_id_novel_id"),
+        # Recounts after a chapter fetch and deletes touch every user's progress of a novel
+        IndexModel([("novel_id", ASCENDING)], name="novel_id"),
+    ],
+}
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase, recreate: bool = False) -> Dict[str, List[str]]:
+    """
+    Create the registered indexes. Existing identical indexes are left alone, so this is
+    safe to run on every startup. An index that cannot be built (e.g. duplicates under a
+    unique index) is reported and skipped so the API still starts; create_novel keeps its
+    own duplicate check for that case.
+
+    An index whose definition changed is only dropped and recreated with `recreate`, an
+    explicit admin action: at startup several workers would race to drop it, and the
+    collection would run without it meanwhile.
+
+    Returns the names of the indexes that could not be created, per collection.
+    """
+    failed: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        for model in models:
+            name = model.document["name"]
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                if e.code in INDEX_CONFLICT_CODES:
+                    if not recreate:
+                        print(f"Index {collection_name}.{name} changed; recreate it with POST /admin/indexes?recreate=true")
+                        failed.setdefault(collection_name, []).append(name)
+                        continue
+                    print(f"Index {collection_name}.{name} changed, recreating it")
+                    try:
+                        await _drop_conflicting_index(collection, model)
+                        await collection.create_indexes([model])
+                        continue
+                    except OperationFailure as retry_error:
+                        e = retry_error
+                print(f"Could not create index {collection_name}.{name}: {e}")
+                failed.setdefault(collection_name, []).append(name)
+    return failed
+
+
+async def _drop_conflicting_index(collection, model: IndexModel) -> None:
+    """Drop the existing index that has the model's name or keys."""
+    name = model.document["name"]
+    keys = list(model.document["key"].items())
+    information = await collection.index_information()
+    for existing_name, existing in information.items():
+        if existing_name == name or existing["key"] == keys:
+            await collection.drop_index(existing_name)
+
+
+async def describe_indexes(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """
+    Compare the registered indexes with what exists in MongoDB, including usage
+    counters from $indexStats when the server provides them.
+    """
+    report = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        information = await collection.index_information()
+
+        usage = {}
+        try:
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                usage[stats["name"]] = {
+                    "ops": stats["accesses"]["ops"],
+                    "since": stats["accesses"]["since"]
+                }
+        except Exception:
+            # $indexStats is unavailable on some deployments; report without usage
+            pass
+
+        declared = {model.document["name"] for model in models}
+        report[collection_name] = {
+            "indexes": [
+                {
+                    "name": name,
+                    "key": [[field, direction] for field, direction in details["key"]],
+                    "unique": details.get("unique", False),
+                    "declared": name in declared,
+                    "usage": usage.get(name)
+                }
+                for name, details in information.items()
+            ],
+            "missing": sorted(declared - set(information))
+        }
+    return report
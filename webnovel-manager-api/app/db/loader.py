@@ -0,0 +1,53 @@
+from typing import Any, Dict, Optional
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from .database import get_database, NOVEL_COLLECTION
+
+# Novel documents are small once chapters live in their own collection; only a leftover
+# embedded array from before the migration is left out
+NOVEL_LOADER_PROJECTION = {"chapters": 0}
+
+
+class NovelLoader:
+    """
+    Request-scoped access to novel documents. Every document read or written through
+    the loader is memoized, so a handler never reads the same novel twice, and updates
+    return the new document in the same round trip.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._novels: Dict[Any, Optional[Dict[str, Any]]] = {}
+
+    async def get(self, novel_id: Any) -> Optional[Dict[str, Any]]:
+        """The novel document, or None if it does not exist."""
+        if novel_id not in self._novels:
+            self._novels[novel_id] = await self.db[NOVEL_COLLECTION].find_one(
+                {"_id": novel_id}, NOVEL_LOADER_PROJECTION
+            )
+        return self._novels[novel_id]
+
+    async def update(self, novel_id: Any, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply an update and return the document after it, or None if the novel does not exist."""
+        novel = await self.db[NOVEL_COLLECTION].find_one_and_update(
+            {"_id": novel_id},
+            update,
+            projection=NOVEL_LOADER_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+        self._novels[novel_id] = novel
+        return novel
+
+    def prime(self, novel: Dict[str, Any]) -> None:
+        """Memoize a document the handler already has, e.g. one it just inserted."""
+        self._novels[novel["_id"]] = novel
+
+    def forget(self, novel_id: Any) -> None:
+        """Drop a memoized document after it was changed outside the loader."""
+        self._novels.pop(novel_id, None)
+
+
+def get_novel_loader(db: AsyncIOMotorDatabase = Depends(get_database)) -> NovelLoader:
+    """Dependency giving each request its own loader; FastAPI reuses it within the request."""
+    return NovelLoader(db)
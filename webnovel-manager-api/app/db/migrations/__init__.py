@@ -0,0 +1,13 @@
+from .runner import Migration, MigrationContext, BulkWriter, run_migrations, applied_migrations
+from .m001_chapter_numbers import ChapterNumbers
+from .m002_embedded_chapters import EmbeddedChapters
+from .m003_progress_ranges import ProgressRanges
+from .m004_user_progress import UserProgress
+
+# Every migration, applied in id order by run_migrations. Add new ones here.
+MIGRATIONS = [
+    ChapterNumbers(),
+    EmbeddedChapters(),
+    ProgressRanges(),
+    UserProgress(),
+]
@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from ...core.config import settings
+from . import MIGRATIONS, run_migrations, applied_migrations
+
+# Usage:
+#   python -m app.db.migrations                 run every pending migration
+#   python -m app.db.migrations --list          show which migrations are applied
+#   python -m app.db.migrations --only 003_progress_ranges --force --batch-size 5000
+
+async def list_migrations():
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        applied = await applied_migrations(client[settings.MONGODB_DB_NAME])
+    finally:
+        client.close()
+    for migration in sorted(MIGRATIONS, key=lambda m: m.id):
+        record = applied.get(migration.id)
+        state = f"applied {record['applied_at']:%Y-%m-%d %H:%M} ({record['seconds']}s)" if record else "pending"
+        print(f"{migration.id:<28} {state:<36} {migration.description}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pending database migrations.")
+    parser.add_argument("--list", action="store_true", help="List migrations and whether they are applied")
+    parser.add_argument("--only", nargs="+", metavar="ID", help="Only run these migrations")
+    parser.add_argument("--force", action="store_true", help="Run migrations even if already applied")
+    parser.add_argument("--batch-size", type=int, help=f"Documents per batch (default {settings.MIGRATION_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    if args.list:
+        asyncio.run(list_migrations())
+    else:
+        asyncio.run(run_migrations(MIGRATIONS, only=args.only, force=args.force, batch_size=args.batch_size))
+
+if __name__ == "__main__":
+    main()
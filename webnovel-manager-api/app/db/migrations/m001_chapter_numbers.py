@@ -0,0 +1,50 @@
+import re
+from typing import Any, Dict
+from pymongo import UpdateOne
+from ..database import NOVEL_COLLECTION
+from .runner import Migration, MigrationContext
+
+TITLE_NUMBER_RE = re.compile(r"Capítulo\s+(\d+)")
+URL_NUMBER_RE = re.compile(r"/(\d+)$")
+
+
+def chapter_number_of(chapter: Dict[str, Any]) -> int:
+    """Number of a chapter from its title ("Capítulo N"), else from the end of its URL, else 0."""
+    match = TITLE_NUMBER_RE.search(chapter.get("title", ""))
+    if match is None:
+        match = URL_NUMBER_RE.search(chapter.get("url", ""))
+    return int(match.group(1)) if match else 0
+
+
+class ChapterNumbers(Migration):
+    """
+    Give the chapters embedded in novel documents a `chapter_number` and `chapter_title`
+    (formerly app/scripts/migrate_chapters.py).
+
+    Only novels with a chapter lacking a number are read, and only those chapters are
+    written, through positional `$set`s instead of rewriting the whole array.
+    """
+
+    id = "001_chapter_numbers"
+    description = "Number the chapters embedded in novel documents"
+
+    async def run(self, ctx: MigrationContext) -> Dict[str, Any]:
+        writer = ctx.writer(NOVEL_COLLECTION, "novels")
+        chapters = 0
+        novels = ctx.iterate(
+            NOVEL_COLLECTION,
+            {"chapters": {"$elemMatch": {"chapter_number": {"$exists": False}}}},
+            {"chapters.title": 1, "chapters.url": 1, "chapters.chapter_number": 1, "chapters.chapter_title": 1}
+        )
+        async for novel in novels:
+            update = {}
+            for index, chapter in enumerate(novel["chapters"]):
+                if "chapter_number" in chapter:
+                    continue
+                update[f"chapters.{index}.chapter_number"] = chapter_number_of(chapter)
+                chapters += 1
+                if chapter.get("chapter_title") is None:
+                    update[f"chapters.{index}.chapter_title"] = chapter.get("title", "")
+            await writer.add(UpdateOne({"_id": novel["_id"]}, {"$set": update}))
+        await writer.flush()
+        return {"novels": writer.written, "chapters": chapters}
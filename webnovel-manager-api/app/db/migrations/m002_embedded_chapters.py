@@ -0,0 +1,71 @@
+from typing import Any, Dict, List
+from pymongo import UpdateOne
+from ..database import NOVEL_COLLECTION, CHAPTER_COLLECTION
+from ..indexes import ensure_indexes
+from .runner import Migration, MigrationContext
+
+
+class EmbeddedChapters(Migration):
+    """
+    Move the chapters embedded in each novel document (`novels.chapters`) into the
+    `chapters` collection, then remove the embedded arrays.
+
+    Chapters are streamed one by one through `$unwind`, so memory use does not depend
+    on the size of the library or of any single novel. Chapters without a
+    `chapter_number` cannot be keyed and are skipped (001_chapter_numbers numbers them).
+    Chapters are upserted by (novel_id, chapter_number), which makes the migration safe
+    to re-run after an interruption.
+    """
+
+    id = "002_embedded_chapters"
+    description = "Move embedded chapters into the chapters collection"
+
+    async def run(self, ctx: MigrationContext) -> Dict[str, Any]:
+        # The upserts rely on the unique (novel_id, chapter_number) index
+        await ensure_indexes(ctx.db)
+
+        kept = await self._unkeyable_novels(ctx)
+        for novel_id in kept:
+            print(f"  novel {novel_id}: duplicate or missing chapter numbers, embedded chapters kept")
+        movable = {"chapters": {"$exists": True}, "_id": {"$nin": kept}}
+
+        writer = ctx.writer(CHAPTER_COLLECTION, "chapters")
+        pipeline = [
+            {"$match": movable},
+            {"$project": {"chapters": 1}},
+            {"$unwind": "$chapters"}
+        ]
+        rows = ctx.db[NOVEL_COLLECTION].aggregate(pipeline, allowDiskUse=True, batchSize=ctx.batch_size)
+        async for row in rows:
+            chapter = row["chapters"]
+            await writer.add(UpdateOne(
+                {"novel_id": row["_id"], "chapter_number": chapter["chapter_number"]},
+                {"$set": {
+                    "title": chapter.get("title"),
+                    "chapter_title": chapter.get("chapter_title"),
+                    "url": chapter.get("url"),
+                    # Turned into the per-novel ranges by 003_progress_ranges
+                    "read": chapter.get("read", False),
+                    "downloaded": chapter.get("downloaded", False)
+                }},
+                upsert=True
+            ))
+        await writer.flush()
+
+        # Only drop the embedded arrays once every chapter has been written
+        result = await ctx.db[NOVEL_COLLECTION].update_many(movable, {"$unset": {"chapters": ""}})
+        return {"chapters": writer.written, "novels": result.modified_count, "kept_novels": [str(novel_id) for novel_id in kept]}
+
+    async def _unkeyable_novels(self, ctx: MigrationContext) -> List[Any]:
+        """Ids of the novels with embedded chapters sharing a number, or without one."""
+        pipeline = [
+            {"$match": {"chapters": {"$exists": True}}},
+            {"$project": {"chapters.chapter_number": 1}},
+            {"$unwind": "$chapters"},
+            {"$group": {"_id": {"novel_id": "$_id", "number": "$chapters.chapter_number"}, "count": {"$sum": 1}}},
+            {"$match": {"$or": [{"count": {"$gt": 1}}, {"_id.number": None}]}},
+            {"$group": {"_id": "$_id.novel_id"}},
+            {"$sort": {"_id": 1}}
+        ]
+        rows = ctx.db[NOVEL_COLLECTION].aggregate(pipeline, allowDiskUse=True, batchSize=ctx.batch_size)
+        return [row["_id"] async for row in rows]
@@ -0,0 +1,75 @@
+from typing import Any, Dict
+from pymongo import ASCENDING, UpdateOne
+from ...services.chapter_ranges import ChapterRanges
+from ...services.chapter_service import chapter_service
+from ...services.chapter_state_service import CHAPTER_FLAGS, FLAG_COUNTERS
+from ..database import NOVEL_COLLECTION, CHAPTER_COLLECTION
+from .runner import Migration, MigrationContext
+
+
+def _novel_update(novel_id, runs) -> UpdateOne:
+    """Update storing the flag ranges and counters collected for one novel."""
+    update = {}
+    for flag in CHAPTER_FLAGS:
+        update[f"progress.{flag}"] = runs[flag]["ranges"].to_list()
+        update[FLAG_COUNTERS[flag]] = runs[flag]["count"]
+    return UpdateOne({"_id": novel_id}, {"$set": update})
+
+
+class ProgressRanges(Migration):
+    """
+    Convert the per-chapter `read`/`downloaded` booleans into the read/downloaded ranges
+    stored on each novel, then drop the booleans from the chapter documents and rebuild
+    the chapter counters of every novel.
+
+    Chapters are streamed in (novel_id, chapter_number) order over the unique index, and
+    each run of consecutive flagged chapters becomes one range. A run spans numbering
+    gaps, since no chapter exists there. Re-running it after an interruption is safe: novels
+    whose chapters no longer carry the booleans keep the ranges already written.
+    """
+
+    id = "003_progress_ranges"
+    description = "Store read/downloaded state as chapter ranges on the novel"
+
+    async def run(self, ctx: MigrationContext) -> Dict[str, Any]:
+        writer = ctx.writer(NOVEL_COLLECTION, "novels")
+        novel_id = None
+        runs = {}
+
+        chapters = ctx.iterate(
+            CHAPTER_COLLECTION,
+            {"$or": [{flag: {"$exists": True}} for flag in CHAPTER_FLAGS]},
+            {"novel_id": 1, "chapter_number": 1, **{flag: 1 for flag in CHAPTER_FLAGS}},
+            sort=[("novel_id", ASCENDING), ("chapter_number", ASCENDING)]
+        )
+        async for chapter in chapters:
+            if chapter["novel_id"] != novel_id:
+                if novel_id is not None:
+                    await writer.add(_novel_update(novel_id, runs))
+                novel_id = chapter["novel_id"]
+                runs = {flag: {"ranges": ChapterRanges(), "start": None, "count": 0} for flag in CHAPTER_FLAGS}
+
+            number = chapter["chapter_number"]
+            for flag in CHAPTER_FLAGS:
+                run = runs[flag]
+                if chapter.get(flag):
+                    if run["start"] is None:
+                        run["start"] = number
+                    run["ranges"].add(run["start"], number)
+                    run["count"] += 1
+                else:
+                    run["start"] = None
+
+        if novel_id is not None:
+            await writer.add(_novel_update(novel_id, runs))
+        await writer.flush()
+
+        # Only drop the booleans once every novel has its ranges
+        result = await ctx.db[CHAPTER_COLLECTION].update_many(
+            {"$or": [{flag: {"$exists": True}} for flag in CHAPTER_FLAGS]},
+            {"$unset": {flag: "" for flag in CHAPTER_FLAGS}}
+        )
+
+        # Novel summaries read the denormalized counters, so fill them in for migrated novels
+        rebuilt = await chapter_service.rebuild_counters(ctx.db)
+        return {"novels": writer.written, "chapters_cleaned": result.modified_count, "counters_rebuilt": rebuilt}
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Any, Dict
+from pymongo import UpdateOne
+from ...core.config import settings
+from ...services.chapter_state_service import (
+    chapter_state_service, CHAPTER_FLAGS, FLAG_COUNTERS, load_progress, progress_key
+)
+from ..database import NOVEL_COLLECTION, READING_PROGRESS_COLLECTION
+from ..versioning import VERSION_FIELD
+from .runner import Migration, MigrationContext
+
+# Fields of the novel documents that belonged to the single reader of the library
+NOVEL_PROGRESS_FIELDS = ["progress", *FLAG_COUNTERS.values()]
+
+
+class UserProgress(Migration):
+    """
+    Move the read/downloaded ranges stored on each novel into a reading_progress document
+    of DEFAULT_USER_ID, the user of requests without an X-User-Id header, then drop them
+    and the read/downloaded counters from the novels and recount every progress document.
+
+    Novels without any read or downloaded chapter get no progress document. The novels are
+    only cleaned once every progress document is written, so an interrupted run can simply
+    be run again.
+    """
+
+    id = "004_user_progress"
+    description = "Move novel reading progress into per-user reading_progress documents"
+
+    async def run(self, ctx: MigrationContext) -> Dict[str, Any]:
+        writer = ctx.writer(READING_PROGRESS_COLLECTION, "reading_progress")
+        user_id = settings.DEFAULT_USER_ID
+
+        novels = ctx.iterate(
+            NOVEL_COLLECTION,
+            {"$or": [{field: {"$exists": True}} for field in NOVEL_PROGRESS_FIELDS]},
+            {"progress": 1}
+        )
+        async for novel in novels:
+            progress = load_progress(novel.get("progress"))
+            if not any(progress[flag] for flag in CHAPTER_FLAGS):
+                continue
+            await writer.add(UpdateOne(
+                progress_key(user_id, novel["_id"]),
+                {
+                    "$set": {**{flag: progress[flag].to_list() for flag in CHAPTER_FLAGS}, "updated_at": datetime.utcnow()},
+                    "$inc": {VERSION_FIELD: 1}
+                },
+                upsert=True
+            ))
+        await writer.flush()
+
+        result = await ctx.db[NOVEL_COLLECTION].update_many(
+            {"$or": [{field: {"$exists": True}} for field in NOVEL_PROGRESS_FIELDS]},
+            {"$unset": {field: "" for field in NOVEL_PROGRESS_FIELDS}}
+        )
+
+        rebuilt = await chapter_state_service.rebuild_counters(ctx.db)
+        return {"user_id": user_id, "progress": writer.stats(), "novels_cleaned": result.modified_count, "counters_rebuilt": rebuilt}
@@ -0,0 +1,139 @@
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from ...core.config import settings
+from ..database import MIGRATIONS_COLLECTION
+
+
+class BulkWriter:
+    """
+    Buffers write operations for one collection and sends them with
+    bulk_write(ordered=False) every `batch_size` operations, reporting throughput.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, collection: str, batch_size: int, label: str):
+        self.collection = db[collection]
+        self.batch_size = batch_size
+        self.label = label
+        self.operations: List[Any] = []
+        self.written = 0
+        self.modified = 0
+        self.upserted = 0
+        self.start_time = time.time()
+
+    async def add(self, operation: Any) -> None:
+        self.operations.append(operation)
+        if len(self.operations) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self.operations:
+            return
+        result = await self.collection.bulk_write(self.operations, ordered=False)
+        self.written += len(self.operations)
+        self.modified += result.modified_count
+        self.upserted += result.upserted_count
+        self.operations = []
+        elapsed = time.time() - self.start_time
+        print(f"  {self.label}: {self.written} writes ({self.written / max(elapsed, 1e-6):.0f}/s)")
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "modified": self.modified, "upserted": self.upserted}
+
+
+class MigrationContext:
+    """What a migration gets to work with: the database and the batching helpers."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+
+    def iterate(
+        self,
+        collection: str,
+        filter: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream matching documents, `batch_size` per round trip."""
+        cursor = self.db[collection].find(filter, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor.batch_size(self.batch_size)
+
+    def writer(self, collection: str, label: Optional[str] = None) -> BulkWriter:
+        return BulkWriter(self.db, collection, self.batch_size, label or collection)
+
+
+class Migration:
+    """
+    One schema change. Subclasses set `id` (sortable, e.g. "001_chapter_numbers") and
+    `description`, and implement `run`, which returns a dict of stats to record.
+
+    Migrations should be safe to re-run, so an interrupted one can simply be run again.
+    """
+
+    id: str = ""
+    description: str = ""
+
+    async def run(self, ctx: MigrationContext) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+async def applied_migrations(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, Any]]:
+    """Records of the migrations already applied, by id."""
+    return {record["_id"]: record async for record in db[MIGRATIONS_COLLECTION].find({})}
+
+
+async def run_migrations(
+    migrations: Sequence[Migration],
+    db: Optional[AsyncIOMotorDatabase] = None,
+    only: Optional[Sequence[str]] = None,
+    force: bool = False,
+    batch_size: Optional[int] = None
+) -> List[str]:
+    """
+    Run the pending migrations in id order and record each one in the migrations
+    collection once it completes. `only` restricts the run to the given ids and `force`
+    re-runs migrations already applied. Returns the ids that ran.
+
+    Without `db`, a client is opened from settings and closed afterwards.
+    """
+    client = None
+    if db is None:
+        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        db = client[settings.MONGODB_DB_NAME]
+    ctx = MigrationContext(db, batch_size or settings.MIGRATION_BATCH_SIZE)
+
+    try:
+        applied = await applied_migrations(db)
+        ran = []
+        for migration in sorted(migrations, key=lambda m: m.id):
+            if only is not None and migration.id not in only:
+                continue
+            if migration.id in applied and not force:
+                print(f"{migration.id}: already applied on {applied[migration.id]['applied_at']:%Y-%m-%d %H:%M}")
+                continue
+
+            print(f"{migration.id}: {migration.description}")
+            start_time = time.time()
+            stats = await migration.run(ctx) or {}
+            elapsed = time.time() - start_time
+            await db[MIGRATIONS_COLLECTION].replace_one(
+                {"_id": migration.id},
+                {
+                    "description": migration.description,
+                    "applied_at": datetime.utcnow(),
+                    "seconds": round(elapsed, 3),
+                    "batch_size": ctx.batch_size,
+                    "stats": stats,
+                },
+                upsert=True
+            )
+            print(f"{migration.id}: done in {elapsed:.2f} seconds {stats}")
+            ran.append(migration.id)
+        return ran
+    finally:
+        if client is not None:
+            client.close()
@@ -0,0 +1,194 @@
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from pymongo import monitoring
+from ..core.config import settings
+
+
+class OperationCount:
+    """Commands sent to MongoDB while handling one request."""
+
+    def __init__(self):
+        self.total = 0
+        self.by_command: Dict[str, int] = {}
+
+    def add(self, command_name: str) -> None:
+        self.total += 1
+        self.by_command[command_name] = self.by_command.get(command_name, 0) + 1
+
+
+# The count of the request being handled. Motor runs commands in threads with a copy of
+# the calling context, so the listener sees the same OperationCount object.
+current_operations: ContextVar[Optional[OperationCount]] = ContextVar("current_operations", default=None)
+
+
+class OperationCounter(monitoring.CommandListener):
+    """Command listener adding every command to the current request's count."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        count = current_operations.get()
+        if count is not None:
+            count.add(event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+operation_counter = OperationCounter()
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener tracking how long requests wait to check out a connection,
+    which grows when maxPoolSize is too small for the load.
+    """
+
+    # Upper bounds, in milliseconds, of the wait-time histogram buckets
+    WAIT_BUCKETS_MS: List[float] = [1, 5, 10, 50, 100, 500, 1000]
+
+    def __init__(self):
+        self._lock = Lock()
+        # A gauge rather than a counter, so reset() leaves it alone
+        self.checked_out = 0
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.failed_checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+            self.failures: Dict[str, int] = {}
+            self.created = 0
+            self.closed = 0
+            self.cleared = 0
+
+    def _wait(self, duration: Optional[float]) -> None:
+        duration = duration or 0.0
+        self.total_wait += duration
+        self.max_wait = max(self.max_wait, duration)
+        milliseconds = duration * 1000
+        for index, bound in enumerate(self.WAIT_BUCKETS_MS):
+            if milliseconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self._wait(event.duration)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self.failed_checkouts += 1
+            self.failures[event.reason] = self.failures.get(event.reason, 0) + 1
+            self._wait(event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self.created += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self.closed += 1
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self.cleared += 1
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.failed_checkouts
+            labels = [f"<={bound}ms" for bound in self.WAIT_BUCKETS_MS] + [f">{self.WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "failed_checkouts": self.failed_checkouts,
+                "failure_reasons": dict(self.failures),
+                "average_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "wait_histogram": dict(zip(labels, self.buckets)),
+                "checked_out": self.checked_out,
+                "connections_created": self.created,
+                "connections_closed": self.closed,
+                "pool_cleared": self.cleared,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class RouteOperationStats:
+    """Per-route totals, to spot handlers whose number of round trips grows."""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+    def record(self, route: str, count: OperationCount) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(route, {"requests": 0, "operations": 0, "max": 0})
+            stats["requests"] += 1
+            stats["operations"] += count.total
+            stats["max"] = max(stats["max"], count.total)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {**stats, "average": stats["operations"] / stats["requests"]}
+                for route, stats in sorted(self._routes.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_operation_stats = RouteOperationStats()
+
+
+async def count_db_operations(request: Request, call_next):
+    """
+    HTTP middleware counting the MongoDB commands of each request. The count is sent in
+    the X-DB-Operations header, added to the per-route stats and logged when it goes over
+    DB_OPERATIONS_WARN_THRESHOLD.
+    """
+    count = OperationCount()
+    token = current_operations.set(count)
+    try:
+        response = await call_next(request)
+    finally:
+        current_operations.reset(token)
+
+    route = request.scope.get("route")
+    route_name = f"{request.method} {route.path}" if route is not None else f"{request.method} (unmatched)"
+    route_operation_stats.record(route_name, count)
+    response.headers["X-DB-Operations"] = str(count.total)
+    if count.total > settings.DB_OPERATIONS_WARN_THRESHOLD:
+        print(f"{route_name} used {count.total} database operations: {count.by_command}")
+    return response
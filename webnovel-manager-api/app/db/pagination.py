@@ -0,0 +1,54 @@
+import base64
+import binascii
+from typing import Any, Dict, Optional, Tuple
+from bson import ObjectId, json_util
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+    pass
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: ObjectId) -> str:
+    """Encode the position after the last returned document as an opaque token."""
+    payload = json_util.dumps({"s": sort_by, "o": sort_order, "v": value, "i": last_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, ObjectId]:
+    """Decode a cursor into (sort value, _id), checking it was issued for the same sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        value, last_id = payload["v"], payload["i"]
+        issued_for = (payload["s"], payload["o"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+
+    if not isinstance(last_id, ObjectId):
+        raise InvalidCursor("Malformed cursor")
+    if issued_for != (sort_by, sort_order):
+        raise InvalidCursor(f"Cursor was issued for sort_by={issued_for[0]} sort_order={issued_for[1]}")
+    return value, last_id
+
+
+def keyset_filter(field: str, value: Any, last_id: ObjectId, descending: bool) -> Dict[str, Any]:
+    """
+    Build the filter matching documents strictly after (value, last_id) in a
+    (field, _id) sort. Null/missing values sort before everything else in MongoDB,
+    so they come first in ascending order and last in descending order.
+    """
+    op = "$lt" if descending else "$gt"
+    if value is None:
+        after_tie: Dict[str, Any] = {field: None, "_id": {op: last_id}}
+        if descending:
+            return after_tie
+        return {"$or": [after_tie, {field: {"$ne": None}}]}
+
+    clauses = [
+        {field: {op: value}},
+        {field: value, "_id": {op: last_id}}
+    ]
+    if descending:
+        clauses.append({field: None})
+    return {"$or": clauses}
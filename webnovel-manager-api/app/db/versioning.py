@@ -0,0 +1,107 @@
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from .database import NOVEL_COLLECTION
+from .loader import NOVEL_LOADER_PROJECTION
+
+# Incremented by every update of fields derived from more than one document (chapter
+# counters of novels, reading progress of users), so writers can detect they raced.
+# Documents created before the field existed have none and are matched on that.
+VERSION_FIELD = "version"
+
+# Attempts before giving up; each retry re-reads the document and recomputes the update
+MAX_ATTEMPTS = 20
+# Upper bound of the random pause between attempts, doubled per retry
+RETRY_BACKOFF_SECONDS = 0.005
+
+# compute(document, attempt) -> the update to apply to that version of the document, or None for no change
+ComputeUpdate = Callable[[Dict[str, Any], int], Awaitable[Optional[Dict[str, Any]]]]
+
+
+# Process-wide counts of versioned updates and of the conflicts they retried
+versioned_update_stats = {"updates": 0, "conflicts": 0, "exhausted": 0}
+
+
+class ConcurrentUpdateError(Exception):
+    """The document kept changing under a versioned update for MAX_ATTEMPTS attempts."""
+
+
+def with_version_bump(update: Dict[str, Any]) -> Dict[str, Any]:
+    """`update` plus the version increment."""
+    increments = {**update.get("$inc", {}), VERSION_FIELD: 1}
+    return {**update, "$inc": increments}
+
+
+async def update_versioned(
+    db: AsyncIOMotorDatabase,
+    collection: str,
+    key: Dict[str, Any],
+    compute: ComputeUpdate,
+    projection: Dict[str, Any],
+    document: Optional[Dict[str, Any]] = None,
+    upsert: bool = False,
+    return_projection: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Compare-and-swap update of the document matching `key`: compute the update from the
+    document as read, and apply it only if the version is still the one read. On a
+    conflict the document is read again and the update recomputed from the new state, so
+    concurrent writers merge instead of overwriting each other, without any lock.
+
+    `document` is the one the caller already read (with `projection` and the version),
+    used for the first attempt. With `upsert` a missing document is computed from {} and
+    created; `key` must then be covered by a unique index, so concurrent creations
+    conflict instead of duplicating. Returns the updated document, the document as read
+    when `compute` returns None, or None if it does not exist (and `upsert` is off).
+    """
+    projection = {**projection, VERSION_FIELD: 1}
+    for attempt in range(MAX_ATTEMPTS):
+        if document is None or attempt > 0:
+            document = await db[collection].find_one(key, projection)
+            if document is None:
+                if not upsert:
+                    return None
+                document = {}
+
+        update = await compute(document, attempt)
+        if update is None:
+            return document or None
+
+        # $exists rather than None, so an upsert does not copy a null version into the new document
+        version = document.get(VERSION_FIELD)
+        try:
+            updated = await db[collection].find_one_and_update(
+                {**key, VERSION_FIELD: {"$exists": False} if version is None else version},
+                with_version_bump(update),
+                projection=return_projection,
+                upsert=upsert,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another writer created the document first
+            updated = None
+        if updated is not None:
+            versioned_update_stats["updates"] += 1
+            return updated
+        versioned_update_stats["conflicts"] += 1
+        await asyncio.sleep(random.uniform(0, RETRY_BACKOFF_SECONDS * 2 ** min(attempt, 6)))
+
+    versioned_update_stats["exhausted"] += 1
+    raise ConcurrentUpdateError(f"{collection} {key} changed during {MAX_ATTEMPTS} update attempts")
+
+
+async def update_novel_versioned(
+    db: AsyncIOMotorDatabase,
+    novel_id: Any,
+    compute: ComputeUpdate,
+    projection: Dict[str, Any],
+    novel: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """update_versioned of a novel document, returning it as NovelLoader would."""
+    return await update_versioned(
+        db, NOVEL_COLLECTION, {"_id": novel_id}, compute, projection, novel,
+        return_projection=NOVEL_LOADER_PROJECTION
+    )
@@ -1,7 +1,13 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from .routers import health, novels, chapters
-from .db.database import connect_to_mongo, close_mongo_connection
+from .routers import health, novels, chapters, admin
+from .db.database import connect_to_mongo, close_mongo_connection, get_database
+from .db.indexes import ensure_indexes
+from .db.change_streams import change_stream_watcher
+from .db.monitoring import count_db_operations
+from .services.browser_pool import browser_pool
+from .services.http_client import http_clients
+from .services.adaptive_concurrency import adaptive_concurrency
 from .core.config import settings
 from fastapi.middleware.cors import CORSMiddleware
 from scalar_fastapi import get_scalar_api_reference
@@ -11,8 +17,24 @@ from scalar_fastapi.scalar_fastapi import Layout
 async def lifespan(app: FastAPI):
     # Startup: Connect to MongoDB
     connect_to_mongo()
+    await ensure_indexes(get_database())
+    # Invalidate caches on writes made by other workers
+    if settings.CHANGE_STREAMS_ENABLED:
+        change_stream_watcher.start(get_database())
+    # Scraper concurrency limits learned before the restart
+    await adaptive_concurrency.load(get_database())
+    # One Chromium for every Playwright scraper; without it the first scrape launches it
+    if settings.BROWSER_POOL_PREWARM:
+        try:
+            await browser_pool.start()
+        except Exception as e:
+            print(f"Could not start the browser pool: {e}")
     yield
-    # Shutdown: Close MongoDB connection
+    # Shutdown: Stop the watcher, the browser and the HTTP clients, then close MongoDB connection
+    await change_stream_watcher.stop()
+    await browser_pool.stop()
+    await http_clients.close()
+    await adaptive_concurrency.close()
     close_mongo_connection()
 
 app = FastAPI(
@@ -28,6 +50,8 @@ app.add_middleware(
     allow_methods=["*"],  # Permitir todos los métodos (GET, POST, etc.)
     allow_headers=["*"],  # Permitir todos los headers
 )
+# Database round trips per request, in the X-DB-Operations header and /admin/db-operations
+app.middleware("http")(count_db_operations)
 
 @app.get("/scalar", include_in_schema=False)
 async def scalar_html():
@@ -44,6 +68,7 @@ async def scalar_html():
 app.include_router(health.router, prefix=settings.API_V1_STR)
 app.include_router(novels.router, prefix=f"{settings.API_V1_STR}/novels")
 app.include_router(chapters.router, prefix=f"{settings.API_V1_STR}/novels")
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin")
 
 @app.get("/")
 async def root():
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List, Any
+from typing import Optional, List, Dict, Any
 from bson import ObjectId
 from datetime import datetime
 from pydantic_core import core_schema
@@ -99,10 +99,13 @@ class NovelUpdate(BaseModel):
 
 class NovelInDB(NovelBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
-    chapters: List[Chapter] = [] # Embedded list of chapters
     added_at: datetime = Field(default_factory=datetime.utcnow)
     last_updated_api: datetime = Field(default_factory=datetime.utcnow)
     last_updated_chapters: Optional[datetime] = None # Last time chapters were checked/updated from source
+    # Denormalized chapter counters, maintained by the chapter write paths; read and
+    # downloaded counts are per user and live in reading_progress
+    total_chapters: int = 0
+    last_chapter_number: int = 0
 
     class Config:
         populate_by_name = True # Replaced allow_population_by_field_name
@@ -128,6 +131,10 @@ class NovelSummary(BaseModel):
     last_updated_chapters: Optional[datetime] = None
     added_at: datetime
 
+class NovelPage(BaseModel):
+    novels: List[NovelSummary]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page; None on the last page
+
 class NovelDetail(NovelSummary):
     description: Optional[str] = None
     source_url: HttpUrl
@@ -135,6 +142,46 @@ class NovelDetail(NovelSummary):
     tags: List[str] = []
     reading_progress: float  # Percentage of read chapters
 
+class NovelBatchRequest(BaseModel):
+    ids: List[PyObjectId] = Field(..., min_length=1, max_length=500)
+
+class NovelBatchItem(BaseModel):
+    id: PyObjectId
+    found: bool
+    novel: Optional[NovelSummary] = None  # None when no novel has this id
+
+class NovelBatchResponse(BaseModel):
+    results: List[NovelBatchItem]  # One entry per requested id, in request order
+
+class NovelSearchResult(NovelSummary):
+    score: Optional[float] = None  # Text relevance, only set when searching with `q`
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+class NovelSearchResponse(BaseModel):
+    results: List[NovelSearchResult]
+    total: int
+    facets: Dict[str, List[FacetCount]]  # status, source_name, source_language and tags counts
+
+class ChapterRef(BaseModel):
+    title: str
+    chapter_number: int
+    chapter_title: Optional[str] = None
+    url: HttpUrl
+
+class ContinueReadingItem(BaseModel):
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    cover_image_url: Optional[HttpUrl] = None
+    type: NovelType
+    total_chapters: int
+    read_chapters: int
+    unread_chapters: int
+    last_updated_chapters: Optional[datetime] = None
+    next_chapter: Optional[ChapterRef] = None  # First unread chapter, None when everything is read
+
 class ChapterListResponse(BaseModel):
     chapters: List[Chapter]
     total: int
@@ -142,7 +189,27 @@ class ChapterListResponse(BaseModel):
     page_size: int
     total_pages: int
 
+class ChapterSearchHit(BaseModel):
+    chapter_number: int
+    occurrences: int  # Occurrences of all the query words in the chapter
+    snippet: Optional[str] = None  # Text around the first match, None if the cached file is gone
+
+class ChapterSearchResponse(BaseModel):
+    query: str
+    results: List[ChapterSearchHit]
+
 class ChapterDownloadResponse(BaseModel):
     success: bool
     message: str
     updated_chapters: List[int]  # List of chapter numbers that were updated
+
+class ChapterFetchResponse(BaseModel):
+    # Only what changed on the source is returned, plus counts
+    added: List[Chapter]
+    changed: List[Chapter]
+    removed: List[int]  # Chapter numbers no longer listed by the source
+    added_count: int
+    changed_count: int
+    removed_count: int
+    unchanged_count: int
+    total: int
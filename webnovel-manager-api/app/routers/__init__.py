@@ -2,9 +2,11 @@ from fastapi import APIRouter
 from .novels import router as novels_router
 from .chapters import router as chapters_router
 from .health import router as health_router
+from .admin import router as admin_router
 
 api_router = APIRouter()
 
 api_router.include_router(novels_router, prefix="/novels", tags=["novels"])
 api_router.include_router(chapters_router, prefix="/novels", tags=["chapters"])
 api_router.include_router(health_router, tags=["health"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
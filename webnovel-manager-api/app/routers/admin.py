@@ -0,0 +1,184 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from ..db.database import get_database, NOVEL_COLLECTION, db_manager
+from ..core.config import settings
+from ..models.novel import PyObjectId
+from ..services.storage_service import storage_service
+from ..db.indexes import describe_indexes, ensure_indexes
+from ..db.change_streams import change_stream_watcher
+from ..db.monitoring import route_operation_stats, pool_stats
+from ..services.chapter_service import chapter_service
+from ..services.library_io import library_io, iter_lines, LibraryImportError
+from ..services.browser_pool import browser_pool
+from ..services.http_client import http_clients
+from ..services.host_limiter import host_limiters
+from ..services.adaptive_concurrency import adaptive_concurrency
+from ..services.http_cache import http_cache
+from ..core.cache import cache_stats, invalidate_novel
+
+router = APIRouter()
+
+
+@router.post("/counters/rebuild", tags=["admin"])
+async def rebuild_counters(db: AsyncIOMotorDatabase = Depends(get_database)):
+    """Recomputes the chapter counters stored on every novel from the chapters collection."""
+    rebuilt = await chapter_service.rebuild_counters(db)
+    invalidate_novel()
+    return {"status": "ok", "novels_with_chapters": rebuilt}
+
+
+@router.get("/indexes", tags=["admin"])
+async def get_indexes(db: AsyncIOMotorDatabase = Depends(get_database)):
+    """Lists the indexes of each managed collection, whether they are declared, missing, and how often they are used."""
+    return await describe_indexes(db)
+
+
+@router.post("/indexes", tags=["admin"])
+async def create_indexes(
+    recreate: bool = Query(False, description="Drop and recreate indexes whose definition changed"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Creates the declared indexes that are missing, and with `recreate` replaces the ones that changed."""
+    failed = await ensure_indexes(db, recreate=recreate)
+    return {"status": "ok" if not failed else "incomplete", "failed": failed}
+
+
+
+@router.get("/cache", tags=["admin"])
+async def get_cache_stats():
+    """Size and hit/miss counters of the in-process novel caches, and the state of the change-stream watcher."""
+    return {**cache_stats(), "change_stream": change_stream_watcher.status()}
+
+
+@router.delete("/cache", tags=["admin"])
+async def clear_cache():
+    """Drops every entry of the in-process novel caches."""
+    invalidate_novel()
+    return {"status": "ok"}
+
+
+@router.get("/db-operations", tags=["admin"])
+async def get_db_operation_stats():
+    """MongoDB commands per request for each route: requests, total, average and max."""
+    return route_operation_stats.snapshot()
+
+
+@router.delete("/db-operations", tags=["admin"])
+async def reset_db_operation_stats():
+    """Resets the per-route MongoDB command counters."""
+    route_operation_stats.reset()
+    return {"status": "ok"}
+
+
+@router.get("/db-pool", tags=["admin"])
+async def get_db_pool_stats():
+    """Connection pool configuration and checkout wait times, to tell whether requests queue for connections."""
+    return {
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        "compressors": db_manager.compressors,
+        "read_preference": settings.MONGODB_READ_PREFERENCE,
+        "listing_read_preference": settings.MONGODB_LISTING_READ_PREFERENCE,
+        "listing_read_concern": settings.MONGODB_LISTING_READ_CONCERN,
+        **pool_stats.snapshot(),
+    }
+
+
+@router.delete("/db-pool", tags=["admin"])
+async def reset_db_pool_stats():
+    """Resets the connection pool wait-time counters."""
+    pool_stats.reset()
+    return {"status": "ok"}
+
+
+@router.get("/browser-pool", tags=["admin"])
+async def get_browser_pool_stats():
+    """Shared browser pool utilization and lease wait times, to size BROWSER_POOL_SIZE."""
+    return browser_pool.snapshot()
+
+
+@router.delete("/browser-pool", tags=["admin"])
+async def reset_browser_pool_stats():
+    """Resets the browser pool lease counters."""
+    browser_pool.reset_stats()
+    return {"status": "ok"}
+
+
+@router.get("/http-clients", tags=["admin"])
+async def get_http_client_stats():
+    """Shared per-host HTTP clients and the requests sent to each host."""
+    return http_clients.stats()
+
+
+@router.get("/http-cache", tags=["admin"])
+async def get_http_cache_stats():
+    """On-disk HTTP cache usage: revalidated and unchanged pages, skipped parses and bytes saved."""
+    return await http_cache.stats()
+
+
+@router.delete("/http-cache", tags=["admin"])
+async def reset_http_cache(purge: bool = Query(False, description="Also delete every cached page")):
+    """Resets the HTTP cache counters, and with `purge` empties the cache."""
+    http_cache.reset_stats()
+    if purge:
+        http_cache.clear()
+    return {"status": "ok"}
+
+
+@router.get("/host-limits", tags=["admin"])
+async def get_host_limits():
+    """Rate limits of each scraped host with the requests in flight and queued for it, and the concurrency learned for each host."""
+    return {"hosts": host_limiters.snapshot(), "adaptive": adaptive_concurrency.snapshot()}
+
+
+@router.post("/content-index/{novel_id}/rebuild", tags=["admin"])
+async def rebuild_content_index(
+    novel_id: PyObjectId,
+    language: str = Query("en", regex="^(en|es)$"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Rebuilds the chapter content index of a novel from its cached raw chapters, e.g. for chapters cached before indexing existed."""
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id}, {"title": 1})
+    if novel is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
+    indexed = await storage_service.rebuild_content_index(novel, language)
+    return {"status": "ok", "chapters_indexed": indexed}
+
+
+@router.get("/library/export", tags=["admin"])
+async def export_library(
+    include_chapters: bool = Query(True, description="Also export the chapter list of every novel"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Streams every novel, then every chapter, as NDJSON. Import it with POST /admin/library/import."""
+    filename = f"library-{datetime.utcnow():%Y%m%d-%H%M%S}.ndjson"
+    return StreamingResponse(
+        library_io.export_lines(db, include_chapters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/library/import", tags=["admin"])
+async def import_library(
+    request: Request,
+    skip_lines: int = Query(0, ge=0, description="Lines already imported, to resume an interrupted import"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Upserts the novels and chapters of an NDJSON export sent as the request body, read as it arrives.
+    The response gives the number of lines committed; on a malformed or rejected line the detail
+    gives them too, to resume with skip_lines=committed_lines once the line is fixed.
+    """
+    try:
+        stats = await library_io.import_lines(db, iter_lines(request.stream()), skip_lines=skip_lines)
+    except LibraryImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": str(e), "committed_lines": e.committed_lines}
+        )
+    finally:
+        invalidate_novel()
+    return {"status": "ok", **stats}
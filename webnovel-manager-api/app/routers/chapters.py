@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional, Union
-from ..models.novel import Chapter, ChapterListResponse, ChapterDownloadResponse, PyObjectId, NovelType
-from ..db.database import get_database
+from ..models.novel import Chapter, ChapterListResponse, ChapterDownloadResponse, ChapterFetchResponse, ChapterSearchResponse, PyObjectId, NovelType
+from ..db.database import get_database, get_listing_database, NOVEL_COLLECTION
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from ..services.epub_service import epub_service
 from ..services.scraper_service import scrape_chapters_for_novel, ScraperError, scrape_chapter_content
@@ -10,45 +10,63 @@ import io
 from datetime import datetime
 from ..services.translation_service import translation_service
 from ..services.storage_service import storage_service
+from ..services.chapter_service import chapter_service
+from ..core.cache import invalidate_novel, invalidate_reading
+from ..core.users import get_user_id
+from ..core.responses import MongoJSONResponse
+from ..services.chapter_state_service import (
+    chapter_state_service, chapter_selection, load_progress, annotate_chapters
+)
 
 router = APIRouter()
-NOVEL_COLLECTION = "novels"
 
-@router.get("/{novel_id}/chapters", response_model=ChapterListResponse, tags=["chapters"])
+@router.get("/{novel_id}/chapters", response_model=ChapterListResponse, response_class=MongoJSONResponse, tags=["chapters"])
 async def get_chapters(
     novel_id: PyObjectId,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_listing_database),
+    user_id: str = Depends(get_user_id)
 ):
-    """Get paginated list of chapters for a novel."""
-    # Find the novel
-    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    """Get paginated list of chapters for a novel, flagged with the user's progress."""
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id}, {"_id": 1})
     if novel is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
 
-    # Get all chapters and sort them
-    chapters = novel.get("chapters", [])
-    total_chapters = len(chapters)
-    
-    # Sort chapters by chapter_number
-    chapters.sort(key=lambda x: x["chapter_number"], reverse=(sort_order == "desc"))
-    
-    # Calculate pagination
-    skip = (page - 1) * page_size
+    # Sorting and pagination run on the (novel_id, chapter_number) index
+    total_chapters = await chapter_service.count(db, novel_id)
     total_pages = (total_chapters + page_size - 1) // page_size
+    paginated_chapters = await chapter_service.list_page(db, novel_id, page, page_size, sort_order)
+    annotate_chapters(paginated_chapters, await chapter_state_service.get_progress(db, user_id, novel_id))
     
-    # Get paginated chapters
-    paginated_chapters = chapters[skip:skip + page_size]
-    
-    return ChapterListResponse(
-        chapters=paginated_chapters,
-        total=total_chapters,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # Chapters come shaped by CHAPTER_PROJECTION and were validated when fetched from the source
+    return MongoJSONResponse({
+        "chapters": paginated_chapters,
+        "total": total_chapters,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages
+    })
+
+@router.get("/{novel_id}/chapters/search", response_model=ChapterSearchResponse, tags=["chapters"])
+async def search_chapter_content(
+    novel_id: PyObjectId,
+    q: str = Query(..., min_length=1, description="Words that must all appear in the chapter"),
+    language: str = Query("en", regex="^(en|es)$"),
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Search the cached text of a novel's chapters, in chapter order, so the first result is
+    where the words first appear. Only chapters downloaded as raw text are indexed.
+    """
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id}, {"title": 1})
+    if novel is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
+
+    results = await storage_service.search_chapters(novel, q, language, limit)
+    return ChapterSearchResponse(query=q, results=results)
 
 @router.get("/{novel_id}/chapters/{chapter_number}", tags=["chapters"])
 async def download_chapter(
@@ -56,7 +74,8 @@ async def download_chapter(
     chapter_number: int,
     language: str = Query("en", regex="^(en|es)$"),
     format: str = Query("epub", regex="^(epub|raw)$"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    user_id: str = Depends(get_user_id)
 ):
     """Download a specific chapter."""
     # Find the novel
@@ -65,9 +84,11 @@ async def download_chapter(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
 
     # Find the chapter
-    chapter_dict = next((c for c in novel.get("chapters", []) if c["chapter_number"] == chapter_number), None)
+    chapter_dict = await chapter_service.get(db, novel_id, chapter_number)
     if not chapter_dict:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Chapter {chapter_number} not found")
+    state = await chapter_state_service.get_state(db, user_id, novel_id)
+    annotate_chapters([chapter_dict], load_progress(state))
 
     # Convert dictionary to Chapter object
     chapter = Chapter(
@@ -75,8 +96,8 @@ async def download_chapter(
         chapter_number=chapter_dict["chapter_number"],
         chapter_title=chapter_dict.get("chapter_title"),
         url=chapter_dict["url"],
-        read=chapter_dict.get("read", False),
-        downloaded=chapter_dict.get("downloaded", False)
+        read=chapter_dict["read"],
+        downloaded=chapter_dict["downloaded"]
     )
 
     try:
@@ -85,15 +106,11 @@ async def download_chapter(
             content = await scrape_chapter_content(str(chapter.url), novel["source_name"], str(novel_id), chapter_number)
             
             # Update chapter status
-            await db[NOVEL_COLLECTION].update_one(
-                {"_id": novel_id, "chapters.chapter_number": chapter_number},
-                {
-                    "$set": {
-                        "chapters.$.downloaded": True,
-                        "chapters.$.read": True
-                    }
-                }
+            await chapter_state_service.mark(
+                db, user_id, novel_id, chapter_selection([chapter_number]), state,
+                downloaded=True, read=True
             )
+            invalidate_reading()
             
             return content
 
@@ -111,15 +128,11 @@ async def download_chapter(
             )
 
             # Update chapter status
-            await db[NOVEL_COLLECTION].update_one(
-                {"_id": novel_id, "chapters.chapter_number": chapter_number},
-                {
-                    "$set": {
-                        "chapters.$.downloaded": True,
-                        "chapters.$.read": True
-                    }
-                }
+            await chapter_state_service.mark(
+                db, user_id, novel_id, chapter_selection([chapter_number]), state,
+                downloaded=True, read=True
             )
+            invalidate_reading()
 
             return StreamingResponse(
                 io.BytesIO(epub_bytes),
@@ -148,15 +161,11 @@ async def download_chapter(
                     cleaned_content = await translation_service.translate_text(cleaned_content)
                     
                 await storage_service.save_chapter(novel, chapter_number, cleaned_content, "raw", language)
-            await db[NOVEL_COLLECTION].update_one(
-                {"_id": novel_id, "chapters.chapter_number": chapter_number},
-                {
-                    "$set": {
-                        "chapters.$.downloaded": True,
-                        "chapters.$.read": True
-                    }
-                }
+            await chapter_state_service.mark(
+                db, user_id, novel_id, chapter_selection([chapter_number]), state,
+                downloaded=True, read=True
             )
+            invalidate_reading()
             
             return {
                 "title": chapter.title,
@@ -175,7 +184,8 @@ async def download_chapters(
     novel_id: PyObjectId,
     chapter_numbers: List[int],
     language: str = Query("en", regex="^(en|es)$"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    user_id: str = Depends(get_user_id)
 ):
     """Download multiple chapters."""
     # Find the novel
@@ -184,9 +194,11 @@ async def download_chapters(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
 
     # Filter chapters and convert to Chapter objects
-    chapter_dicts = [c for c in novel.get("chapters", []) if c["chapter_number"] in chapter_numbers]
+    chapter_dicts = await chapter_service.get_many(db, novel_id, chapter_numbers)
     if not chapter_dicts:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No valid chapters found")
+    state = await chapter_state_service.get_state(db, user_id, novel_id)
+    annotate_chapters(chapter_dicts, load_progress(state))
 
     # Convert dictionaries to Chapter objects
     chapters = [
@@ -195,8 +207,8 @@ async def download_chapters(
             chapter_number=chapter_dict["chapter_number"],
             chapter_title=chapter_dict.get("chapter_title"),
             url=chapter_dict["url"],
-            read=chapter_dict.get("read", False),
-            downloaded=chapter_dict.get("downloaded", False)
+            read=chapter_dict["read"],
+            downloaded=chapter_dict["downloaded"]
         )
         for chapter_dict in chapter_dicts
     ]
@@ -214,15 +226,11 @@ async def download_chapters(
                 })
             
             # Update chapter status
-            await db[NOVEL_COLLECTION].update_many(
-                {"_id": novel_id, "chapters.chapter_number": {"$in": chapter_numbers}},
-                {
-                    "$set": {
-                        "chapters.$.downloaded": True,
-                        "chapters.$.read": True
-                    }
-                }
+            await chapter_state_service.mark(
+                db, user_id, novel_id, chapter_selection(chapter_numbers), state,
+                downloaded=True, read=True
             )
+            invalidate_reading()
             
             return {
                 "type": "manhwa",
@@ -241,15 +249,11 @@ async def download_chapters(
         )
 
         # Update chapter status
-        await db[NOVEL_COLLECTION].update_many(
-            {"_id": novel_id, "chapters.chapter_number": {"$in": chapter_numbers}},
-            {
-                "$set": {
-                    "chapters.$.downloaded": True,
-                    "chapters.$.read": True
-                }
-            }
+        await chapter_state_service.mark(
+            db, user_id, novel_id, chapter_selection(chapter_numbers), state,
+            downloaded=True, read=True
         )
+        invalidate_reading()
 
         return StreamingResponse(
             io.BytesIO(epub_bytes),
@@ -264,14 +268,15 @@ async def download_chapters(
             detail=f"Error generating content: {str(e)}"
         )
 
-@router.post("/{novel_id}/chapters/fetch", response_model=ChapterListResponse, tags=["chapters"])
+@router.post("/{novel_id}/chapters/fetch", response_model=ChapterFetchResponse, tags=["chapters"])
 async def fetch_chapters_from_source(
     novel_id: PyObjectId,
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    user_id: str = Depends(get_user_id)
 ):
     """Fetch and update chapters from the source website."""
     # Find the novel
-    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id}, {"source_url": 1, "source_name": 1})
     if novel is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
 
@@ -288,48 +293,20 @@ async def fetch_chapters_from_source(
                 detail="No chapters found on the source website"
             )
 
-        # Get existing chapters to preserve their states
-        existing_chapters = novel.get("chapters", [])
-        existing_chapters_dict = {c["chapter_number"]: c for c in existing_chapters}
-
-        # Convert to dictionary format and preserve states
-        new_chapters_dict = []
-        for chapter in new_chapters:
-            chapter_dict = {
-                "title": chapter.title,
-                "chapter_number": chapter.chapter_number,
-                "chapter_title": chapter.chapter_title,
-                "url": str(chapter.url),
-                "read": False,
-                "downloaded": False
-            }
-            
-            # If chapter exists, preserve its state
-            if chapter.chapter_number in existing_chapters_dict:
-                existing_chapter = existing_chapters_dict[chapter.chapter_number]
-                chapter_dict["read"] = existing_chapter.get("read", False)
-                chapter_dict["downloaded"] = existing_chapter.get("downloaded", False)
-            
-            new_chapters_dict.append(chapter_dict)
-
-        # Update novel with new chapters
-        await db[NOVEL_COLLECTION].update_one(
-            {"_id": novel_id},
-            {
-                "$set": {
-                    "chapters": new_chapters_dict,
-                    "last_updated_chapters": datetime.utcnow()
-                }
-            }
-        )
+        # Persist only what changed on the source; read/downloaded states are left alone
+        diff = await chapter_service.merge_from_source(db, novel_id, new_chapters)
+        invalidate_novel(novel_id)
+        annotate_chapters(diff["added"] + diff["changed"], await chapter_state_service.get_progress(db, user_id, novel_id))
 
-        # Return the updated chapters
-        return ChapterListResponse(
-            chapters=new_chapters_dict,
-            total=len(new_chapters_dict),
-            page=1,
-            page_size=len(new_chapters_dict),
-            total_pages=1
+        return ChapterFetchResponse(
+            added=diff["added"],
+            changed=diff["changed"],
+            removed=[c["chapter_number"] for c in diff["removed"]],
+            added_count=len(diff["added"]),
+            changed_count=len(diff["changed"]),
+            removed_count=len(diff["removed"]),
+            unchanged_count=diff["unchanged"],
+            total=len(diff["added"]) + len(diff["changed"]) + diff["unchanged"]
         )
 
     except ScraperError as e:
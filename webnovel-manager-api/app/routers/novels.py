@@ -1,17 +1,97 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
-from typing import List, Optional
-from ..models.novel import NovelCreate, NovelPublic, NovelUpdate, PyObjectId, NovelSummary, NovelDetail, ChapterDownloadResponse, Chapter, NovelType
-from ..db.database import get_database
+from typing import List, Optional, Union
+from ..models.novel import NovelCreate, NovelPublic, NovelUpdate, PyObjectId, NovelSummary, NovelDetail, NovelPage, NovelBatchRequest, NovelBatchResponse, NovelSearchResponse, ContinueReadingItem, ChapterDownloadResponse, Chapter, NovelType
+from ..db.database import get_database, get_listing_database, NOVEL_COLLECTION
+from ..db.loader import NovelLoader, get_novel_loader
+from ..db.versioning import VERSION_FIELD, ConcurrentUpdateError
+from ..db.pagination import encode_cursor, decode_cursor, keyset_filter, InvalidCursor
 from ..services.scraper_service import scrape_chapters_for_novel, scrape_novel_info, ScraperError
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from ..services.epub_service import EpubService
+from ..services.chapter_service import chapter_service, EMPTY_COUNTERS
+from ..services.chapter_state_service import chapter_state_service, progress_counters
+from ..services.library_service import library_service
+from ..services.search_service import search_service, search_filter
+from ..core.cache import novel_list_cache, novel_detail_cache, reading_cache, invalidate_novel, invalidate_reading
+from ..core.users import get_user_id
+from ..core.responses import MongoJSONResponse, dump_json
 
 router = APIRouter()
-NOVEL_COLLECTION = "novels"
 epub_service = EpubService()
 
+# Only the fields a NovelSummary needs; chapters are never transferred
+SUMMARY_PROJECTION = {
+    "title": 1,
+    "author": 1,
+    "cover_image_url": 1,
+    "status": 1,
+    "type": 1,
+    "last_updated_chapters": 1,
+    "added_at": 1,
+    **{counter: 1 for counter in EMPTY_COUNTERS}
+}
+
+# Everything except a leftover embedded chapter array
+DETAIL_PROJECTION = {"chapters": 0}
+
+# Largest keyset page of GET /novels; offset mode keeps accepting any limit
+MAX_PAGE_SIZE = 500
+
+def _build_novel_summary(novel: dict) -> dict:
+    """
+    Shape a novel document read with SUMMARY_PROJECTION as the part of a NovelSummary
+    dict every user shares; _with_progress adds the user's counters.
+    Values were validated when written, so no model is built here.
+    """
+    return {
+        "_id": novel["_id"],
+        "title": novel["title"],
+        "author": novel.get("author"),
+        "cover_image_url": novel.get("cover_image_url"),
+        "status": novel.get("status"),
+        "type": novel.get("type", NovelType.NOVEL),
+        "total_chapters": novel.get("total_chapters", 0),
+        "last_chapter_number": novel.get("last_chapter_number", 0),
+        "last_updated_chapters": novel.get("last_updated_chapters"),
+        "added_at": novel["added_at"]
+    }
+
+def _build_novel_detail(novel: dict) -> dict:
+    """Shape a novel document as the shared part of a NovelDetail dict."""
+    return {
+        **_build_novel_summary(novel),
+        "description": novel.get("description"),
+        "source_url": novel["source_url"],
+        "source_name": novel["source_name"],
+        "tags": novel.get("tags", [])
+    }
+
+def _with_progress(summary: dict, state: Optional[dict]) -> dict:
+    """A copy of a shared summary or detail with the counters of the user's progress document."""
+    return {**summary, **progress_counters(state)}
+
+def _with_detail_progress(detail: dict, state: Optional[dict]) -> dict:
+    """_with_progress plus the reading progress percentage of a NovelDetail."""
+    detail = _with_progress(detail, state)
+    total_chapters = detail["total_chapters"]
+    detail["reading_progress"] = (detail["read_chapters"] / total_chapters * 100) if total_chapters > 0 else 0
+    return detail
+
+async def _summaries_with_progress(db: AsyncIOMotorDatabase, user_id: str, summaries: List[dict]) -> List[dict]:
+    """Overlay the user's counters on shared summaries, with one query for all of them."""
+    states = await chapter_state_service.get_states(db, user_id, [summary["_id"] for summary in summaries])
+    return [_with_progress(summary, states.get(summary["_id"])) for summary in summaries]
+
+def _novel_detail_response(novel: dict, state: Optional[dict]) -> MongoJSONResponse:
+    """Render a novel document as NovelDetail for a user, caching the shared part for get_novel_by_id."""
+    detail = _build_novel_detail(novel)
+    novel_detail_cache.set(str(novel["_id"]), detail)
+    return MongoJSONResponse(_with_detail_progress(detail, state))
+
 @router.post(
     "/", 
     response_model=NovelPublic, 
@@ -23,14 +103,14 @@ async def create_novel(
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Adds a new novel to the library."""
-    # Check if novel with the same source_url already exists
-    existing_novel = await db[NOVEL_COLLECTION].find_one({"source_url": str(novel_in.source_url)})
-    if existing_novel:
+    # Cheap check before scraping; the unique index still settles concurrent creations,
+    # and covers for it if the index could not be built
+    if await db[NOVEL_COLLECTION].find_one({"source_url": str(novel_in.source_url)}, {"_id": 1}) is not None:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT, 
+            status_code=status.HTTP_409_CONFLICT,
             detail=f"Novel from source URL {novel_in.source_url} already exists."
         )
-    
+
     # Scrape novel info if not provided
     if not novel_in.title or not novel_in.description:
         try:
@@ -58,97 +138,204 @@ async def create_novel(
     # Add timestamps
     novel_dict["added_at"] = datetime.utcnow()
     novel_dict["last_updated_api"] = datetime.utcnow()
+    novel_dict.update(EMPTY_COUNTERS)
+    novel_dict[VERSION_FIELD] = 0
     
-    insert_result = await db[NOVEL_COLLECTION].insert_one(novel_dict)
-    created_novel = await db[NOVEL_COLLECTION].find_one({"_id": insert_result.inserted_id})
-    
-    if created_novel is None:
-         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create novel after insert.")
+    # The unique index on source_url rejects duplicates atomically
+    try:
+        insert_result = await db[NOVEL_COLLECTION].insert_one(novel_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, 
+            detail=f"Novel from source URL {novel_in.source_url} already exists."
+        )
 
-    return NovelPublic(**created_novel)
+    # insert_one added the new _id to novel_dict, which is the stored document
+    invalidate_novel(insert_result.inserted_id)
+    return NovelPublic(**novel_dict)
 
-@router.get("/", response_model=List[NovelSummary], tags=["novels"])
+@router.get("/", response_model=Union[List[NovelSummary], NovelPage], response_class=MongoJSONResponse, tags=["novels"])
 async def get_novels(
-    db: AsyncIOMotorDatabase = Depends(get_database),
-    skip: int = 0,
-    limit: int = 100,
-    type: Optional[NovelType] = None
+    db: AsyncIOMotorDatabase = Depends(get_listing_database),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=0, description="Novels per page, 0 for all in offset mode; 1 to 500 with sort_by or cursor"),
+    type: Optional[NovelType] = None,
+    sort_by: Optional[str] = Query(None, regex="^(added_at|last_updated_chapters|title)$"),
+    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    user_id: str = Depends(get_user_id)
 ):
-    """Retrieves a list of all novels in the library with summary information."""
+    """
+    Retrieves a list of all novels in the library with summary information.
+
+    Passing `sort_by` and/or `cursor` switches to keyset pagination and returns a page
+    with a `next_cursor`. Without them the legacy `skip`/`limit` list is returned.
+    Pages are cached in-process for a few seconds, shared by every user, and writes
+    invalidate them; the user's read/downloaded counters are always read fresh.
+    """
+    cache_key = (skip, limit, type, sort_by, sort_order, cursor)
+    hit, page = novel_list_cache.get(cache_key)
+    if not hit:
+        page = await _load_novels_page(db, skip, limit, type, sort_by, sort_order, cursor)
+        novel_list_cache.set(cache_key, page)
+
+    if isinstance(page, list):
+        return MongoJSONResponse(await _summaries_with_progress(db, user_id, page))
+    return MongoJSONResponse({**page, "novels": await _summaries_with_progress(db, user_id, page["novels"])})
+
+async def _load_novels_page(
+    db: AsyncIOMotorDatabase,
+    skip: int,
+    limit: int,
+    type: Optional[NovelType],
+    sort_by: Optional[str],
+    sort_order: str,
+    cursor: Optional[str]
+) -> Union[List[dict], dict]:
+    """The shared summaries of a get_novels page, as a list in offset mode and a page otherwise."""
+
     query = {}
     if type:
         query["type"] = type
-    
-    novels_cursor = db[NOVEL_COLLECTION].find(query).skip(skip).limit(limit)
-    novels = await novels_cursor.to_list(length=limit)
-    
-    # Convert to NovelSummary with calculated fields
-    novel_summaries = []
-    for novel in novels:
-        chapters = novel.get("chapters", [])
-        total_chapters = len(chapters)
-        read_chapters = sum(1 for c in chapters if c.get("read", False))
-        downloaded_chapters = sum(1 for c in chapters if c.get("downloaded", False))
-        last_chapter = max((c["chapter_number"] for c in chapters), default=0)
-        
-        novel_summaries.append(NovelSummary(
-            _id=novel["_id"],
-            title=novel["title"],
-            author=novel.get("author"),
-            cover_image_url=novel.get("cover_image_url"),
-            status=novel.get("status"),
-            type=novel.get("type", NovelType.NOVEL),
-            total_chapters=total_chapters,
-            last_chapter_number=last_chapter,
-            read_chapters=read_chapters,
-            downloaded_chapters=downloaded_chapters,
-            last_updated_chapters=novel.get("last_updated_chapters"),
-            added_at=novel["added_at"]
-        ))
-    
-    return novel_summaries
 
-@router.get("/{novel_id}", response_model=NovelDetail, tags=["novels"])
+    if sort_by is None and cursor is None:
+        # Offset mode, kept for backward compatibility
+        novels_cursor = db[NOVEL_COLLECTION].find(query, SUMMARY_PROJECTION).skip(skip).limit(limit)
+        # limit=0 means no limit, as it always did
+        novels = await novels_cursor.to_list(length=limit or None)
+        return [_build_novel_summary(novel) for novel in novels]
+
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {MAX_PAGE_SIZE} with sort_by or cursor"
+        )
+    sort_by = sort_by or "added_at"
+    descending = sort_order == "desc"
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, sort_by, sort_order)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = {"$and": [query, keyset_filter(sort_by, value, last_id, descending)]}
+
+    # Backed by the (sort_by, _id) indexes; one extra document tells whether a next page exists
+    direction = DESCENDING if descending else ASCENDING
+    novels_cursor = (
+        db[NOVEL_COLLECTION]
+        .find(query, SUMMARY_PROJECTION)
+        .sort([(sort_by, direction), ("_id", direction)])
+        .limit(limit + 1)
+    )
+    novels = await novels_cursor.to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(novels) > limit:
+        novels = novels[:limit]
+        last = novels[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, last.get(sort_by), last["_id"])
+
+    return {
+        "novels": [_build_novel_summary(novel) for novel in novels],
+        "next_cursor": next_cursor
+    }
+
+@router.post("/batch", response_model=NovelBatchResponse, response_class=MongoJSONResponse, tags=["novels"])
+async def get_novels_batch(
+    batch: NovelBatchRequest,
+    db: AsyncIOMotorDatabase = Depends(get_listing_database),
+    user_id: str = Depends(get_user_id)
+):
+    """
+    Retrieves the summaries of many novels with a single `$in` query. Results follow the
+    order of the requested ids, with `found: false` for ids that match no novel.
+    """
+    novels_cursor = db[NOVEL_COLLECTION].find({"_id": {"$in": list(set(batch.ids))}}, SUMMARY_PROJECTION)
+    novels = {novel["_id"]: novel async for novel in novels_cursor}
+    states = await chapter_state_service.get_states(db, user_id, novels.keys())
+
+    results = []
+    for novel_id in batch.ids:
+        novel = novels.get(novel_id)
+        results.append({
+            "id": novel_id,
+            "found": novel is not None,
+            "novel": _with_progress(_build_novel_summary(novel), states.get(novel_id)) if novel is not None else None
+        })
+    return MongoJSONResponse({"results": results})
+
+@router.get("/search", response_model=NovelSearchResponse, response_class=MongoJSONResponse, tags=["novels"])
+async def search_novels(
+    db: AsyncIOMotorDatabase = Depends(get_listing_database),
+    q: Optional[str] = Query(None, description="Words to look for in title, author, description and tags"),
+    novel_status: Optional[str] = Query(None, alias="status"),
+    source_name: Optional[str] = None,
+    source_language: Optional[str] = None,
+    tags: Optional[List[str]] = Query(None, description="Novels must have every given tag"),
+    type: Optional[NovelType] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    user_id: str = Depends(get_user_id)
+):
+    """
+    Searches the library on the text index, ranked by relevance when `q` is given,
+    filtered on status, source, language, type and tags, with facet counts per value.
+    """
+    query = search_filter(q, novel_status, source_name, source_language, tags, type)
+    found = await search_service.search(db, query, SUMMARY_PROJECTION, skip, limit)
+    summaries = await _summaries_with_progress(db, user_id, [_build_novel_summary(novel) for novel in found["results"]])
+    results = [
+        {**summary, "score": novel.get("score")}
+        for summary, novel in zip(summaries, found["results"])
+    ]
+    return MongoJSONResponse({"results": results, "total": found["total"], "facets": found["facets"]})
+
+@router.get("/continue-reading", response_model=List[ContinueReadingItem], response_class=MongoJSONResponse, tags=["novels"])
+async def get_continue_reading(
+    db: AsyncIOMotorDatabase = Depends(get_listing_database),
+    limit: int = Query(50, ge=1, le=500),
+    type: Optional[NovelType] = None,
+    only_unread: bool = Query(True, description="Skip novels with every chapter read"),
+    user_id: str = Depends(get_user_id)
+):
+    """
+    Home screen data in one call: novels by latest chapter update, each with the user's
+    next unread chapter and unread count, computed in a single aggregation.
+    """
+    cache_key = (user_id, limit, type, only_unread)
+    hit, cached = reading_cache.get(cache_key)
+    if hit:
+        return MongoJSONResponse(cached)
+
+    body = dump_json(await library_service.continue_reading(db, user_id, limit, type, only_unread))
+    reading_cache.set(cache_key, body)
+    return MongoJSONResponse(body)
+
+@router.get("/{novel_id}", response_model=NovelDetail, response_class=MongoJSONResponse, tags=["novels"])
 async def get_novel_by_id(
     novel_id: PyObjectId,
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    user_id: str = Depends(get_user_id)
 ):
-    """Retrieves a specific novel by its ID with detailed information."""
-    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    """Retrieves a specific novel by its ID with detailed information and the user's progress."""
+    hit, detail = novel_detail_cache.get(str(novel_id))
+    if hit:
+        state = await chapter_state_service.get_state(db, user_id, novel_id)
+        return MongoJSONResponse(_with_detail_progress(detail, state))
+
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id}, DETAIL_PROJECTION)
     if novel is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
     
-    # Calculate reading progress
-    chapters = novel.get("chapters", [])
-    total_chapters = len(chapters)
-    read_chapters = sum(1 for c in chapters if c.get("read", False))
-    reading_progress = (read_chapters / total_chapters * 100) if total_chapters > 0 else 0
-    
-    return NovelDetail(
-        _id=novel["_id"],
-        title=novel["title"],
-        author=novel.get("author"),
-        cover_image_url=novel.get("cover_image_url"),
-        status=novel.get("status"),
-        type=novel.get("type", NovelType.NOVEL),
-        total_chapters=total_chapters,
-        last_chapter_number=max((c["chapter_number"] for c in chapters), default=0),
-        read_chapters=read_chapters,
-        downloaded_chapters=sum(1 for c in chapters if c.get("downloaded", False)),
-        last_updated_chapters=novel.get("last_updated_chapters"),
-        added_at=novel["added_at"],
-        description=novel.get("description"),
-        source_url=novel["source_url"],
-        source_name=novel["source_name"],
-        tags=novel.get("tags", []),
-        reading_progress=reading_progress
-    )
+    return _novel_detail_response(novel, await chapter_state_service.get_state(db, user_id, novel_id))
 
-@router.patch("/{novel_id}", response_model=NovelDetail, tags=["novels"])
+@router.patch("/{novel_id}", response_model=NovelDetail, response_class=MongoJSONResponse, tags=["novels"])
 async def update_novel(
     novel_id: PyObjectId,
     novel_update: NovelUpdate = Body(...),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    loader: NovelLoader = Depends(get_novel_loader),
+    user_id: str = Depends(get_user_id)
 ):
     """Updates an existing novel."""
     update_data = novel_update.model_dump(exclude_unset=True)
@@ -167,16 +354,19 @@ async def update_novel(
     # Ensure we update the timestamp
     update_data["last_updated_api"] = datetime.utcnow()
 
-    result = await db[NOVEL_COLLECTION].update_one(
-        {"_id": novel_id},
-        {"$set": update_data}
-    )
-
-    if result.matched_count == 0:
+    # The updated document comes back with the update, no second read
+    try:
+        novel = await loader.update(novel_id, {"$set": update_data})
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Novel from source URL {update_data.get('source_url')} already exists."
+        )
+    if novel is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
 
-    # Return the updated novel with all details
-    return await get_novel_by_id(novel_id, db)
+    invalidate_novel(novel_id)
+    return _novel_detail_response(novel, await chapter_state_service.get_state(db, user_id, novel_id))
 
 @router.delete("/{novel_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["novels"])
 async def delete_novel(
@@ -187,101 +377,49 @@ async def delete_novel(
     result = await db[NOVEL_COLLECTION].delete_one({"_id": novel_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
+    await chapter_service.delete_for_novel(db, novel_id)
+    await chapter_state_service.delete_for_novel(db, novel_id)
+    invalidate_novel(novel_id)
     return
 
 
-@router.patch("/{novel_id}/reading-progress", response_model=NovelDetail, tags=["novels"])
+@router.patch("/{novel_id}/reading-progress", response_model=NovelDetail, response_class=MongoJSONResponse, tags=["novels"])
 async def update_reading_progress(
     novel_id: PyObjectId,
     current_chapter: int = Query(..., description="The current chapter number being read"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    loader: NovelLoader = Depends(get_novel_loader),
+    user_id: str = Depends(get_user_id)
 ):
-    """Update the reading progress of a novel by marking chapters as read and downloaded up to the current chapter."""
+    """Update the user's reading progress of a novel by marking chapters as read and downloaded up to the current chapter."""
     # Find the novel
-    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    novel = await loader.get(novel_id)
     if novel is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
     
-    # Get all chapters
-    chapters = novel.get("chapters", [])
-    if not chapters:
+    if not novel.get("total_chapters"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No chapters available for this novel")
     
-    # Update chapter statuses
-    for chapter in chapters:
-        chapter_number = chapter["chapter_number"]
-        if chapter_number < current_chapter:
-            # Mark chapters before current as read and downloaded
-            await db[NOVEL_COLLECTION].update_one(
-                {"_id": novel_id, "chapters.chapter_number": chapter_number},
-                {
-                    "$set": {
-                        "chapters.$.read": True,
-                        "chapters.$.downloaded": True
-                    }
-                }
-            )
-        elif chapter_number == current_chapter:
-            # Mark current chapter as neither read nor downloaded
-            await db[NOVEL_COLLECTION].update_one(
-                {"_id": novel_id, "chapters.chapter_number": chapter_number},
-                {
-                    "$set": {
-                        "chapters.$.read": False,
-                        "chapters.$.downloaded": False
-                    }
-                }
-            )
-        else:
-            # Mark chapters after current as neither read nor downloaded
-            await db[NOVEL_COLLECTION].update_one(
-                {"_id": novel_id, "chapters.chapter_number": chapter_number},
-                {
-                    "$set": {
-                        "chapters.$.read": False,
-                        "chapters.$.downloaded": False
-                    }
-                }
-            )
-    
-    # Return the updated novel
-    updated_novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
-    if updated_novel is None:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve updated novel")
-    
-    # Calculate reading progress
-    total_chapters = len(updated_novel.get("chapters", []))
-    read_chapters = sum(1 for c in updated_novel.get("chapters", []) if c.get("read", False))
-    reading_progress = (read_chapters / total_chapters * 100) if total_chapters > 0 else 0
+    # Chapters before current become read and downloaded, the rest neither: a single range per flag
+    try:
+        state = await chapter_state_service.set_reading_position(db, user_id, novel_id, current_chapter)
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    # Only the user's own progress changed, so the shared novel caches stay valid
+    invalidate_reading()
     
-    return NovelDetail(
-        _id=updated_novel["_id"],
-        title=updated_novel["title"],
-        author=updated_novel.get("author"),
-        cover_image_url=updated_novel.get("cover_image_url"),
-        status=updated_novel.get("status"),
-        type=updated_novel.get("type", NovelType.NOVEL),
-        total_chapters=total_chapters,
-        last_chapter_number=max((c["chapter_number"] for c in updated_novel.get("chapters", [])), default=0),
-        read_chapters=read_chapters,
-        downloaded_chapters=sum(1 for c in updated_novel.get("chapters", []) if c.get("downloaded", False)),
-        last_updated_chapters=updated_novel.get("last_updated_chapters"),
-        added_at=updated_novel["added_at"],
-        description=updated_novel.get("description"),
-        source_url=updated_novel["source_url"],
-        source_name=updated_novel["source_name"],
-        tags=updated_novel.get("tags", []),
-        reading_progress=reading_progress
-    )
+    return _novel_detail_response(novel, state)
 
-@router.post("/{novel_id}/metadata", response_model=NovelDetail, tags=["novels"])
+@router.post("/{novel_id}/metadata", response_model=NovelDetail, response_class=MongoJSONResponse, tags=["novels"])
 async def update_metadata(
     novel_id: PyObjectId,
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    loader: NovelLoader = Depends(get_novel_loader),
+    user_id: str = Depends(get_user_id)
 ):
     """Update the metadata of a novel by scraping it from the source website."""
     # Find the novel
-    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    novel = await loader.get(novel_id)
     if novel is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
     
@@ -304,16 +442,14 @@ async def update_metadata(
         if update_data["cover_image_url"]:
             update_data["cover_image_url"] = str(update_data["cover_image_url"])
         
-        result = await db[NOVEL_COLLECTION].update_one(
-            {"_id": novel_id},
-            {"$set": update_data}
-        )
+        novel = await loader.update(novel_id, {"$set": update_data})
         
-        if result.matched_count == 0:
+        if novel is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Novel with id {novel_id} not found")
         
         # Return the updated novel with all details
-        return await get_novel_by_id(novel_id, db)
+        invalidate_novel(novel_id)
+        return _novel_detail_response(novel, await chapter_state_service.get_state(db, user_id, novel_id))
         
     except ScraperError as e:
         raise HTTPException(
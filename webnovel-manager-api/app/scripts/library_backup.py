@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.services.library_io import library_io, LibraryImportError
+
+# Usage:
+#   python -m app.scripts.library_backup export library.ndjson [--no-chapters]
+#   python -m app.scripts.library_backup import library.ndjson [--restart]
+#
+# An import stores the number of committed lines next to the file (<file>.checkpoint)
+# and continues from there when run again; --restart ignores it.
+
+def _checkpoint_path(path: Path) -> Path:
+    return path.with_name(path.name + ".checkpoint")
+
+async def export_library(db, path: Path, include_chapters: bool):
+    start_time = time.time()
+    lines = 0
+    with open(path, "w", encoding="utf-8") as f:
+        async for line in library_io.export_lines(db, include_chapters):
+            f.write(line)
+            lines += 1
+    print(f"Exported {lines} lines to {path} in {time.time() - start_time:.2f} seconds")
+
+async def import_library(db, path: Path, restart: bool):
+    checkpoint = _checkpoint_path(path)
+    skip_lines = 0
+    if checkpoint.exists() and not restart:
+        skip_lines = int(checkpoint.read_text().strip() or 0)
+        print(f"Resuming after line {skip_lines}")
+
+    start_time = time.time()
+
+    async def read_lines():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line
+
+    async def save_checkpoint(lines: int):
+        checkpoint.write_text(str(lines))
+        elapsed = time.time() - start_time
+        print(f"Committed {lines} lines ({(lines - skip_lines) / max(elapsed, 1e-6):.0f} lines/s)")
+
+    try:
+        stats = await library_io.import_lines(db, read_lines(), skip_lines=skip_lines, on_commit=save_checkpoint)
+    except LibraryImportError as e:
+        # The checkpoint already holds the committed lines, run again once the line is fixed
+        print(f"Import stopped: {e}")
+        return
+    checkpoint.unlink(missing_ok=True)
+    print(f"Import completed! {stats['novels']} novels, {stats['progress']} progress, {stats['chapters']} chapters in {time.time() - start_time:.2f} seconds")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Export or import the novel library as NDJSON.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("path", type=Path)
+    export_parser.add_argument("--no-chapters", action="store_true", help="Only export the novels")
+    import_parser = subparsers.add_parser("import")
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument("--restart", action="store_true", help="Ignore a saved checkpoint")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    try:
+        if args.command == "export":
+            await export_library(db, args.path, not args.no_chapters)
+        else:
+            await import_library(db, args.path, args.restart)
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
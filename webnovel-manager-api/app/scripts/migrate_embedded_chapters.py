@@ -0,0 +1,11 @@
+import asyncio
+from app.db.migrations import MIGRATIONS, run_migrations
+
+# Kept for existing instructions; the migration is now 002_embedded_chapters in app.db.migrations,
+# followed by 003_progress_ranges. Prefer `python -m app.db.migrations`.
+
+async def migrate_embedded_chapters():
+    await run_migrations(MIGRATIONS, only=["002_embedded_chapters", "003_progress_ranges"])
+
+if __name__ == "__main__":
+    asyncio.run(migrate_embedded_chapters())
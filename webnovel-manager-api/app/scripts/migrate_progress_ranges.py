@@ -0,0 +1,11 @@
+import asyncio
+from app.db.migrations import MIGRATIONS, run_migrations
+
+# Kept for existing instructions; the migration is now 003_progress_ranges in app.db.migrations.
+# Prefer `python -m app.db.migrations`.
+
+async def migrate_progress_ranges():
+    await run_migrations(MIGRATIONS, only=["003_progress_ranges"])
+
+if __name__ == "__main__":
+    asyncio.run(migrate_progress_ranges())
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from ..core.config import settings
+from ..db.database import SCRAPER_LIMITS_COLLECTION
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit of one host, tuned by additive increase / multiplicative decrease.
+
+    After every window of requests the limit grows by one if the error rate stayed under
+    ADAPTIVE_ERROR_RATE_THRESHOLD, the p95 latency within ADAPTIVE_LATENCY_TOLERANCE times
+    the best p95 seen (queueing at the source shows up as latency first), and the requests
+    in flight reached the limit at some point: a limit nobody uses says nothing about the
+    source, e.g. a scraper fetching one page at a time. It never grows past `ceiling`, the
+    strictest max_concurrent_requests declared for the host, else ADAPTIVE_MAX_CONCURRENCY.
+    A 429, a 5xx or a timeout cuts it by ADAPTIVE_DECREASE_FACTOR at once; requests already
+    in flight at the old limit fail too, so further cuts wait until that many requests completed.
+    """
+
+    def __init__(self, name: str, limit: float):
+        self.name = name
+        self.ceiling = settings.ADAPTIVE_MAX_CONCURRENCY
+        self.limit = float(limit)
+        self.latencies: Deque[float] = deque(maxlen=settings.ADAPTIVE_WINDOW)
+        self.samples = 0
+        self.errors = 0
+        self.peak_in_flight = 0
+        self.baseline_p95: Optional[float] = None
+        self.last_p95: Optional[float] = None
+        self.last_error_rate = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self._cut_cooldown = 0
+        self.changed = False
+
+    @property
+    def concurrency(self) -> int:
+        # The limit keeps the fractions left by cuts; requests in flight are whole
+        return max(int(self.limit), 1)
+
+    def declare_ceiling(self, ceiling: int) -> None:
+        """Never go past `ceiling`, a max_concurrent_requests a scraper of the host declared."""
+        self.ceiling = min(self.ceiling, ceiling)
+        if self.limit > self.ceiling:
+            self._set(self.ceiling)
+
+    def record(self, latency: float, failed: bool, in_flight: int) -> None:
+        """One request outcome, with the requests in flight to the host when it completed (itself included)."""
+        self.samples += 1
+        self.peak_in_flight = max(self.peak_in_flight, in_flight)
+        if self._cut_cooldown > 0:
+            self._cut_cooldown -= 1
+        if failed:
+            self.errors += 1
+            if self._cut_cooldown == 0:
+                self._set(self.limit * settings.ADAPTIVE_DECREASE_FACTOR)
+                self.decreases += 1
+                self._cut_cooldown = self.concurrency
+        else:
+            self.latencies.append(latency)
+
+        if self.samples < settings.ADAPTIVE_WINDOW:
+            return
+        self.last_error_rate = self.errors / self.samples
+        if self.latencies:
+            self.last_p95 = percentile(self.latencies, 0.95)
+            healthy_latency = self.baseline_p95 is None or self.last_p95 <= self.baseline_p95 * settings.ADAPTIVE_LATENCY_TOLERANCE
+            saturated = self.peak_in_flight >= self.concurrency
+            if self.last_error_rate <= settings.ADAPTIVE_ERROR_RATE_THRESHOLD and healthy_latency and saturated:
+                self._set(self.limit + 1)
+                self.increases += 1
+            # The baseline may drift up slowly, e.g. when the source gets slower for everyone
+            self.baseline_p95 = self.last_p95 if self.baseline_p95 is None else min(self.last_p95, self.baseline_p95 * 1.1)
+        self.samples = 0
+        self.errors = 0
+        self.peak_in_flight = 0
+
+    def _set(self, limit: float) -> None:
+        limit = min(max(limit, settings.ADAPTIVE_MIN_CONCURRENCY), self.ceiling)
+        before = self.concurrency
+        self.limit = limit
+        if self.concurrency != before:
+            self.changed = True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "limit": round(self.limit, 2),
+            "ceiling": self.ceiling,
+            "p95_ms": self.last_p95 * 1000 if self.last_p95 is not None else None,
+            "baseline_p95_ms": self.baseline_p95 * 1000 if self.baseline_p95 is not None else None,
+            "error_rate": self.last_error_rate,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class AdaptiveConcurrency:
+    """
+    AdaptiveLimit per host, whose concurrency BaseScraper applies to the HostLimiter of the
+    host; scrapers sharing a host share its limit, like they share its HostLimiter.
+
+    Learned limits are saved in the scraper_limits collection, at most every
+    ADAPTIVE_SAVE_INTERVAL_SECONDS while they change and on shutdown, and loaded at startup
+    so a restart does not start over from the static ScraperConfig limits.
+    """
+
+    def __init__(self):
+        self._limits: Dict[str, AdaptiveLimit] = {}
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._saved_at = 0.0
+        self._save_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ADAPTIVE_CONCURRENCY_ENABLED
+
+    def limit_for(self, host: str, initial: Optional[int] = None, ceiling: Optional[int] = None) -> AdaptiveLimit:
+        """
+        The limit of `host`, starting at `initial` (HOST_MAX_CONCURRENCY by default). `ceiling`
+        is the max_concurrent_requests of the scraper asking, None if it declares none.
+        """
+        limit = self._limits.get(host)
+        if limit is None:
+            limit = self._limits[host] = AdaptiveLimit(host, initial or settings.HOST_MAX_CONCURRENCY)
+            # An initial limit past ADAPTIVE_MAX_CONCURRENCY starts at it
+            limit.declare_ceiling(limit.ceiling)
+        if ceiling is not None:
+            limit.declare_ceiling(ceiling)
+        return limit
+
+    def record(self, host: str, in_flight: int, latency: float, failed: bool) -> None:
+        """Feed one request outcome of `host`, with the requests in flight to it, to its controller."""
+        self.limit_for(host).record(latency, failed, in_flight)
+        if (
+            self._db is not None
+            and time.monotonic() - self._saved_at >= settings.ADAPTIVE_SAVE_INTERVAL_SECONDS
+            and (self._save_task is None or self._save_task.done())
+            and any(limit.changed for limit in self._limits.values())
+        ):
+            self._saved_at = time.monotonic()
+            self._save_task = asyncio.create_task(self.save())
+
+    async def load(self, db: AsyncIOMotorDatabase) -> int:
+        """Restore the saved limits and keep `db` for saving them; returns how many were loaded."""
+        self._db = db
+        loaded = 0
+        # Limits saved per scraper name, before they were kept per host, are left alone
+        async for saved in db[SCRAPER_LIMITS_COLLECTION].find({"host": {"$exists": True}}):
+            limit = self.limit_for(saved["host"], saved["limit"])
+            limit.limit = min(float(saved["limit"]), limit.ceiling)
+            limit.baseline_p95 = saved.get("baseline_p95")
+            loaded += 1
+        return loaded
+
+    async def save(self) -> None:
+        """Save the limits that changed since the last save."""
+        if self._db is None:
+            return
+        for limit in list(self._limits.values()):
+            if not limit.changed:
+                continue
+            limit.changed = False
+            try:
+                await self._db[SCRAPER_LIMITS_COLLECTION].update_one(
+                    {"_id": limit.name},
+                    {"$set": {
+                        "host": limit.name,
+                        "limit": limit.limit,
+                        "baseline_p95": limit.baseline_p95,
+                        "updated_at": datetime.utcnow()
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                limit.changed = True
+                print(f"Could not save the concurrency limit of {limit.name}: {e}")
+
+    async def close(self) -> None:
+        """Save what is left, e.g. on shutdown."""
+        if self._save_task is not None:
+            await self._save_task
+        await self.save()
+        self._db = None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limit.snapshot() for name, limit in sorted(self._limits.items())}
+
+
+adaptive_concurrency = AdaptiveConcurrency()
@@ -1,13 +1,22 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import Callable, List, Optional, Dict, Any, Tuple, TypeVar, Union
 from pydantic import BaseModel, HttpUrl, Field
 import httpx
 import asyncio
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 from ..models.novel import Chapter
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Page
 import re
+import time
 from .storage_service import storage_service
+from .browser_pool import browser_pool, BrowserLease, BrowserPoolTimeout
+from .http_client import http_clients
+from .host_limiter import host_limiters, HostLimiter
+from .adaptive_concurrency import adaptive_concurrency
+from .http_cache import http_cache, body_hash, CachedResponse
+from ..core.config import settings
+
+T = TypeVar("T")
 
 class ScraperConfig(BaseModel):
     """Configuration for a scraper instance."""
@@ -22,6 +31,11 @@ class ScraperConfig(BaseModel):
     timeout: float = 10.0
     max_retries: int = 3
     use_playwright: bool = False  # Whether to use Playwright for JavaScript-heavy sites
+    # Politeness limits per host, for requests and Playwright navigations alike; None uses
+    # HOST_REQUESTS_PER_SECOND, HOST_BURST and HOST_MAX_CONCURRENCY
+    requests_per_second: Optional[float] = Field(None, gt=0)
+    burst: Optional[int] = Field(None, ge=1)
+    max_concurrent_requests: Optional[int] = Field(None, ge=1)
     special_actions: Dict[str, Dict[str, Any]] = Field(
         default_factory=lambda: {
             "view_all": {
@@ -51,63 +65,157 @@ class BaseScraper:
                 patterns={}
             )
         self.config = config
-        self._client: Optional[httpx.AsyncClient] = None
-        self._browser: Optional[Browser] = None
+        self._lease: Optional[BrowserLease] = None
         self._page: Optional[Page] = None
         self._context = None
+        # Nested `async with self` blocks share the leased page
+        self._entered = 0
+        # Body, hash and freshness of the last page fetch_html returned
+        self.last_fetch: Optional[CachedResponse] = None
     
     async def __aenter__(self):
-        """Context manager entry."""
-        self._client = httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=self.config.timeout,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        )
+        """Context manager entry; Playwright scrapers lease a page from the shared browser pool."""
+        self._entered += 1
+        if self._entered > 1:
+            return self
         
         if self.config.use_playwright:
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch()
-            self._context = await self._browser.new_context()
-            self._page = await self._context.new_page()
+            try:
+                self._lease = await browser_pool.acquire(self.config.name)
+            except BrowserPoolTimeout as e:
+                self._entered = 0
+                raise ScraperError(str(e))
+            self._context = self._lease.context
+            self._page = self._lease.page
         
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Context manager exit; the page goes back to the pool, discarded if scraping failed."""
+        self._entered -= 1
+        if self._entered > 0:
+            return
         
-        if self._page:
-            await self._page.close()
+        if self._lease:
+            lease, self._lease = self._lease, None
             self._page = None
-        
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
-        
-        if hasattr(self, '_playwright'):
-            await self._playwright.stop()
+            self._context = None
+            await browser_pool.release(lease, discard=exc_type is not None)
     
+    def _initial_concurrency(self) -> int:
+        return self.config.max_concurrent_requests or settings.HOST_MAX_CONCURRENCY
+
+    def host_limiter(self, url: str) -> HostLimiter:
+        """
+        The rate limiter of the host of `url`, with the limits of this scraper. With adaptive
+        concurrency on, the concurrency limit is the one learned for the host, starting from
+        max_concurrent_requests and never above it when the config declares it.
+        """
+        if adaptive_concurrency.enabled:
+            limit = adaptive_concurrency.limit_for(
+                urlsplit(url).hostname or "", self._initial_concurrency(), self.config.max_concurrent_requests
+            )
+            return host_limiters.get(
+                url, self.config.requests_per_second, self.config.burst, limit.concurrency, adaptive=True
+            )
+        return host_limiters.get(
+            url,
+            self.config.requests_per_second,
+            self.config.burst,
+            self.config.max_concurrent_requests
+        )
+
+    def _record_outcome(self, limiter: HostLimiter, started: float, status: Optional[int]) -> None:
+        """
+        Feed a request's latency and outcome, and the requests in flight to its host, to the
+        adaptive controller; None means it timed out or failed. Called while holding the slot.
+        """
+        if adaptive_concurrency.enabled:
+            failed = status is None or status == 429 or status >= 500
+            adaptive_concurrency.record(limiter.host, limiter.active, time.monotonic() - started, failed)
+    
+    async def goto(self, url: str, **kwargs):
+        """
+        Navigate the leased Playwright page within the host limits. A 429/503 pauses the
+        host for its Retry-After and the navigation is retried, up to max_retries times.
+        """
+        for attempt in range(self.config.max_retries):
+            limiter = self.host_limiter(url)
+            async with limiter.slot():
+                started = time.monotonic()
+                try:
+                    response = await self._page.goto(url, **kwargs)
+                except Exception:
+                    self._record_outcome(limiter, started, None)
+                    raise
+                self._record_outcome(limiter, started, response.status if response is not None else 200)
+            if response is None or attempt == self.config.max_retries - 1:
+                return response
+            if host_limiters.honor_retry_after(url, response.status, response.headers.get("retry-after")) is None:
+                return response
+        
     async def fetch_html(self, url: str) -> str:
-        """Fetch HTML content from a URL with retries."""
+        """
+        Fetch HTML content from a URL with retries, over the shared client of its host and within its limits.
+        Plain HTTP fetches are revalidated against the on-disk HTTP cache; `last_fetch` tells whether the
+        body changed since the previous fetch.
+        """
         if self.config.use_playwright and self._page:
-            await self._page.goto(url)
-            return await self._page.content()
-        
-        if not self._client:
-            raise RuntimeError("Scraper must be used as an async context manager")
-        
+            await self.goto(url)
+            html = await self._page.content()
+            self.last_fetch = CachedResponse(text=html, body_hash=body_hash(html.encode("utf-8")))
+            return html
+
+        entry, validators = await http_cache.lookup(url)
         for attempt in range(self.config.max_retries):
+            paused = None
             try:
-                response = await self._client.get(url, headers=self.config.headers)
-                response.raise_for_status()
-                return response.text
+                response, paused = await self._download(url, validators)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                self.last_fetch = await http_cache.resolve(url, entry, response)
+                if self.last_fetch is None:
+                    # A 304 whose cached body is gone, download the page again right away; the
+                    # old entry still tells whether the body changed
+                    validators = {}
+                    response, paused = await self._download(url, validators)
+                    response.raise_for_status()
+                    self.last_fetch = await http_cache.resolve(url, entry, response)
+                return self.last_fetch.text
             except (httpx.HTTPError, httpx.TimeoutException) as e:
                 if attempt == self.config.max_retries - 1:
                     raise ScraperError(f"Failed to fetch {url} after {self.config.max_retries} attempts: {e}")
-                await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
+                if not (isinstance(e, httpx.HTTPStatusError) and paused is not None):
+                    # A paused host already makes the next attempt wait
+                    await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
+
+    async def _download(self, url: str, validators: Dict[str, str]) -> Tuple[httpx.Response, Optional[float]]:
+        """One GET of `url` within the host limits; returns the response and the pause a 429/503 put on the host."""
+        limiter = self.host_limiter(url)
+        async with limiter.slot():
+            started = time.monotonic()
+            try:
+                response = await http_clients.get(
+                    url, headers={**(self.config.headers or {}), **validators}, timeout=self.config.timeout
+                )
+            except httpx.HTTPError:
+                self._record_outcome(limiter, started, None)
+                raise
+            self._record_outcome(limiter, started, response.status_code)
+        return response, host_limiters.honor_retry_after(url, response.status_code, response.headers.get("retry-after"))
     
+    def parse_once(self, purpose: str, url: str, html: str, parse: Callable[[], T], *key: Any) -> T:
+        """
+        Run `parse` on the `html` of `url`, unless this scraper already parsed the very same body
+        for `purpose` (and `key`); its result is then reused. Pages whose body did not change,
+        e.g. a table of contents without new chapters, are not parsed again.
+        """
+        if self.last_fetch is not None and self.last_fetch.text is html:
+            digest = self.last_fetch.body_hash
+        else:
+            digest = body_hash(html.encode("utf-8"))
+        return http_cache.parse((self.config.name, purpose, url, *key), digest, parse)
+
     def resolve_url(self, url: str) -> str:
         """Resolve a relative URL against the base URL."""
         return urljoin(self.config.base_url, url)
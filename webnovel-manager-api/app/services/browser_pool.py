@@ -0,0 +1,223 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from ..core.config import settings
+
+
+class BrowserPoolTimeout(Exception):
+    """No page was free within BROWSER_POOL_LEASE_TIMEOUT_SECONDS."""
+
+
+@dataclass
+class BrowserLease:
+    """A browser context and its page, lent to one scraper at a time."""
+    key: str
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    leased_at: float = 0.0
+
+
+class BrowserPool:
+    """
+    One Chromium process shared by every Playwright scraper, lending out at most
+    `size` isolated contexts with a page each.
+
+    Launching a browser costs seconds and hundreds of MB, so it is started once with the
+    app and kept. Contexts are reused only by scrapers of the same source (the lease key),
+    so cookies never leak between sites while a source keeps its own session. A page is
+    reset to about:blank when returned and its context closed after `max_uses` leases or
+    after a failure, so a page stuck in a bad state does not stay in the pool.
+    """
+
+    # Upper bounds, in milliseconds, of the lease wait-time histogram buckets
+    WAIT_BUCKETS_MS: List[float] = [1, 10, 100, 1000, 5000, 30000]
+
+    def __init__(self, size: int, max_uses: int, lease_timeout: float):
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._idle: List[BrowserLease] = []
+        # Leases currently out, by id; a gauge rather than a counter, so reset_stats() leaves it alone
+        self._leased: Dict[int, BrowserLease] = {}
+        self.started_at: Optional[float] = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.leases = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+        self.busy_seconds = 0.0
+        self.contexts_created = 0
+        self.contexts_reused = 0
+        self.contexts_closed = 0
+        self.launches = 0
+        self.stats_since = time.monotonic()
+
+    @property
+    def in_use(self) -> int:
+        return len(self._leased)
+
+    @property
+    def running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self) -> None:
+        """Launch the browser, unless it is already running."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.running:
+                return
+            # A browser that crashed or was closed leaves its contexts behind
+            self._idle.clear()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch()
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.size)
+            self.launches += 1
+            self.started_at = time.monotonic()
+            print(f"Browser pool started with {self.size} pages")
+
+    async def stop(self) -> None:
+        """Close every context, the browser and Playwright."""
+        for lease in self._idle:
+            await self._close(lease)
+        self._idle.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self.started_at = None
+
+    async def acquire(self, key: str) -> BrowserLease:
+        """
+        Lease a page for scraper `key`, waiting for a free slot when all `size` are in use.
+        The browser is started on first use when the app lifespan did not start it.
+        Raises BrowserPoolTimeout after `lease_timeout` seconds.
+        """
+        if not self.running:
+            await self.start()
+
+        wait_start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.lease_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise BrowserPoolTimeout(f"No browser page free after {self.lease_timeout} seconds ({self.size} in use)")
+        self._record_wait(time.monotonic() - wait_start)
+
+        try:
+            lease = self._take_idle(key)
+            if lease is None:
+                lease = await self._open(key)
+            else:
+                self.contexts_reused += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        lease.uses += 1
+        lease.leased_at = time.monotonic()
+        self.leases += 1
+        self._leased[id(lease)] = lease
+        return lease
+
+    async def release(self, lease: BrowserLease, discard: bool = False) -> None:
+        """Return a lease; `discard` closes its context instead of keeping it for reuse."""
+        self._leased.pop(id(lease), None)
+        self.busy_seconds += time.monotonic() - max(lease.leased_at, self.stats_since)
+        try:
+            if discard or lease.uses >= self.max_uses or not self.running:
+                await self._close(lease)
+                return
+            try:
+                await lease.page.goto("about:blank")
+            except Exception:
+                await self._close(lease)
+                return
+            self._idle.append(lease)
+            # Idle contexts of other sources give way to the ones in use
+            while len(self._idle) + self.in_use > self.size:
+                await self._close(self._idle.pop(0))
+        finally:
+            self._slots.release()
+
+    def _take_idle(self, key: str) -> Optional[BrowserLease]:
+        for index, lease in enumerate(self._idle):
+            if lease.key == key:
+                return self._idle.pop(index)
+        return None
+
+    async def _open(self, key: str) -> BrowserLease:
+        # Make room by closing the least recently returned idle context of another source
+        if self._idle and len(self._idle) + self.in_use >= self.size:
+            await self._close(self._idle.pop(0))
+        context = await self._browser.new_context()
+        page = await context.new_page()
+        self.contexts_created += 1
+        return BrowserLease(key=key, context=context, page=page)
+
+    async def _close(self, lease: BrowserLease) -> None:
+        self.contexts_closed += 1
+        try:
+            await lease.context.close()
+        except Exception as e:
+            print(f"Error closing browser context of {lease.key}: {e}")
+
+    def _record_wait(self, duration: float) -> None:
+        self.total_wait += duration
+        self.max_wait = max(self.max_wait, duration)
+        milliseconds = duration * 1000
+        for index, bound in enumerate(self.WAIT_BUCKETS_MS):
+            if milliseconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool size, current and average utilization, and lease wait times."""
+        now = time.monotonic()
+        # Leases still out count up to now
+        busy = self.busy_seconds + sum(now - max(lease.leased_at, self.stats_since) for lease in self._leased.values())
+        elapsed = now - self.stats_since
+        buckets = {f"<={bound}ms": count for bound, count in zip(self.WAIT_BUCKETS_MS, self.buckets)}
+        buckets[f">{self.WAIT_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+        return {
+            "running": self.running,
+            "size": self.size,
+            "max_uses": self.max_uses,
+            "in_use": self.in_use,
+            "idle": len(self._idle),
+            "utilization": self.in_use / self.size if self.size else 0.0,
+            "average_utilization": busy / (elapsed * self.size) if elapsed > 0 and self.size else 0.0,
+            "uptime_seconds": round(now - self.started_at, 1) if self.started_at is not None else 0.0,
+            "launches": self.launches,
+            "leases": self.leases,
+            "timeouts": self.timeouts,
+            "contexts_created": self.contexts_created,
+            "contexts_reused": self.contexts_reused,
+            "contexts_closed": self.contexts_closed,
+            "average_wait_ms": self.total_wait / self.leases * 1000 if self.leases else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+            "wait_histogram": buckets,
+        }
+
+
+browser_pool = BrowserPool(
+    settings.BROWSER_POOL_SIZE,
+    settings.BROWSER_PAGE_MAX_USES,
+    settings.BROWSER_POOL_LEASE_TIMEOUT_SECONDS
+)
@@ -0,0 +1,96 @@
+from bisect import bisect_right
+from typing import List, Optional, Dict, Any, Iterable, Sequence
+
+# Open bounds, so "everything up to N" and "everything from N" stay a single range
+LOWEST_CHAPTER = -(2 ** 31)
+HIGHEST_CHAPTER = 2 ** 31 - 1
+
+
+class ChapterRanges:
+    """
+    A set of chapter numbers kept as sorted, disjoint, closed ranges [[start, end], ...].
+
+    Linear reading is a single "read up to N" range; chapters skipped or read out of
+    order become a few extra ranges, so the size depends on how often the reader
+    jumps around, not on how many chapters the novel has.
+    """
+
+    def __init__(self, ranges: Optional[Iterable[Sequence[int]]] = None):
+        self.ranges: List[List[int]] = []
+        for start, end in ranges or []:
+            self.add(start, end)
+
+    @classmethod
+    def up_to(cls, last: int) -> "ChapterRanges":
+        """Every chapter numbered `last` or lower."""
+        return cls([[LOWEST_CHAPTER, last]])
+
+    def to_list(self) -> List[List[int]]:
+        """Plain lists, as stored in MongoDB."""
+        return [list(r) for r in self.ranges]
+
+    def __contains__(self, number: int) -> bool:
+        index = bisect_right(self.ranges, [number, HIGHEST_CHAPTER]) - 1
+        return index >= 0 and self.ranges[index][1] >= number
+
+    def __bool__(self) -> bool:
+        return bool(self.ranges)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ChapterRanges) and self.ranges == other.ranges
+
+    def add(self, start: int, end: int) -> None:
+        """Add [start, end], merging with overlapping or adjacent ranges."""
+        if start > end:
+            return
+        kept = []
+        for s, e in self.ranges:
+            if e < start - 1 or s > end + 1:
+                kept.append([s, e])
+            else:
+                start, end = min(s, start), max(e, end)
+        kept.append([start, end])
+        kept.sort()
+        self.ranges = kept
+
+    def remove(self, start: int, end: int) -> None:
+        """Remove [start, end], splitting the ranges it cuts through."""
+        if start > end:
+            return
+        kept = []
+        for s, e in self.ranges:
+            if e < start or s > end:
+                kept.append([s, e])
+                continue
+            if s < start:
+                kept.append([s, start - 1])
+            if e > end:
+                kept.append([end + 1, e])
+        self.ranges = kept
+
+    def update(self, selection: "ChapterRanges", value: bool) -> None:
+        """Add (value=True) or remove (value=False) every chapter of `selection`."""
+        for start, end in selection.ranges:
+            if value:
+                self.add(start, end)
+            else:
+                self.remove(start, end)
+
+    def mongo_filter(self, field: str = "chapter_number") -> Dict[str, Any]:
+        """Filter matching the chapters in this set; runs as index range scans."""
+        if not self.ranges:
+            return {field: {"$in": []}}
+        clauses = []
+        for start, end in self.ranges:
+            bounds = {}
+            if start > LOWEST_CHAPTER:
+                bounds["$gte"] = start
+            if end < HIGHEST_CHAPTER:
+                bounds["$lte"] = end
+            if not bounds:
+                # Unbounded on both sides: every chapter
+                return {}
+            clauses.append({field: bounds})
+        if len(clauses) == 1:
+            return clauses[0]
+        return {"$or": clauses}
@@ -0,0 +1,217 @@
+from typing import List, Optional, Dict, Any, Iterable
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, UpdateOne, UpdateMany, DeleteMany
+from ..db.database import CHAPTER_COLLECTION, NOVEL_COLLECTION
+from ..db.versioning import update_novel_versioned, VERSION_FIELD
+from ..models.novel import Chapter, PyObjectId
+from .chapter_state_service import chapter_state_service
+
+# Fields returned to API clients; the internal keys stay in Mongo
+CHAPTER_PROJECTION = {"_id": 0, "novel_id": 0}
+
+# Counters denormalized on each novel document so summaries never touch chapters
+EMPTY_COUNTERS = {
+    "total_chapters": 0,
+    "last_chapter_number": 0
+}
+# Projection loading the counters of a novel, with the version guarding them
+NOVEL_COUNTERS_PROJECTION = {**{counter: 1 for counter in EMPTY_COUNTERS}, VERSION_FIELD: 1}
+
+
+def counters_stage() -> Dict[str, Any]:
+    """$group stage computing the chapter-list counters of each novel from chapter documents."""
+    return {"$group": {
+        "_id": "$novel_id",
+        "total_chapters": {"$sum": 1},
+        "last_chapter_number": {"$max": "$chapter_number"}
+    }}
+
+
+# Chapter fields owned by the source; a fetch only rewrites a chapter when one of these changes
+SOURCE_FIELDS = ("title", "chapter_title", "url")
+
+
+def diff_chapters(stored: Dict[int, Dict[str, Any]], scraped: List[Chapter]) -> Dict[str, Any]:
+    """
+    Compare the scraped chapter list with the stored chapters (keyed by chapter number)
+    in a single pass. Returns the added, changed and removed chapters plus the number of
+    unchanged ones and the highest scraped chapter number.
+    """
+    remaining = dict(stored)
+    seen = set()
+    added = []
+    changed = []
+    unchanged = 0
+    for chapter in scraped:
+        # The source may list the same chapter twice; keep the first one
+        if chapter.chapter_number in seen:
+            continue
+        seen.add(chapter.chapter_number)
+
+        source = {
+            "title": chapter.title,
+            "chapter_number": chapter.chapter_number,
+            "chapter_title": chapter.chapter_title,
+            "url": str(chapter.url)
+        }
+        current = remaining.pop(chapter.chapter_number, None)
+        if current is None:
+            added.append(source)
+        elif any(current.get(field) != source[field] for field in SOURCE_FIELDS):
+            changed.append({**current, **source})
+        else:
+            unchanged += 1
+
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": list(remaining.values()),
+        "unchanged": unchanged,
+        "last_chapter_number": max(seen, default=0)
+    }
+
+
+class ChapterService:
+    """Indexed access to the `chapters` collection, one document per (novel_id, chapter_number)."""
+
+    async def count(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId) -> int:
+        """Count the chapters of a novel."""
+        return await db[CHAPTER_COLLECTION].count_documents({"novel_id": novel_id})
+
+    async def list_page(
+        self,
+        db: AsyncIOMotorDatabase,
+        novel_id: PyObjectId,
+        page: int,
+        page_size: int,
+        sort_order: str = "desc"
+    ) -> List[Dict[str, Any]]:
+        """Get one page of chapters sorted by chapter number."""
+        direction = DESCENDING if sort_order == "desc" else ASCENDING
+        cursor = (
+            db[CHAPTER_COLLECTION]
+            .find({"novel_id": novel_id}, CHAPTER_PROJECTION)
+            .sort("chapter_number", direction)
+            .skip((page - 1) * page_size)
+            .limit(page_size)
+        )
+        return await cursor.to_list(length=page_size)
+
+    async def get(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId, chapter_number: int) -> Optional[Dict[str, Any]]:
+        """Get a single chapter by number."""
+        return await db[CHAPTER_COLLECTION].find_one(
+            {"novel_id": novel_id, "chapter_number": chapter_number},
+            CHAPTER_PROJECTION
+        )
+
+    async def get_many(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId, chapter_numbers: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get the given chapters sorted by chapter number."""
+        chapter_numbers = list(chapter_numbers)
+        cursor = (
+            db[CHAPTER_COLLECTION]
+            .find({"novel_id": novel_id, "chapter_number": {"$in": chapter_numbers}}, CHAPTER_PROJECTION)
+            .sort("chapter_number", ASCENDING)
+        )
+        return await cursor.to_list(length=len(chapter_numbers))
+
+    async def merge_from_source(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId, chapters: List[Chapter]) -> Dict[str, Any]:
+        """
+        Merge the scraped chapter list into the stored one, writing only the delta:
+        new chapters are inserted, chapters whose source fields changed are updated and
+        chapters the source no longer lists are deleted. Read/downloaded ranges are never
+        touched; the novel counters move by the delta and every user's progress counters
+        are recounted when chapters were added or removed.
+
+        The counter update is versioned: if the counters changed since they were read
+        (a concurrent fetch), they are recounted instead.
+        """
+        novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id}, NOVEL_COUNTERS_PROJECTION)
+        cursor = db[CHAPTER_COLLECTION].find({"novel_id": novel_id}, CHAPTER_PROJECTION)
+        stored = {c["chapter_number"]: c async for c in cursor}
+        diff = diff_chapters(stored, chapters)
+        added, changed, removed = diff["added"], diff["changed"], diff["removed"]
+
+        operations = []
+        for chapter in added:
+            # Upsert rather than insert so a concurrent fetch cannot trip the unique index
+            operations.append(UpdateOne(
+                {"novel_id": novel_id, "chapter_number": chapter["chapter_number"]},
+                {"$set": {field: chapter[field] for field in SOURCE_FIELDS}},
+                upsert=True
+            ))
+        for chapter in changed:
+            operations.append(UpdateOne(
+                {"novel_id": novel_id, "chapter_number": chapter["chapter_number"]},
+                {"$set": {field: chapter[field] for field in SOURCE_FIELDS}}
+            ))
+        if removed:
+            operations.append(DeleteMany({
+                "novel_id": novel_id,
+                "chapter_number": {"$in": [c["chapter_number"] for c in removed]}
+            }))
+        if operations:
+            await db[CHAPTER_COLLECTION].bulk_write(operations, ordered=False)
+
+        async def compute(current: Dict[str, Any], attempt: int) -> Dict[str, Any]:
+            if attempt == 0:
+                novel_update: Dict[str, Any] = {"$set": {
+                    "last_updated_chapters": datetime.utcnow(),
+                    "last_chapter_number": diff["last_chapter_number"]
+                }}
+                if len(added) != len(removed):
+                    novel_update["$inc"] = {"total_chapters": len(added) - len(removed)}
+                return novel_update
+            # The delta was computed against counters that changed meanwhile: recount
+            counters = await self.count_counters(db, novel_id)
+            return {"$set": {"last_updated_chapters": datetime.utcnow(), **counters}}
+
+        await update_novel_versioned(db, novel_id, compute, NOVEL_COUNTERS_PROJECTION, novel)
+
+        # A new chapter inside a read range (e.g. below the reading position) counts as read
+        if added or removed:
+            await chapter_state_service.refresh_counters(db, novel_id)
+        return diff
+
+    async def count_counters(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId) -> Dict[str, int]:
+        """The chapter counters of one novel, counted from its chapters."""
+        counters = dict(EMPTY_COUNTERS)
+        pipeline = [{"$match": {"novel_id": novel_id}}, counters_stage()]
+        async for row in db[CHAPTER_COLLECTION].aggregate(pipeline):
+            row.pop("_id")
+            counters.update(row)
+        return counters
+
+    async def rebuild_counters(self, db: AsyncIOMotorDatabase) -> int:
+        """
+        Recompute the counters of every novel from the chapters collection, and the
+        counters of every user's progress. Meant for repairs; a novel written while it is
+        rebuilt is best recounted again afterwards.
+
+        Returns the number of novels whose counters were rebuilt from chapters.
+        """
+        novel_ids = []
+        operations = []
+        async for row in db[CHAPTER_COLLECTION].aggregate([counters_stage()], allowDiskUse=True):
+            novel_id = row.pop("_id")
+            novel_ids.append(novel_id)
+            # Bumping the version makes in-flight versioned writers recount after this
+            operations.append(UpdateOne({"_id": novel_id}, {"$set": row, "$inc": {VERSION_FIELD: 1}}))
+            if len(operations) >= 1000:
+                await db[NOVEL_COLLECTION].bulk_write(operations, ordered=False)
+                operations = []
+
+        # Novels without any chapter get zeroed counters
+        operations.append(UpdateMany({"_id": {"$nin": novel_ids}}, {"$set": EMPTY_COUNTERS, "$inc": {VERSION_FIELD: 1}}))
+        await db[NOVEL_COLLECTION].bulk_write(operations, ordered=False)
+
+        await chapter_state_service.rebuild_counters(db)
+        return len(novel_ids)
+
+    async def delete_for_novel(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId) -> int:
+        """Delete every chapter of a novel."""
+        result = await db[CHAPTER_COLLECTION].delete_many({"novel_id": novel_id})
+        return result.deleted_count
+
+
+chapter_service = ChapterService()
@@ -0,0 +1,234 @@
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from ..db.database import CHAPTER_COLLECTION, READING_PROGRESS_COLLECTION
+from ..db.versioning import update_versioned, VERSION_FIELD
+from ..models.novel import PyObjectId
+from .chapter_ranges import ChapterRanges, LOWEST_CHAPTER, HIGHEST_CHAPTER
+
+# Per-user chapter flags, stored as ranges under `<flag>` in the user's progress document of a novel
+CHAPTER_FLAGS = ("read", "downloaded")
+FLAG_COUNTERS = {"read": "read_chapters", "downloaded": "downloaded_chapters"}
+EMPTY_PROGRESS_COUNTERS = {counter: 0 for counter in FLAG_COUNTERS.values()}
+
+# Projection loading a progress document, with the version guarding it
+PROGRESS_PROJECTION = {**{flag: 1 for flag in CHAPTER_FLAGS}, VERSION_FIELD: 1}
+# Projection loading just the counters, for novel summaries
+PROGRESS_COUNTERS_PROJECTION = {"novel_id": 1, **{counter: 1 for counter in FLAG_COUNTERS.values()}}
+
+# A change is a chapter selection plus the flags to set on it, e.g.
+# (chapter_selection(end=10), {"read": True, "downloaded": True})
+ChapterStateChange = Tuple[ChapterRanges, Dict[str, bool]]
+ChapterProgress = Dict[str, ChapterRanges]
+
+
+def chapter_selection(
+    numbers: Optional[Iterable[int]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None
+) -> ChapterRanges:
+    """
+    Select chapters by explicit numbers and/or a [start, end) range.
+    With no arguments every chapter of the novel is selected.
+    """
+    selection = ChapterRanges()
+    if numbers is not None:
+        for number in numbers:
+            selection.add(number, number)
+    if start is not None or end is not None:
+        selection.add(
+            LOWEST_CHAPTER if start is None else start,
+            HIGHEST_CHAPTER if end is None else end - 1
+        )
+    if numbers is None and start is None and end is None:
+        selection.add(LOWEST_CHAPTER, HIGHEST_CHAPTER)
+    return selection
+
+
+def load_progress(state: Optional[Dict[str, Any]]) -> ChapterProgress:
+    """Read the flag ranges of a progress document (None when the user has none yet)."""
+    state = state or {}
+    return {flag: ChapterRanges(state.get(flag)) for flag in CHAPTER_FLAGS}
+
+
+def progress_counters(state: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """read_chapters/downloaded_chapters of a progress document, 0 without one."""
+    state = state or {}
+    return {counter: state.get(counter, 0) for counter in FLAG_COUNTERS.values()}
+
+
+def progress_key(user_id: str, novel_id: PyObjectId) -> Dict[str, Any]:
+    return {"user_id": user_id, "novel_id": novel_id}
+
+
+def annotate_chapters(chapters: List[Dict[str, Any]], progress: ChapterProgress) -> List[Dict[str, Any]]:
+    """Set the derived read/downloaded flags on chapter dicts, in place."""
+    for chapter in chapters:
+        for flag in CHAPTER_FLAGS:
+            chapter[flag] = chapter["chapter_number"] in progress[flag]
+    return chapters
+
+
+class ChapterStateService:
+    """
+    Read/downloaded state of a novel's chapters, per user.
+
+    Each user has a small progress document per novel in its own collection, holding a
+    few chapter ranges per flag and the counters they imply. Marking chapters is a single
+    update of that document whatever the number of chapters it covers, never touches the
+    shared novel document, and does not interfere with other users.
+    """
+
+    async def get_state(self, db: AsyncIOMotorDatabase, user_id: str, novel_id: PyObjectId) -> Optional[Dict[str, Any]]:
+        """The user's progress document of a novel, or None."""
+        return await db[READING_PROGRESS_COLLECTION].find_one(progress_key(user_id, novel_id))
+
+    async def get_states(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        novel_ids: Iterable[PyObjectId],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Dict[PyObjectId, Dict[str, Any]]:
+        """The user's progress documents of many novels with one query, by novel id."""
+        novel_ids = list(set(novel_ids))
+        if not novel_ids:
+            return {}
+        cursor = db[READING_PROGRESS_COLLECTION].find(
+            {"user_id": user_id, "novel_id": {"$in": novel_ids}},
+            projection or PROGRESS_COUNTERS_PROJECTION
+        )
+        return {state["novel_id"]: state async for state in cursor}
+
+    async def get_progress(self, db: AsyncIOMotorDatabase, user_id: str, novel_id: PyObjectId) -> ChapterProgress:
+        """Load the flag ranges of a novel for a user."""
+        return load_progress(await self.get_state(db, user_id, novel_id))
+
+    async def count(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId, ranges: ChapterRanges) -> int:
+        """Count the existing chapters inside `ranges` with index range scans."""
+        if not ranges:
+            return 0
+        return await db[CHAPTER_COLLECTION].count_documents({"novel_id": novel_id, **ranges.mongo_filter()})
+
+    async def count_flags(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId, progress: ChapterProgress) -> Dict[str, int]:
+        """Counter values for the given progress, counting identical ranges once."""
+        counters = {}
+        counted: Dict[Tuple, int] = {}
+        for flag in CHAPTER_FLAGS:
+            key = tuple(map(tuple, progress[flag].ranges))
+            if key not in counted:
+                counted[key] = await self.count(db, novel_id, progress[flag])
+            counters[FLAG_COUNTERS[flag]] = counted[key]
+        return counters
+
+    async def _progress_update(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId, progress: ChapterProgress) -> Dict[str, Any]:
+        """Update storing flag ranges together with the counters they imply."""
+        update: Dict[str, Any] = {flag: progress[flag].to_list() for flag in CHAPTER_FLAGS}
+        update.update(await self.count_flags(db, novel_id, progress))
+        update["updated_at"] = datetime.utcnow()
+        return {"$set": update}
+
+    async def apply(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        novel_id: PyObjectId,
+        changes: List[ChapterStateChange],
+        state: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply the changes in order, so a later change wins where selections overlap,
+        and store the result with one versioned upsert of the user's progress document.
+        If another writer got there first the changes are re-applied on top of its result.
+
+        `state` is the progress document when the caller already has it. Returns the
+        progress document, updated unless nothing changed (None if there is none).
+        """
+        async def compute(current: Dict[str, Any], attempt: int) -> Optional[Dict[str, Any]]:
+            progress = load_progress(current)
+            before = {flag: ChapterRanges(ranges.ranges) for flag, ranges in progress.items()}
+            for selection, flags in changes:
+                for flag, value in flags.items():
+                    progress[flag].update(selection, value)
+            if progress == before:
+                return None
+            return await self._progress_update(db, novel_id, progress)
+
+        return await update_versioned(
+            db, READING_PROGRESS_COLLECTION, progress_key(user_id, novel_id),
+            compute, PROGRESS_PROJECTION, state, upsert=True
+        )
+
+    async def mark(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        novel_id: PyObjectId,
+        selection: ChapterRanges,
+        state: Optional[Dict[str, Any]] = None,
+        **flags: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Set the given flags on the selected chapters."""
+        return await self.apply(db, user_id, novel_id, [(selection, flags)], state)
+
+    async def set_reading_position(self, db: AsyncIOMotorDatabase, user_id: str, novel_id: PyObjectId, current_chapter: int) -> Dict[str, Any]:
+        """
+        Mark chapters before `current_chapter` as read and downloaded, and the rest as neither.
+        Returns the updated progress document.
+        """
+        # The new state does not depend on the old one, but the counters depend on the
+        # chapters, so the update is still versioned against a concurrent fetch
+        progress = {flag: ChapterRanges.up_to(current_chapter - 1) for flag in CHAPTER_FLAGS}
+
+        async def compute(current: Dict[str, Any], attempt: int) -> Dict[str, Any]:
+            return await self._progress_update(db, novel_id, progress)
+
+        return await update_versioned(
+            db, READING_PROGRESS_COLLECTION, progress_key(user_id, novel_id),
+            compute, PROGRESS_PROJECTION, upsert=True
+        )
+
+    async def refresh_counters(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId) -> int:
+        """
+        Recount every user's counters of a novel after its chapters changed.
+
+        Each recount is a versioned update even when the counts stay the same: the version
+        bump makes a mark that counted chapters before the change retry and count again.
+        """
+        async def compute(current: Dict[str, Any], attempt: int) -> Dict[str, Any]:
+            return {"$set": await self.count_flags(db, novel_id, load_progress(current))}
+
+        refreshed = 0
+        cursor = db[READING_PROGRESS_COLLECTION].find({"novel_id": novel_id}, {"user_id": 1, **PROGRESS_PROJECTION})
+        async for state in cursor:
+            await update_versioned(
+                db, READING_PROGRESS_COLLECTION, progress_key(state["user_id"], novel_id),
+                compute, PROGRESS_PROJECTION, state
+            )
+            refreshed += 1
+        return refreshed
+
+    async def rebuild_counters(self, db: AsyncIOMotorDatabase) -> int:
+        """Recount the counters of every progress document; returns how many there are."""
+        rebuilt = 0
+        operations = []
+        async for state in db[READING_PROGRESS_COLLECTION].find({}, {"novel_id": 1, **PROGRESS_PROJECTION}):
+            counters = await self.count_flags(db, state["novel_id"], load_progress(state))
+            operations.append(UpdateOne({"_id": state["_id"]}, {"$set": counters, "$inc": {VERSION_FIELD: 1}}))
+            if len(operations) >= 1000:
+                await db[READING_PROGRESS_COLLECTION].bulk_write(operations, ordered=False)
+                rebuilt += len(operations)
+                operations = []
+        if operations:
+            await db[READING_PROGRESS_COLLECTION].bulk_write(operations, ordered=False)
+            rebuilt += len(operations)
+        return rebuilt
+
+    async def delete_for_novel(self, db: AsyncIOMotorDatabase, novel_id: PyObjectId) -> int:
+        """Delete every user's progress of a novel."""
+        result = await db[READING_PROGRESS_COLLECTION].delete_many({"novel_id": novel_id})
+        return result.deleted_count
+
+
+chapter_state_service = ChapterStateService()
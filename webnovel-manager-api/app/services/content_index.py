@@ -0,0 +1,317 @@
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Iterable
+
+# Segment layout, all little-endian:
+#   header   MAGIC, chapter count, term count, offsets of the term table, strings and postings
+#   chapters i32 chapter numbers indexed by this segment, sorted
+#   terms    fixed-size entries (string offset, string length, postings offset, postings count),
+#            sorted by term so lookups are a binary search over the mapped file
+#   strings  UTF-8 terms
+#   postings (chapter number, byte offset of the first occurrence, occurrences) per chapter
+MAGIC = b"WNCIDX01"
+HEADER = struct.Struct("<8sIIQQQ")
+CHAPTER = struct.Struct("<i")
+TERM = struct.Struct("<QIQI")
+POSTING = struct.Struct("<iII")
+
+SEGMENT_SUFFIX = ".seg"
+# Segments fall in tiers by chapter count (1-3, 4-15, 16-63...); this many adjacent segments
+# of one tier are merged into one of the next, so each chapter is rewritten about once per tier
+MERGE_FACTOR = 4
+# Past this many segments the smallest adjacent ones are merged even across tiers
+MAX_SEGMENTS = 24
+# Times a search lists the segments again when a merge deletes one it was about to open
+SEARCH_ATTEMPTS = 3
+
+TOKEN_RE = re.compile(r"\w+")
+MIN_TOKEN_LENGTH = 2
+
+# A chapter's postings: term -> (byte offset of the first occurrence, occurrences)
+ChapterPostings = Dict[str, Tuple[int, int]]
+
+
+def tokenize(text: str) -> Iterable[Tuple[str, int]]:
+    """Yield (term, UTF-8 byte offset) for every word of `text`."""
+    byte_offset = 0
+    char_offset = 0
+    for match in TOKEN_RE.finditer(text):
+        # Advance the byte offset incrementally instead of re-encoding the prefix
+        byte_offset += len(text[char_offset:match.start()].encode("utf-8"))
+        char_offset = match.start()
+        term = match.group().casefold()
+        if len(term) >= MIN_TOKEN_LENGTH:
+            yield term, byte_offset
+
+
+def chapter_postings(text: str) -> ChapterPostings:
+    """First occurrence and count of every term of a chapter."""
+    postings: ChapterPostings = {}
+    for term, offset in tokenize(text):
+        first, count = postings.get(term, (offset, 0))
+        postings[term] = (first, count + 1)
+    return postings
+
+
+def write_segment(path: Path, chapters: Dict[int, ChapterPostings]) -> None:
+    """Write the postings of the given chapters as one segment, atomically."""
+    by_term: Dict[str, List[Tuple[int, int, int]]] = {}
+    for chapter_number in sorted(chapters):
+        for term, (offset, count) in chapters[chapter_number].items():
+            by_term.setdefault(term, []).append((chapter_number, offset, count))
+
+    terms = sorted(by_term)
+    encoded = [term.encode("utf-8") for term in terms]
+    chapter_numbers = sorted(chapters)
+
+    terms_offset = HEADER.size + CHAPTER.size * len(chapter_numbers)
+    strings_offset = terms_offset + TERM.size * len(terms)
+    postings_offset = strings_offset + sum(len(e) for e in encoded)
+
+    parts = [HEADER.pack(MAGIC, len(chapter_numbers), len(terms), terms_offset, strings_offset, postings_offset)]
+    parts.extend(CHAPTER.pack(n) for n in chapter_numbers)
+    string_at = strings_offset
+    posting_at = postings_offset
+    for term, term_bytes in zip(terms, encoded):
+        parts.append(TERM.pack(string_at, len(term_bytes), posting_at, len(by_term[term])))
+        string_at += len(term_bytes)
+        posting_at += POSTING.size * len(by_term[term])
+    parts.extend(encoded)
+    for term in terms:
+        parts.extend(POSTING.pack(*posting) for posting in by_term[term])
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(tmp_path, path)
+
+
+def segment_chapter_count(path: Path) -> int:
+    """Chapters of a segment, read from its header alone."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    return HEADER.unpack(header)[1]
+
+
+def tier(chapter_count: int) -> int:
+    level = 0
+    while chapter_count >= MERGE_FACTOR:
+        chapter_count //= MERGE_FACTOR
+        level += 1
+    return level
+
+
+# One merge at a time per index directory, shared by every ContentIndex of the process
+_merge_locks: Dict[Path, threading.Lock] = {}
+
+
+class Segment:
+    """A read-only, memory-mapped segment."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.chapter_count, self.term_count, self.terms_offset, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a content index segment")
+
+    def close(self) -> None:
+        self._map.close()
+
+    def chapters(self) -> List[int]:
+        return [CHAPTER.unpack_from(self._map, HEADER.size + i * CHAPTER.size)[0] for i in range(self.chapter_count)]
+
+    def _term_at(self, index: int) -> Tuple[bytes, int, int]:
+        string_at, length, posting_at, count = TERM.unpack_from(self._map, self.terms_offset + index * TERM.size)
+        return self._map[string_at:string_at + length], posting_at, count
+
+    def _postings_at(self, posting_at: int, count: int) -> List[Tuple[int, int, int]]:
+        return [POSTING.unpack_from(self._map, posting_at + i * POSTING.size) for i in range(count)]
+
+    def lookup(self, term: str) -> List[Tuple[int, int, int]]:
+        """(chapter number, first byte offset, occurrences) of every chapter containing `term`."""
+        key = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            current, posting_at, count = self._term_at(middle)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return self._postings_at(posting_at, count)
+        return []
+
+    def all_postings(self) -> Dict[int, ChapterPostings]:
+        """Every posting of the segment, by chapter; used when merging."""
+        chapters: Dict[int, ChapterPostings] = {n: {} for n in self.chapters()}
+        for index in range(self.term_count):
+            term, posting_at, count = self._term_at(index)
+            for chapter_number, offset, occurrences in self._postings_at(posting_at, count):
+                chapters[chapter_number][term.decode("utf-8")] = (offset, occurrences)
+        return chapters
+
+
+class ContentIndex:
+    """
+    Inverted index over the cached chapter texts of one novel and language, kept in a
+    directory of immutable segments. Saving a chapter appends a small segment; the newest
+    segment holding a chapter wins, so re-saved chapters replace their old postings.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._lock = _merge_locks.setdefault(directory.resolve(), threading.Lock())
+
+    def _segment_paths(self) -> List[Path]:
+        # Names start with a nanosecond timestamp, so name order is write order
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _new_segment_path(self) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{time.time_ns():020d}_{os.getpid()}{SEGMENT_SUFFIX}"
+
+    def add_chapters(self, chapters: Dict[int, str]) -> None:
+        """
+        Index (or re-index) chapter texts, keyed by chapter number. Blocking file I/O, run it
+        in a thread from async code.
+        """
+        if not chapters:
+            return
+        write_segment(self._new_segment_path(), {n: chapter_postings(text) for n, text in chapters.items()})
+        with self._lock:
+            self._merge_tiers()
+
+    def add_chapter(self, chapter_number: int, text: str) -> None:
+        self.add_chapters({chapter_number: text})
+
+    def _merge_tiers(self) -> None:
+        """Merge runs of similar-size segments until none is left; the caller holds the lock."""
+        while True:
+            paths = self._segment_paths()
+            try:
+                counts = [segment_chapter_count(path) for path in paths]
+            except FileNotFoundError:
+                # Another process is merging this index
+                return
+            run = self._mergeable_run(counts)
+            if run is None:
+                return
+            if not self._merge_paths(paths[run:run + MERGE_FACTOR]):
+                return
+
+    def _mergeable_run(self, counts: List[int]) -> Optional[int]:
+        """
+        Start of the adjacent segments to merge next: the newest MERGE_FACTOR of one tier, or
+        past MAX_SEGMENTS the MERGE_FACTOR with the fewest chapters. Only adjacent segments are
+        merged so the merged one still sorts between the older and the newer ones.
+        """
+        tiers = [tier(count) for count in counts]
+        for start in range(len(counts) - MERGE_FACTOR, -1, -1):
+            if len(set(tiers[start:start + MERGE_FACTOR])) == 1:
+                return start
+        if len(counts) > MAX_SEGMENTS:
+            return min(range(len(counts) - MERGE_FACTOR + 1), key=lambda start: sum(counts[start:start + MERGE_FACTOR]))
+        return None
+
+    def merge(self) -> None:
+        """Merge every segment into one, dropping postings replaced by newer segments."""
+        with self._lock:
+            self._merge_paths(self._segment_paths())
+
+    def _merge_paths(self, paths: List[Path]) -> bool:
+        """Merge adjacent segments into one; False when one of them vanished meanwhile."""
+        if len(paths) < 2:
+            return False
+        merged: Dict[int, ChapterPostings] = {}
+        for path in reversed(paths):
+            try:
+                segment = Segment(path)
+            except FileNotFoundError:
+                return False
+            try:
+                for chapter_number, postings in segment.all_postings().items():
+                    merged.setdefault(chapter_number, postings)
+            finally:
+                segment.close()
+        # Named after the newest input so segments written meanwhile still sort after it;
+        # written before the inputs are deleted so readers always find every chapter
+        write_segment(paths[-1].with_name(paths[-1].stem + "m" + SEGMENT_SUFFIX), merged)
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return True
+
+    def rebuild(self, chapters: Dict[int, str]) -> None:
+        """Replace the whole index with the given chapter texts."""
+        with self._lock:
+            old_paths = self._segment_paths()
+            write_segment(self._new_segment_path(), {n: chapter_postings(text) for n, text in chapters.items()})
+            for path in old_paths:
+                path.unlink(missing_ok=True)
+
+    def _open_segments(self) -> List[Segment]:
+        """
+        Map every segment, newest first. A segment deleted by a merge between listing and
+        mapping is replaced by the merged one, so the directory is listed again.
+        """
+        for attempt in range(SEARCH_ATTEMPTS):
+            segments = []
+            vanished = False
+            for path in reversed(self._segment_paths()):
+                try:
+                    segments.append(Segment(path))
+                except FileNotFoundError:
+                    vanished = True
+                    if attempt < SEARCH_ATTEMPTS - 1:
+                        break
+            if not vanished or attempt == SEARCH_ATTEMPTS - 1:
+                return segments
+            for segment in segments:
+                segment.close()
+        return []
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        Chapters containing every term of `query`, in chapter order (so the first hit is
+        where the terms first appear together). Returns (chapter number, byte offset of the
+        first term's first occurrence, occurrences of all terms).
+        """
+        terms = list(dict.fromkeys(term for term, _ in tokenize(query)))
+        if not terms:
+            return []
+
+        covered = set()
+        hits: Dict[int, List[Tuple[int, int]]] = {}
+        # Mapped segments stay readable even if a merge deletes their files meanwhile
+        segments = self._open_segments()
+        try:
+            for segment in segments:
+                segment_chapters = set(segment.chapters()) - covered
+                matches: Dict[int, List[Tuple[int, int]]] = {}
+                for term in terms:
+                    for chapter_number, offset, occurrences in segment.lookup(term):
+                        if chapter_number in segment_chapters:
+                            matches.setdefault(chapter_number, []).append((offset, occurrences))
+                for chapter_number, found in matches.items():
+                    if len(found) == len(terms):
+                        hits[chapter_number] = found
+                covered |= segment_chapters
+        finally:
+            for segment in segments:
+                segment.close()
+
+        results = [
+            (chapter_number, found[0][0], sum(occurrences for _, occurrences in found))
+            for chapter_number, found in sorted(hits.items())
+        ]
+        return results[:limit] if limit else results
@@ -88,6 +88,9 @@ class GenericScraper(BaseScraper):
     async def get_novel_info(self, url: str) -> Dict[str, Any]:
         """Get novel information from the source."""
         html = await self.fetch_html(url)
+        return self.parse_once("novel_info", url, html, lambda: self._parse_novel_info(html))
+    
+    def _parse_novel_info(self, html: str) -> Dict[str, Any]:
         soup = BeautifulSoup(html, "html.parser")
         
         info = {}
@@ -122,7 +125,7 @@ class GenericScraper(BaseScraper):
         """Get all chapters from the source."""
         async with self:
             if self.config.use_playwright and self._page:
-                await self._page.goto(url)
+                await self.goto(url)
                 
                 # Handle special actions like "view all" button
                 if self.config.special_actions["view_all"]["enabled"]:
@@ -148,48 +151,51 @@ class GenericScraper(BaseScraper):
             else:
                 content = await self.fetch_html(url)
             
-            soup = BeautifulSoup(content, "html.parser")
-            chapters = []
+            return self.parse_once("chapters", url, content, lambda: self._parse_chapters(content, max_chapters), max_chapters)
+    
+    def _parse_chapters(self, content: str, max_chapters: int) -> List[Chapter]:
+        soup = BeautifulSoup(content, "html.parser")
+        chapters = []
+        
+        # Use custom selectors if provided
+        chapter_container = soup.select_one(self.config.selectors["chapter_container"] or self.config.selectors["chapter_list"])
+        if not chapter_container:
+            return chapters
             
-            # Use custom selectors if provided
-            chapter_container = soup.select_one(self.config.selectors["chapter_container"] or self.config.selectors["chapter_list"])
-            if not chapter_container:
-                return chapters
-                
-            chapter_items = chapter_container.select(self.config.selectors["chapter_item"] or self.config.selectors["chapter_link"])
+        chapter_items = chapter_container.select(self.config.selectors["chapter_item"] or self.config.selectors["chapter_link"])
+        
+        for item in chapter_items:
+            # Use custom selectors for title and URL if provided
+            title_selector = self.config.selectors["chapter_title"] or "a"
+            url_selector = self.config.selectors["chapter_url"] or "a"
             
-            for item in chapter_items:
-                # Use custom selectors for title and URL if provided
-                title_selector = self.config.selectors["chapter_title"] or "a"
-                url_selector = self.config.selectors["chapter_url"] or "a"
-                
-                title_elem = item.select_one(title_selector)
-                url_elem = item.select_one(url_selector)
-                
-                if not title_elem or not url_elem:
-                    continue
-                    
-                chapter_url = self.resolve_url(url_elem.get("href"))
-                chapter_title = title_elem.get_text().strip()
-                
-                # Try to extract chapter number from title
-                chapter_number = self._extract_chapter_number(chapter_title)
-                
-                chapters.append(Chapter(
-                    title=chapter_title,
-                    chapter_number=chapter_number or len(chapters) + 1,
-                    chapter_title=chapter_title,
-                    url=chapter_url,
-                    read=False,
-                    downloaded=False
-                ))
-                
-            # Sort chapters by number and limit to max_chapters
-            chapters.sort(key=lambda x: x.chapter_number)
-            if max_chapters:
-                chapters = chapters[:max_chapters]
+            title_elem = item.select_one(title_selector)
+            url_elem = item.select_one(url_selector)
+            
+            if not title_elem or not url_elem:
+                continue
                 
-            return chapters
+            chapter_url = self.resolve_url(url_elem.get("href"))
+            chapter_title = title_elem.get_text().strip()
+            
+            # Try to extract chapter number from title
+            chapter_number = self._extract_chapter_number(chapter_title)
+            
+            chapters.append(Chapter(
+                title=chapter_title,
+                chapter_number=chapter_number or len(chapters) + 1,
+                chapter_title=chapter_title,
+                url=chapter_url,
+                read=False,
+                downloaded=False
+            ))
+            
+        # Sort chapters by number and limit to max_chapters
+        chapters.sort(key=lambda x: x.chapter_number)
+        if max_chapters:
+            chapters = chapters[:max_chapters]
+            
+        return chapters
     
     async def get_chapter_content(self, url: str) -> str:
         """Get the content of a specific chapter."""
@@ -0,0 +1,224 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+from ..core.config import settings
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def check_limits(rate: Optional[float], burst: Optional[int], max_concurrency: Optional[int]) -> None:
+    """Reject limits that would stall a host forever; None means not given."""
+    if rate is not None and not rate > 0:
+        raise ValueError(f"Requests per second must be positive, got {rate}")
+    if burst is not None and burst < 1:
+        raise ValueError(f"Burst must be at least 1, got {burst}")
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError(f"Max concurrency must be at least 1, got {max_concurrency}")
+
+
+class HostLimiter:
+    """
+    Politeness limits of one host: a token bucket refilled at `rate` requests per second
+    holding up to `burst` tokens, at most `max_concurrency` requests in flight, and a pause
+    until the time a Retry-After asked us to come back.
+
+    The concurrency gate is a counter under a condition rather than a semaphore so the
+    limit can change while requests wait.
+    """
+
+    def __init__(self, host: str, rate: float, burst: int, max_concurrency: int):
+        check_limits(rate, burst, max_concurrency)
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        # Set once an adaptive controller drives max_concurrency; static limits then leave it alone
+        self.adaptive = False
+        # Limits a ScraperConfig declared, as opposed to the defaults the limiter started with
+        self.declared = set()
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.active = 0
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self._condition = asyncio.Condition()
+
+    def declare(self, rate: Optional[float], burst: Optional[int], max_concurrency: Optional[int]) -> None:
+        """
+        Apply the limits a scraper declared, None for those it leaves to the defaults. A declared
+        limit replaces a default one, looser or not; between declarations the stricter wins.
+        Undeclared (default) limits never change the current ones.
+        """
+        check_limits(rate, burst, max_concurrency)
+        for name, value in (("rate", rate), ("burst", burst), ("max_concurrency", max_concurrency)):
+            if value is None or (name == "max_concurrency" and self.adaptive):
+                continue
+            if name in self.declared:
+                value = min(getattr(self, name), value)
+            setattr(self, name, value)
+            self.declared.add(name)
+        self.tokens = min(self.tokens, float(self.burst))
+
+    def adapt(self, max_concurrency: int) -> None:
+        """
+        Let an adaptive controller set the concurrency limit, up or down. Waiters are woken
+        by the next release, which lets in as many as the new limit allows.
+        """
+        self.adaptive = True
+        self.max_concurrency = max(1, max_concurrency)
+
+    def block_for(self, seconds: float) -> None:
+        """Send no request to the host for `seconds`, e.g. after a 429 with Retry-After."""
+        self.throttled += 1
+        seconds = min(seconds, settings.HOST_RETRY_AFTER_MAX_SECONDS)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.burst), self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    async def _take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Wait for a token, then for a concurrency slot, and hold the slot for the request.
+        Tokens come first so requests waiting out the rate do not hold slots meanwhile.
+        """
+        wait_start = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._take_token()
+            async with self._condition:
+                await self._condition.wait_for(lambda: self.active < self.max_concurrency)
+                self.active += 1
+        finally:
+            self.waiting -= 1
+        self.total_wait += time.monotonic() - wait_start
+        self.requests += 1
+        try:
+            yield
+        finally:
+            await self._release()
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify(max(self.max_concurrency - self.active, 1))
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "requests_per_second": self.rate,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "tokens": round(self.tokens, 2),
+            "blocked_for_seconds": round(max(self.blocked_until - now, 0.0), 1),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "average_wait_ms": self.total_wait / self.requests * 1000 if self.requests else 0.0,
+        }
+
+
+class HostLimiters:
+    """
+    HostLimiter per host, shared by every scraper and fetch of the process.
+
+    A host starts with the default limits (HOST_REQUESTS_PER_SECOND, HOST_BURST and
+    HOST_MAX_CONCURRENCY). Limits a ScraperConfig declares replace the defaults; when
+    scrapers declaring different limits share a host the stricter values apply. Callers
+    without a ScraperConfig, e.g. scraper_service.fetch_html, use whatever the host has.
+    """
+
+    def __init__(self):
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(
+        self,
+        url: str,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        adaptive: bool = False
+    ) -> HostLimiter:
+        """
+        The limiter of the host of `url`, with the given limits declared; None leaves a limit as it is.
+        With `adaptive`, `max_concurrency` comes from an adaptive controller and replaces
+        the current concurrency limit.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Conditions are bound to the event loop they were first used on
+            self._hosts = {}
+            self._loop = loop
+
+        host = urlsplit(url).hostname or ""
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostLimiter(
+                host, settings.HOST_REQUESTS_PER_SECOND, settings.HOST_BURST, settings.HOST_MAX_CONCURRENCY
+            )
+        if adaptive:
+            limiter.declare(rate, burst, None)
+            limiter.adapt(max_concurrency or settings.HOST_MAX_CONCURRENCY)
+        else:
+            limiter.declare(rate, burst, max_concurrency)
+        return limiter
+
+    def honor_retry_after(self, url: str, status_code: int, retry_after: Optional[str]) -> Optional[float]:
+        """
+        Pause the host of `url` after a 429 or 503 response, for its Retry-After or else
+        HOST_THROTTLE_BACKOFF_SECONDS. Returns the pause, None for other responses.
+        """
+        if status_code not in (429, 503):
+            return None
+        seconds = parse_retry_after(retry_after)
+        if seconds is None:
+            seconds = settings.HOST_THROTTLE_BACKOFF_SECONDS
+        limiter = self._hosts.get(urlsplit(url).hostname or "")
+        if limiter is not None:
+            limiter.block_for(seconds)
+        print(f"{urlsplit(url).hostname} answered {status_code}, pausing it for {seconds:.1f} seconds")
+        return seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Limits and live queue depths per host."""
+        return {host: limiter.snapshot() for host, limiter in sorted(self._hosts.items())}
+
+
+host_limiters = HostLimiters()
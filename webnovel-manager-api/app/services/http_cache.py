@@ -0,0 +1,298 @@
+import asyncio
+import copy
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+import aiofiles
+import httpx
+from ..core.config import settings
+
+T = TypeVar("T")
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """Body of a fetch, with its hash and whether it is the same as the cached copy."""
+    text: str
+    body_hash: str
+    # Same body as the last time the URL was fetched, be it from a 304 or a full response
+    unchanged: bool = False
+    # Served from disk after the source answered 304 Not Modified
+    revalidated: bool = False
+
+
+class HttpCache:
+    """
+    On-disk cache of fetched pages, revalidated with If-None-Match / If-Modified-Since.
+
+    Each URL has a JSON file with its validators (ETag, Last-Modified), the encoding and
+    the SHA-256 of its body, and when the source sent validators a gzip file with the body,
+    so a 304 Not Modified can be answered from disk. The hash alone is kept for pages
+    without validators: a full download of the same body is still recognized as unchanged,
+    and parse() skips parsing a body already parsed. Bodies are pruned, least recently
+    written first, once they take more than HTTP_CACHE_MAX_BYTES.
+
+    Only plain HTTP fetches go through it; pages rendered by Playwright have no validators
+    the browser exposes to us, only their parse is skipped by hash.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, parsed_entries: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.parsed_entries = parsed_entries
+        self._parsed: "OrderedDict[Hashable, Tuple[str, Any]]" = OrderedDict()
+        # Compressed size of each body on disk, least recently written first; scanned
+        # from disk in a thread on first use, then kept up to date by the cache itself
+        self._bodies: "Optional[OrderedDict[Path, int]]" = None
+        self._disk_bytes = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.conditional = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.bytes_stored = 0
+        self.bytes_compressed = 0
+        self.parse_skips = 0
+        self.parses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.HTTP_CACHE_ENABLED
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = self.directory / key[:2]
+        return folder / f"{key}.json", folder / f"{key}.gz"
+
+    async def lookup(self, url: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """The cached entry of `url`, if any, and the conditional headers to revalidate it with."""
+        if not self.enabled:
+            return None, {}
+        meta_path, body_path = self._paths(url)
+        await self._load_bodies()
+        try:
+            async with aiofiles.open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.loads(await f.read())
+        except FileNotFoundError:
+            return None, {}
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            print(f"Unreadable HTTP cache entry for {url}: {e}")
+            return None, {}
+
+        headers = {}
+        # Without the body on disk a 304 could not be answered
+        if body_path in self._bodies:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        if headers:
+            self.conditional += 1
+        return entry, headers
+
+    async def resolve(self, url: str, entry: Optional[Dict[str, Any]], response: httpx.Response) -> Optional[CachedResponse]:
+        """
+        The body of a successful or 304 response to a request made with lookup()'s headers,
+        storing it when it changed. Returns None when a 304 cannot be answered from disk,
+        e.g. its body was pruned since lookup(), after dropping the entry: the caller then
+        downloads the page again without conditional headers.
+        """
+        self.requests += 1
+        if response.status_code == 304 and entry is not None:
+            try:
+                text = await self._read_body(url, entry)
+            except (OSError, zlib.error, EOFError, LookupError) as e:
+                self.errors += 1
+                print(f"Cached body of {url} is unreadable, downloading it again: {e}")
+                await self.forget(url)
+                return None
+            self.not_modified += 1
+            self.bytes_saved += entry["size"]
+            return CachedResponse(text=text, body_hash=entry["sha256"], unchanged=True, revalidated=True)
+
+        body = response.content
+        digest = body_hash(body)
+        self.bytes_downloaded += len(body)
+        unchanged = entry is not None and entry.get("sha256") == digest
+        if unchanged:
+            self.unchanged += 1
+        else:
+            self.changed += 1
+        if self.enabled and "no-store" not in response.headers.get("cache-control", "").lower():
+            try:
+                await self._store(url, entry, response, body, digest)
+            except OSError as e:
+                self.errors += 1
+                print(f"Could not cache {url}: {e}")
+        return CachedResponse(text=response.text, body_hash=digest, unchanged=unchanged)
+
+    async def _read_body(self, url: str, entry: Dict[str, Any]) -> str:
+        _, body_path = self._paths(url)
+        async with aiofiles.open(body_path, "rb") as f:
+            body = gzip.decompress(await f.read())
+        return body.decode(entry.get("encoding") or "utf-8", errors="replace")
+
+    async def _store(
+        self,
+        url: str,
+        entry: Optional[Dict[str, Any]],
+        response: httpx.Response,
+        body: bytes,
+        digest: str
+    ) -> None:
+        meta_path, body_path = self._paths(url)
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        new_entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": response.encoding,
+            "sha256": digest,
+            "size": len(body),
+        }
+        await self._load_bodies()
+        has_body = body_path in self._bodies
+        if entry == new_entry and (has_body or not (etag or last_modified)):
+            return
+
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        if etag or last_modified:
+            if not (entry is not None and entry.get("sha256") == digest and has_body):
+                compressed = gzip.compress(body, compresslevel=6)
+                await self._write(body_path, compressed)
+                self.bytes_stored += len(body)
+                self.bytes_compressed += len(compressed)
+                await self._grow(body_path, len(compressed))
+        elif has_body:
+            # The source stopped sending validators, the body could never be served again
+            self._unlink(body_path)
+        await self._write(meta_path, json.dumps(new_entry).encode("utf-8"))
+
+    async def _write(self, path: Path, data: bytes) -> None:
+        # Readers never see a half-written file
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        async with aiofiles.open(temporary, "wb") as f:
+            await f.write(data)
+        os.replace(temporary, path)
+
+    def _unlink(self, path: Path) -> None:
+        # Only the bodies count towards HTTP_CACHE_MAX_BYTES
+        self._disk_bytes -= self._bodies.pop(path, 0)
+        path.unlink(missing_ok=True)
+
+    def _scan_bodies(self) -> "OrderedDict[Path, int]":
+        """Sizes of the bodies on disk, oldest first. Blocking, run in a thread."""
+        bodies = []
+        for path in self.directory.glob("*/*.gz") if self.directory.exists() else []:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            bodies.append((stat.st_mtime, path, stat.st_size))
+        return OrderedDict((path, size) for _, path, size in sorted(bodies))
+
+    async def _load_bodies(self) -> None:
+        if self._bodies is not None:
+            return
+        bodies = await asyncio.to_thread(self._scan_bodies)
+        # Another caller may have loaded them, and stored bodies since, while this one scanned
+        if self._bodies is None:
+            self._bodies = bodies
+            self._disk_bytes = sum(bodies.values())
+
+    async def _grow(self, path: Path, size: int) -> None:
+        self._disk_bytes += size - self._bodies.pop(path, 0)
+        self._bodies[path] = size
+        if self._disk_bytes <= self.max_bytes:
+            return
+        # Drop the oldest bodies until a tenth of the budget is free again
+        pruned = []
+        while self._bodies and self._disk_bytes > self.max_bytes * 0.9:
+            oldest, oldest_size = self._bodies.popitem(last=False)
+            self._disk_bytes -= oldest_size
+            pruned.append(oldest)
+        await asyncio.to_thread(self._remove, pruned)
+
+    @staticmethod
+    def _remove(paths) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    async def forget(self, url: str) -> None:
+        """Drop the cached entry of `url`."""
+        await self._load_bodies()
+        for path in self._paths(url):
+            self._unlink(path)
+
+    def parse(self, key: Hashable, digest: str, parse: Callable[[], T]) -> T:
+        """
+        The result of `parse`, or a copy of the one kept for `key` when it was computed from
+        a body with the same hash. Results are copied both ways, so callers may change them.
+        """
+        kept = self._parsed.get(key)
+        if kept is not None and kept[0] == digest:
+            self._parsed.move_to_end(key)
+            self.parse_skips += 1
+            return copy.deepcopy(kept[1])
+        result = parse()
+        self.parses += 1
+        self._parsed[key] = (digest, copy.deepcopy(result))
+        self._parsed.move_to_end(key)
+        while len(self._parsed) > self.parsed_entries:
+            self._parsed.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Delete every cached page and parse result."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._bodies = OrderedDict()
+        self._disk_bytes = 0
+        self._parsed.clear()
+
+    async def stats(self) -> Dict[str, Any]:
+        """Revalidations, unchanged pages, skipped parses and the bytes they saved."""
+        await self._load_bodies()
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory),
+            "disk_bytes": self._disk_bytes,
+            "max_bytes": self.max_bytes,
+            "requests": self.requests,
+            "conditional_requests": self.conditional,
+            "not_modified": self.not_modified,
+            "unchanged_bodies": self.unchanged,
+            "changed_bodies": self.changed,
+            "bytes_downloaded": self.bytes_downloaded,
+            # Uncompressed bodies served from disk instead of downloaded again
+            "bytes_saved": self.bytes_saved,
+            "compression_ratio": self.bytes_compressed / self.bytes_stored if self.bytes_stored else None,
+            "parses": self.parses,
+            "parse_skips": self.parse_skips,
+            "errors": self.errors,
+        }
+
+
+http_cache = HttpCache(
+    Path(settings.HTTP_CACHE_DIR),
+    settings.HTTP_CACHE_MAX_BYTES,
+    settings.HTTP_CACHE_PARSED_ENTRIES
+)
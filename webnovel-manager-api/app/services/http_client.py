@@ -0,0 +1,102 @@
+import asyncio
+import importlib.util
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from ..core.config import settings
+
+
+def http2_available() -> bool:
+    """HTTP/2 is on when configured and the h2 package httpx needs for it is installed."""
+    if not settings.HTTP_CLIENT_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        print("HTTP/2 needs the h2 package, falling back to HTTP/1.1")
+        return False
+    return True
+
+
+class HttpClientRegistry:
+    """
+    One long-lived httpx.AsyncClient per host (scheme, host, port), shared by every scraper,
+    chapter fetch and image download of the process.
+
+    Connections stay open between requests, so DNS, TCP and TLS are paid once per host
+    instead of once per request, and with HTTP/2 concurrent requests to a host share one
+    connection. A client per host, rather than one for everything, makes the connection
+    limits apply per site: a slow site cannot take the connections another one needs.
+    Timeouts and headers are given per request, as scrapers configure their own.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, Optional[int]], httpx.AsyncClient] = {}
+        self._requests: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http2: Optional[bool] = None
+        self.created = 0
+
+    @property
+    def http2(self) -> bool:
+        if self._http2 is None:
+            self._http2 = http2_available()
+        return self._http2
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """The client of the host of `url`, created on first use."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Clients are bound to the event loop they were created on (e.g. one per
+            # asyncio.run in scripts); the old loop's connections cannot be reused or closed
+            self._clients = {}
+            self._loop = loop
+
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                follow_redirects=True,
+                timeout=settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST,
+                    keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+            self._clients[key] = client
+            self.created += 1
+        return client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request with the client of its host; keyword arguments go to httpx."""
+        response = await self.client_for(url).request(method, url, **kwargs)
+        host = urlsplit(url).hostname or ""
+        self._requests[host] = self._requests.get(host, 0) + 1
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def close(self) -> None:
+        """Close every client and its connections, e.g. on shutdown."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"Error closing HTTP client: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Open clients and requests sent per host."""
+        return {
+            "http2": self.http2,
+            "max_connections_per_host": settings.HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST,
+            "max_keepalive_per_host": settings.HTTP_CLIENT_MAX_KEEPALIVE_PER_HOST,
+            "open_clients": sum(1 for client in self._clients.values() if not client.is_closed),
+            "clients_created": self.created,
+            "requests_per_host": dict(sorted(self._requests.items(), key=lambda item: -item[1])),
+        }
+
+
+http_clients = HttpClientRegistry()
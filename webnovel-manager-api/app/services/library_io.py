@@ -0,0 +1,196 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from bson import json_util
+from bson.errors import BSONError
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError
+from ..db.database import NOVEL_COLLECTION, CHAPTER_COLLECTION, READING_PROGRESS_COLLECTION
+
+# Every line is one JSON record: a header first, then {"type": "novel"|"progress"|"chapter", "doc": ...}.
+# Documents use MongoDB extended JSON so ObjectIds and dates survive the round trip.
+EXPORT_FORMAT = "webnovel-library"
+# Version 2 moved reading progress out of the novels into per-user "progress" records.
+# Version 1 exports still import; migration 004_user_progress (--force) then moves their progress.
+EXPORT_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+# Documents read per cursor batch and written per bulk_write
+BATCH_SIZE = 1000
+
+
+class LibraryImportError(ValueError):
+    """An import stopped at a malformed or rejected line; the lines before `committed_lines` are in the database."""
+
+    def __init__(self, message: str, committed_lines: int):
+        super().__init__(f"{message}; {committed_lines} lines are committed")
+        self.committed_lines = committed_lines
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json_util.dumps(record, json_options=JSON_OPTIONS) + "\n"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of byte chunks, e.g. a request body, into text lines."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+
+class LibraryIO:
+    """
+    Streaming NDJSON export and import of novels, their chapters and every user's reading progress.
+
+    Both sides hold at most one batch of documents, so memory use does not depend on the
+    size of the library. Imports upsert, so replaying lines that were already imported is
+    harmless, and they report how many lines are committed so an interrupted import can
+    resume from there.
+    """
+
+    async def export_lines(self, db: AsyncIOMotorDatabase, include_chapters: bool = True) -> AsyncIterator[str]:
+        """Yield the library as NDJSON lines: novels first, then reading progress, then chapters in index order."""
+        yield _line({
+            "type": "header",
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_VERSION,
+            "exported_at": datetime.utcnow(),
+            "include_chapters": include_chapters,
+        })
+        # A leftover embedded chapters array is not part of the format
+        novels = db[NOVEL_COLLECTION].find({}, {"chapters": 0}).sort("_id", ASCENDING).batch_size(BATCH_SIZE)
+        async for novel in novels:
+            yield _line({"type": "novel", "doc": novel})
+
+        # Progress _ids are not exported either: imports match on (user_id, novel_id)
+        states = (
+            db[READING_PROGRESS_COLLECTION]
+            .find({}, {"_id": 0})
+            .sort([("user_id", ASCENDING), ("novel_id", ASCENDING)])
+            .batch_size(BATCH_SIZE)
+        )
+        async for state in states:
+            yield _line({"type": "progress", "doc": state})
+
+        if not include_chapters:
+            return
+        # Chapter _ids are not exported: imports match chapters on (novel_id, chapter_number)
+        chapters = (
+            db[CHAPTER_COLLECTION]
+            .find({}, {"_id": 0})
+            .sort([("novel_id", ASCENDING), ("chapter_number", ASCENDING)])
+            .batch_size(BATCH_SIZE)
+        )
+        async for chapter in chapters:
+            yield _line({"type": "chapter", "doc": chapter})
+
+    async def import_lines(
+        self,
+        db: AsyncIOMotorDatabase,
+        lines: AsyncIterator[str],
+        skip_lines: int = 0,
+        batch_size: int = BATCH_SIZE,
+        on_commit: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Upsert the novels, progress and chapters of an export, `batch_size` documents per bulk_write.
+
+        The first `skip_lines` lines are skipped, to resume an interrupted import. After each
+        batch is written `on_commit` is called with the number of lines committed so far.
+        Raises LibraryImportError for a malformed line, once the lines before it are committed,
+        and for a batch the database rejects, e.g. a novel whose source_url another novel has.
+        The error tells how many lines are committed either way.
+        """
+        stats = {"lines": skip_lines, "novels": 0, "progress": 0, "chapters": 0}
+        pending: Dict[str, List[ReplaceOne]] = {NOVEL_COLLECTION: [], READING_PROGRESS_COLLECTION: [], CHAPTER_COLLECTION: []}
+        # Line number of every pending operation, to report the lines of rejected writes
+        pending_lines: Dict[str, List[int]] = {collection: [] for collection in pending}
+        committed = skip_lines
+
+        async def commit():
+            nonlocal committed
+            for collection, operations in pending.items():
+                if operations:
+                    try:
+                        await db[collection].bulk_write(operations, ordered=False)
+                    except BulkWriteError as e:
+                        errors = e.details.get("writeErrors", [])
+                        lines = sorted(pending_lines[collection][error["index"]] for error in errors)
+                        message = errors[0]["errmsg"] if errors else str(e)
+                        raise LibraryImportError(f"Line {', '.join(map(str, lines)) or '?'} rejected: {message}", committed) from e
+                    operations.clear()
+                    pending_lines[collection].clear()
+            committed = stats["lines"]
+            if on_commit is not None:
+                await on_commit(committed)
+
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if line_number <= skip_lines:
+                continue
+            if line.strip():
+                try:
+                    collection = self._add_record(json_util.loads(line, json_options=JSON_OPTIONS), pending, stats)
+                except (ValueError, BSONError) as e:
+                    # BSONError covers bad extended JSON such as an invalid $oid
+                    await commit()
+                    raise LibraryImportError(f"Line {line_number}: {e}", committed) from e
+                if collection is not None:
+                    pending_lines[collection].append(line_number)
+            stats["lines"] = line_number
+
+            if sum(len(operations) for operations in pending.values()) >= batch_size:
+                await commit()
+
+        await commit()
+        return stats
+
+    def _add_record(self, record: Any, pending: Dict[str, List[ReplaceOne]], stats: Dict[str, int]) -> Optional[str]:
+        """Queue the write of one record; returns the collection it goes to, None for the header."""
+        if not isinstance(record, dict):
+            raise ValueError("expected a JSON object")
+        kind = record.get("type")
+        if kind == "header":
+            if record.get("format") != EXPORT_FORMAT or record.get("version") not in SUPPORTED_VERSIONS:
+                raise ValueError(f"unsupported export {record.get('format')} v{record.get('version')}")
+            return None
+
+        doc = record.get("doc")
+        if not isinstance(doc, dict):
+            raise ValueError("missing document")
+        if kind == "novel":
+            if "_id" not in doc:
+                raise ValueError("novel without _id")
+            pending[NOVEL_COLLECTION].append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+            stats["novels"] += 1
+            return NOVEL_COLLECTION
+        elif kind == "progress":
+            if "user_id" not in doc or "novel_id" not in doc:
+                raise ValueError("progress without user_id or novel_id")
+            doc.pop("_id", None)
+            pending[READING_PROGRESS_COLLECTION].append(ReplaceOne(
+                {"user_id": doc["user_id"], "novel_id": doc["novel_id"]}, doc, upsert=True
+            ))
+            stats["progress"] += 1
+            return READING_PROGRESS_COLLECTION
+        elif kind == "chapter":
+            if "novel_id" not in doc or "chapter_number" not in doc:
+                raise ValueError("chapter without novel_id or chapter_number")
+            doc.pop("_id", None)
+            pending[CHAPTER_COLLECTION].append(ReplaceOne(
+                {"novel_id": doc["novel_id"], "chapter_number": doc["chapter_number"]}, doc, upsert=True
+            ))
+            stats["chapters"] += 1
+            return CHAPTER_COLLECTION
+        else:
+            raise ValueError(f"unknown record type {kind!r}")
+
+
+library_io = LibraryIO()
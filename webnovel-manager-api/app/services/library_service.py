@@ -0,0 +1,136 @@
+from typing import List, Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from ..db.database import CHAPTER_COLLECTION, NOVEL_COLLECTION, READING_PROGRESS_COLLECTION
+from ..models.novel import NovelType
+from .chapter_ranges import LOWEST_CHAPTER, HIGHEST_CHAPTER
+
+# Chapter fields returned as the next chapter to read
+CHAPTER_REF_PROJECTION = {"_id": 0, "title": 1, "chapter_number": 1, "chapter_title": 1, "url": 1}
+
+
+def _next_chapter_lookup() -> Dict[str, Any]:
+    """
+    $lookup of the first unread chapter of each novel.
+
+    Chapters before the first read range are all unread and sort first; after it, a later
+    range may still cover them. Only novel_id bounds the (novel_id, chapter_number) index:
+    the range test on the let variables is a filter, not an index bound.
+    """
+    not_read = {"$eq": [
+        {"$size": {"$filter": {
+            "input": "$$read",
+            "as": "range",
+            "cond": {"$and": [
+                {"$gte": ["$chapter_number", {"$arrayElemAt": ["$$range", 0]}]},
+                {"$lte": ["$chapter_number", {"$arrayElemAt": ["$$range", 1]}]}
+            ]}
+        }}},
+        0
+    ]}
+    return {"$lookup": {
+        "from": CHAPTER_COLLECTION,
+        "let": {
+            "novel_id": "$_id",
+            "start": {"$arrayElemAt": ["$_first", 0]},
+            "end": {"$arrayElemAt": ["$_first", 1]},
+            "read": "$_read"
+        },
+        "pipeline": [
+            {"$match": {"$expr": {"$and": [
+                {"$eq": ["$novel_id", "$$novel_id"]},
+                {"$or": [{"$lt": ["$chapter_number", "$$start"]}, {"$gt": ["$chapter_number", "$$end"]}]}
+            ]}}},
+            {"$sort": {"chapter_number": 1}},
+            {"$match": {"$expr": not_read}},
+            {"$limit": 1},
+            {"$project": CHAPTER_REF_PROJECTION}
+        ],
+        "as": "_next"
+    }}
+
+
+def _progress_lookup(user_id: str) -> Dict[str, Any]:
+    """$lookup of the user's progress document of each novel, on the (user_id, novel_id) index."""
+    return {"$lookup": {
+        "from": READING_PROGRESS_COLLECTION,
+        "let": {"novel_id": "$_id"},
+        "pipeline": [
+            {"$match": {"user_id": user_id, "$expr": {"$eq": ["$novel_id", "$$novel_id"]}}},
+            {"$project": {"_id": 0, "read": 1, "read_chapters": 1}}
+        ],
+        "as": "_state"
+    }}
+
+
+def continue_reading_pipeline(
+    user_id: str,
+    limit: int,
+    type: Optional[NovelType] = None,
+    only_unread: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Pipeline returning each novel with the user's next unread chapter and unread count.
+
+    Unread counts come from the novel and progress counters. The next unread chapter is
+    either before the first read range, or the first chapter after it that no later range
+    covers, found in the same aggregation so chapter documents never reach Python. With
+    `only_unread` the limit applies after the progress lookup, which stops as soon as
+    enough novels with unread chapters were found.
+    """
+    match: Dict[str, Any] = {"total_chapters": {"$gt": 0}}
+    if type:
+        match["type"] = type
+    limit_stage = {"$limit": limit}
+    progress_stages = [
+        _progress_lookup(user_id),
+        # "$_state.<field>" is the array of that field over the (at most one) progress document
+        {"$set": {
+            "_read_chapters": {"$ifNull": [{"$first": "$_state.read_chapters"}, 0]},
+            "_read": {"$ifNull": [{"$first": "$_state.read"}, []]}
+        }}
+    ]
+    if only_unread:
+        progress_stages += [{"$match": {"$expr": {"$gt": ["$total_chapters", "$_read_chapters"]}}}, limit_stage]
+    else:
+        progress_stages.insert(0, limit_stage)
+
+    return [
+        {"$match": match},
+        {"$sort": {"last_updated_chapters": -1, "_id": -1}},
+        *progress_stages,
+        # Without read ranges every chapter is "before" the first one
+        {"$set": {"_first": {"$ifNull": [
+            {"$arrayElemAt": ["$_read", 0]},
+            [HIGHEST_CHAPTER, LOWEST_CHAPTER]
+        ]}}},
+        _next_chapter_lookup(),
+        {"$project": {
+            "title": 1,
+            "cover_image_url": 1,
+            "type": {"$ifNull": ["$type", NovelType.NOVEL.value]},
+            "total_chapters": 1,
+            "read_chapters": "$_read_chapters",
+            "unread_chapters": {"$subtract": ["$total_chapters", "$_read_chapters"]},
+            "last_updated_chapters": 1,
+            "next_chapter": {"$ifNull": [{"$arrayElemAt": ["$_next", 0]}, None]}
+        }}
+    ]
+
+
+class LibraryService:
+    """Library-wide views computed inside MongoDB in a single aggregation."""
+
+    async def continue_reading(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        limit: int = 50,
+        type: Optional[NovelType] = None,
+        only_unread: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Novels most recently updated first, each with the user's next unread chapter."""
+        pipeline = continue_reading_pipeline(user_id, limit, type, only_unread)
+        return await db[NOVEL_COLLECTION].aggregate(pipeline).to_list(length=limit)
+
+
+library_service = LibraryService()
@@ -17,82 +17,88 @@ class ManhwaScraper(BaseScraper):
         """Get manhwa information from the source."""
         async with self:
             html = await self.fetch_html(url)
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract manhwa information using selectors from config
-            title = self._extract_text(soup, self.config.selectors["title"])
-            author = self._extract_text(soup, self.config.selectors["author"])
-            description = self._extract_text(soup, self.config.selectors["description"])
-            cover_image_url = self._extract_attribute(soup, self.config.selectors["cover_image"], "src")
-            
-            # Get status
-            status_elem = soup.select_one(self.config.selectors["status"])
-            status = "Ongoing" if status_elem and "ongoing" in status_elem.text.lower() else "Completed"
-            
-            # Get tags/genres
-            tags = [tag.text.strip() for tag in soup.select(self.config.selectors["tags"])]
-            
-            return {
-                'title': title,
-                'author': author,
-                'description': description,
-                'cover_image_url': cover_image_url,
-                'status': status,
-                'tags': tags,
-                'source_url': url,
-                'source_name': self.config.name,
-                'type': 'manhwa'
-            }
+            return self.parse_once("novel_info", url, html, lambda: self._parse_novel_info(html, url))
+    
+    def _parse_novel_info(self, html: str, url: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract manhwa information using selectors from config
+        title = self._extract_text(soup, self.config.selectors["title"])
+        author = self._extract_text(soup, self.config.selectors["author"])
+        description = self._extract_text(soup, self.config.selectors["description"])
+        cover_image_url = self._extract_attribute(soup, self.config.selectors["cover_image"], "src")
+        
+        # Get status
+        status_elem = soup.select_one(self.config.selectors["status"])
+        status = "Ongoing" if status_elem and "ongoing" in status_elem.text.lower() else "Completed"
+        
+        # Get tags/genres
+        tags = [tag.text.strip() for tag in soup.select(self.config.selectors["tags"])]
+        
+        return {
+            'title': title,
+            'author': author,
+            'description': description,
+            'cover_image_url': cover_image_url,
+            'status': status,
+            'tags': tags,
+            'source_url': url,
+            'source_name': self.config.name,
+            'type': 'manhwa'
+        }
     
     async def get_chapters(self, url: str, max_chapters: int = 50) -> List[Chapter]:
         """Get manhwa chapters from the source."""
         async with self:
             if self.config.use_playwright and self._page:
-                await self._page.goto(url)
+                await self.goto(url)
                 await self._page.wait_for_selector(self.config.selectors["chapter_list"])
                 await self._scroll_page_to_bottom(self._page)
                 html = await self._page.content()
             else:
                 html = await self.fetch_html(url)
             
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            chapters = []
-            # Find all chapter list items
-            chapter_items = soup.select(self.config.selectors["chapter_list"])
-            print(f"Total chapter items found: {len(chapter_items)}")
-            
-            for item in chapter_items:
-                link = item.select_one(self.config.selectors["chapter_link"])
-                if not link:
-                    continue
-                    
-                chapter_url = link['href']
-                chapter_title = link.text.strip()
-                
-                # Extract chapter number from title
-                try:
-                    # Try to extract chapter number from title using pattern
-                    chapter_number = int(re.search(self.config.patterns["chapter_number"], chapter_title).group(1))
-                except (AttributeError, ValueError):
-                    # Fallback if chapter number can't be extracted
-                    chapter_number = len(chapters) + 1
+            return self.parse_once("chapters", url, html, lambda: self._parse_chapters(html, max_chapters), max_chapters)
+    
+    def _parse_chapters(self, html: str, max_chapters: int) -> List[Chapter]:
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        chapters = []
+        # Find all chapter list items
+        chapter_items = soup.select(self.config.selectors["chapter_list"])
+        print(f"Total chapter items found: {len(chapter_items)}")
+        
+        for item in chapter_items:
+            link = item.select_one(self.config.selectors["chapter_link"])
+            if not link:
+                continue
                 
-                chapters.append(Chapter(
-                    title=chapter_title,
-                    chapter_number=chapter_number,
-                    chapter_title=chapter_title,  # Store the full title
-                    url=chapter_url,
-                    read=False,
-                    downloaded=False
-                ))
+            chapter_url = link['href']
+            chapter_title = link.text.strip()
+            
+            # Extract chapter number from title
+            try:
+                # Try to extract chapter number from title using pattern
+                chapter_number = int(re.search(self.config.patterns["chapter_number"], chapter_title).group(1))
+            except (AttributeError, ValueError):
+                # Fallback if chapter number can't be extracted
+                chapter_number = len(chapters) + 1
             
-            # Sort chapters by number and limit to max_chapters
-            chapters.sort(key=lambda x: x.chapter_number)
-            if max_chapters:
-                chapters = chapters[:max_chapters]
-            print(f"Total chapters found: {len(chapters)}")
-            return chapters
+            chapters.append(Chapter(
+                title=chapter_title,
+                chapter_number=chapter_number,
+                chapter_title=chapter_title,  # Store the full title
+                url=chapter_url,
+                read=False,
+                downloaded=False
+            ))
+        
+        # Sort chapters by number and limit to max_chapters
+        chapters.sort(key=lambda x: x.chapter_number)
+        if max_chapters:
+            chapters = chapters[:max_chapters]
+        print(f"Total chapters found: {len(chapters)}")
+        return chapters
     
     async def get_chapter_content(self, url: str) -> str:
         """Get the content of a specific chapter."""
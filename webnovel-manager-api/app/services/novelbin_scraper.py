@@ -36,7 +36,11 @@ class NovelBinScraper(BaseScraper):
                     r"Remove Ads From.*"
                 ]
             },
-            use_playwright=True  # NovelBin requires JavaScript for chapter list
+            use_playwright=True,  # NovelBin requires JavaScript for chapter list
+            # NovelBin answers bursts of parallel chapter downloads with 429s and temporary bans
+            requests_per_second=1.0,
+            burst=3,
+            max_concurrent_requests=2
         )
         super().__init__(config)
     
@@ -44,31 +48,34 @@ class NovelBinScraper(BaseScraper):
         """Get novel information from NovelBin."""
         async with self:
             html = await self.fetch_html(url + '#tab-chapters-title')
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract novel information using selectors from config
-            title = self._extract_text(soup, self.config.selectors["title"])
-            author = self._extract_text(soup, self.config.selectors["author"])
-            description = self._extract_text(soup, self.config.selectors["description"])
-            cover_image_url = self._extract_attribute(soup, self.config.selectors["cover_image"], "src")
-            
-            # Get status
-            status_elem = soup.select_one(self.config.selectors["status"])
-            status = "Ongoing" if status_elem and "ongoing" in status_elem.text.lower() else "Completed"
-            
-            # Get tags/genres
-            tags = [tag.text.strip() for tag in soup.select(self.config.selectors["tags"])]
-            
-            return {
-                'title': title,
-                'author': author,
-                'description': description,
-                'cover_image_url': cover_image_url,
-                'status': status,
-                'tags': tags,
-                'source_url': url,
-                'source_name': 'NovelBin'
-            }
+            return self.parse_once("novel_info", url, html, lambda: self._parse_novel_info(html, url))
+    
+    def _parse_novel_info(self, html: str, url: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract novel information using selectors from config
+        title = self._extract_text(soup, self.config.selectors["title"])
+        author = self._extract_text(soup, self.config.selectors["author"])
+        description = self._extract_text(soup, self.config.selectors["description"])
+        cover_image_url = self._extract_attribute(soup, self.config.selectors["cover_image"], "src")
+        
+        # Get status
+        status_elem = soup.select_one(self.config.selectors["status"])
+        status = "Ongoing" if status_elem and "ongoing" in status_elem.text.lower() else "Completed"
+        
+        # Get tags/genres
+        tags = [tag.text.strip() for tag in soup.select(self.config.selectors["tags"])]
+        
+        return {
+            'title': title,
+            'author': author,
+            'description': description,
+            'cover_image_url': cover_image_url,
+            'status': status,
+            'tags': tags,
+            'source_url': url,
+            'source_name': 'NovelBin'
+        }
     
     async def get_chapters(self, url: str, max_chapters: int = 50) -> List[Chapter]:
         """Get novel chapters from NovelBin."""
@@ -77,7 +84,7 @@ class NovelBinScraper(BaseScraper):
                 raise RuntimeError("Playwright page not initialized")
             
             # Navigate to the page
-            await self._page.goto(url + '#tab-chapters-title')
+            await self.goto(url + '#tab-chapters-title')
             
             # Wait for the chapter list to load
             await self._page.wait_for_selector(self.config.selectors["chapter_list"])
@@ -85,46 +92,49 @@ class NovelBinScraper(BaseScraper):
             # Scroll to load all chapters
             await self._scroll_page_to_bottom(self._page)
             
-            # Get the page content after scrolling
+            # Get the page content after scrolling; an unchanged list is not parsed again
             content = await self._page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            chapters = []
-            # Find all chapter list items
-            chapter_items = soup.select(self.config.selectors["chapter_list"])
-            print(f"Total chapter items found: {len(chapter_items)}")
-            
-            for item in chapter_items:
-                link = item.select_one(self.config.selectors["chapter_link"])
-                if not link:
-                    continue
-                    
-                chapter_url = link['href']
-                chapter_title = link.text.strip()
-                
-                # Extract chapter number from title
-                try:
-                    # Try to extract chapter number from title using pattern
-                    chapter_number = int(re.search(self.config.patterns["chapter_number"], chapter_title).group(1))
-                except (AttributeError, ValueError):
-                    # Fallback if chapter number can't be extracted
-                    chapter_number = len(chapters) + 1
+            return self.parse_once("chapters", url, content, lambda: self._parse_chapters(content))
+    
+    def _parse_chapters(self, content: str) -> List[Chapter]:
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        chapters = []
+        # Find all chapter list items
+        chapter_items = soup.select(self.config.selectors["chapter_list"])
+        print(f"Total chapter items found: {len(chapter_items)}")
+        
+        for item in chapter_items:
+            link = item.select_one(self.config.selectors["chapter_link"])
+            if not link:
+                continue
                 
-                chapters.append(Chapter(
-                    title=chapter_title,
-                    chapter_number=chapter_number,
-                    chapter_title=chapter_title,  # Store the full title
-                    url=chapter_url,
-                    read=False,
-                    downloaded=False
-                ))
+            chapter_url = link['href']
+            chapter_title = link.text.strip()
+            
+            # Extract chapter number from title
+            try:
+                # Try to extract chapter number from title using pattern
+                chapter_number = int(re.search(self.config.patterns["chapter_number"], chapter_title).group(1))
+            except (AttributeError, ValueError):
+                # Fallback if chapter number can't be extracted
+                chapter_number = len(chapters) + 1
             
-            # Sort chapters by number and limit to max_chapters
-            chapters.sort(key=lambda x: x.chapter_number)
-            # if max_chapters:
-            #    chapters = chapters[:max_chapters]
-            print(f"Total chapters found: {len(chapters)}")
-            return chapters
+            chapters.append(Chapter(
+                title=chapter_title,
+                chapter_number=chapter_number,
+                chapter_title=chapter_title,  # Store the full title
+                url=chapter_url,
+                read=False,
+                downloaded=False
+            ))
+        
+        # Sort chapters by number and limit to max_chapters
+        chapters.sort(key=lambda x: x.chapter_number)
+        # if max_chapters:
+        #    chapters = chapters[:max_chapters]
+        print(f"Total chapters found: {len(chapters)}")
+        return chapters
     
     async def get_chapter_content(self, url: str, *args, **kwargs) -> str:
         """Get the content of a specific chapter."""
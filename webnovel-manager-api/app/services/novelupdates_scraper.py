@@ -67,7 +67,7 @@ class NovelUpdatesScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
             
-            await self._page.goto(url)
+            await self.goto(url)
             await self._page.wait_for_load_state("networkidle")
             
             # Esperar a que el título esté visible
@@ -124,7 +124,7 @@ class NovelUpdatesScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
             
-            await self._page.goto(url)
+            await self.goto(url)
             await self._page.wait_for_load_state("networkidle")
             
             # Esperar a que la lista de capítulos esté visible
@@ -193,7 +193,7 @@ class NovelUpdatesScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
             
-            await self._page.goto(url)
+            await self.goto(url)
             await self._page.wait_for_load_state("networkidle")
             
             # Esperar a que el contenido esté visible
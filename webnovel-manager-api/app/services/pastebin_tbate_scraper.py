@@ -24,7 +24,11 @@ class PastebinTBATEScraper(BaseScraper):
                     r"Join our Discord for updates.*"
                 ]
             },
-            use_playwright=False
+            use_playwright=False,
+            # Chapters are followed one link at a time; Pastebin rate limits anonymous readers
+            requests_per_second=1.0,
+            burst=2,
+            max_concurrent_requests=1
         )
         super().__init__(config)
         self.timeout = 15.0  # 15-second timeout for requests
@@ -61,8 +65,10 @@ class PastebinTBATEScraper(BaseScraper):
                 if not content:
                     raise Exception("Failed to fetch content from Pastebin")
 
-                # Parse the content
-                chapters, next_url = self.parse_chapters(content, source_url)
+                # Parse the content, unless the paste did not change since the last fetch
+                chapters, next_url = self.parse_once(
+                    "chapters", raw_url, content, lambda: self.parse_chapters(content, source_url)
+                )
                 all_chapters = list(chapters)
 
                 # Follow next URLs if available and within limits
@@ -75,7 +81,9 @@ class PastebinTBATEScraper(BaseScraper):
                         if not content:
                             break
                             
-                        chapters, next_url = self.parse_chapters(content, next_url)
+                        chapters, next_url = self.parse_once(
+                            "chapters", raw_url, content, lambda: self.parse_chapters(content, next_url)
+                        )
                         all_chapters.extend(chapters)
                         
                         if len(all_chapters) >= max_chapters:
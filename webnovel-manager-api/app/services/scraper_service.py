@@ -15,6 +15,9 @@ import time
 import asyncio
 import re
 from .storage_service import storage_service
+from .http_client import http_clients
+from .host_limiter import host_limiters
+from .http_cache import http_cache
 
 class ScraperError(Exception):
     """Custom exception for scraping errors."""
@@ -41,25 +44,35 @@ async def fetch_html(url: str, timeout: float = 10.0) -> Optional[str]:
              print(f"Could not construct raw URL for {url}, proceeding with original URL")
 
     try:
-        # Create a client with timeout and limits
-        async with httpx.AsyncClient(
-            follow_redirects=True, 
-            timeout=timeout,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        ) as client:
+        async def download(validators: Dict[str, str]) -> httpx.Response:
+            # The shared client of the host keeps its connections open between requests
             # Add a separate timeout using asyncio just to be safe
-            response = await asyncio.wait_for(
-                client.get(url, headers=headers),
-                timeout=timeout
-            )
+            async with host_limiters.get(url).slot():
+                response = await asyncio.wait_for(
+                    http_clients.get(url, headers={**headers, **validators}, timeout=timeout),
+                    timeout=timeout
+                )
+            host_limiters.honor_retry_after(url, response.status_code, response.headers.get("retry-after"))
+            return response
+
+        # Revalidated against the on-disk HTTP cache, a 304 is answered from there
+        entry, validators = await http_cache.lookup(url)
+        response = await download(validators)
+        if response.status_code != 304:
             response.raise_for_status()
-            
-            elapsed = time.time() - start_time
-            content_preview = response.text[:100] + "..." if len(response.text) > 100 else response.text
-            print(f"Received response from {url} in {elapsed:.2f} seconds")
-            print(f"Content preview: {content_preview}")
-            
-            return response.text
+        cached = await http_cache.resolve(url, entry, response)
+        if cached is None:
+            # A 304 whose cached body is gone, download the page again
+            response = await download({})
+            response.raise_for_status()
+            cached = await http_cache.resolve(url, entry, response)
+        
+        elapsed = time.time() - start_time
+        content_preview = cached.text[:100] + "..." if len(cached.text) > 100 else cached.text
+        print(f"Received {'unchanged ' if cached.unchanged else ''}response from {url} in {elapsed:.2f} seconds")
+        print(f"Content preview: {content_preview}")
+        
+        return cached.text
     except asyncio.TimeoutError:
         print(f"Asyncio timeout occurred after {time.time() - start_time:.2f} seconds for {url}")
         raise ScraperError(f"Request timed out for {url} after {timeout} seconds")
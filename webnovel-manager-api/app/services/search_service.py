@@ -0,0 +1,105 @@
+import asyncio
+from typing import List, Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from ..core.cache import search_facet_cache
+from ..db.database import NOVEL_COLLECTION
+from ..models.novel import NovelType
+
+# Facets counted for every search; tags are multi-valued and capped
+FACET_FIELDS = ("status", "source_name", "source_language")
+MAX_TAG_FACETS = 50
+
+
+def search_filter(
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    source_name: Optional[str] = None,
+    source_language: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    type: Optional[NovelType] = None
+) -> Dict[str, Any]:
+    """$match filter for a search; `q` runs on the search_text index, every tag must match."""
+    query: Dict[str, Any] = {}
+    if q:
+        query["$text"] = {"$search": q}
+    if status:
+        query["status"] = status
+    if source_name:
+        query["source_name"] = source_name
+    if source_language:
+        query["source_language"] = source_language
+    if tags:
+        query["tags"] = {"$all": tags}
+    if type:
+        query["type"] = type
+    return query
+
+
+def count_by(field: str) -> List[Dict[str, Any]]:
+    """Count per value, most frequent first and ties by value so facets keep a stable order."""
+    return [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}}
+    ]
+
+
+def facet_stages() -> Dict[str, List[Dict[str, Any]]]:
+    """$facet sub-pipelines counting the matching novels per facet value."""
+    stages = {"total": [{"$count": "count"}]}
+    for field in FACET_FIELDS:
+        stages[field] = count_by(field)
+    stages["tags"] = [{"$unwind": "$tags"}, *count_by("tags"), {"$limit": MAX_TAG_FACETS}]
+    return stages
+
+
+class SearchService:
+    """Text search over the library with facet counts."""
+
+    async def search(
+        self,
+        db: AsyncIOMotorDatabase,
+        query: Dict[str, Any],
+        projection: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Run a search built by search_filter. Returns the requested page of novels (with
+        `projection`), the total and the facet counts.
+
+        The page is a query of its own, so without `q` its sort runs on the added_at index
+        rather than over every match inside $facet. Totals and facets only depend on the
+        filter, so they are cached and later pages of the same search only fetch their results.
+        """
+        if "$text" in query:
+            sort = {"score": {"$meta": "textScore"}, "_id": -1}
+            projection = {**projection, "score": {"$meta": "textScore"}}
+        else:
+            sort = {"added_at": -1, "_id": -1}
+        pipeline = [{"$match": query}, {"$sort": sort}, {"$skip": skip}, {"$limit": limit}, {"$project": projection}]
+        results_query = db[NOVEL_COLLECTION].aggregate(pipeline).to_list(length=limit)
+
+        cache_key = repr(sorted(query.items()))
+        hit, facets = search_facet_cache.get(cache_key)
+        if hit:
+            return {"results": await results_query, **facets}
+
+        results, facets = await asyncio.gather(results_query, self._facets(db, query))
+        search_facet_cache.set(cache_key, facets)
+        return {"results": results, **facets}
+
+    async def _facets(self, db: AsyncIOMotorDatabase, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Total and facet counts of the novels matching `query`."""
+        pipeline = [{"$match": query}, {"$facet": facet_stages()}]
+        rows = await db[NOVEL_COLLECTION].aggregate(pipeline).to_list(length=1)
+        row = rows[0]
+        total = row["total"][0]["count"] if row["total"] else 0
+        return {
+            "total": total,
+            "facets": {
+                field: [{"value": bucket["_id"], "count": bucket["count"]} for bucket in row[field]]
+                for field in (*FACET_FIELDS, "tags")
+            }
+        }
+
+search_service = SearchService()
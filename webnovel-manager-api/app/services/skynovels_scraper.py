@@ -95,7 +95,7 @@ class SkyNovelsScraper(BaseScraper):
             if not self._page:
                 raise RuntimeError("Playwright page not initialized")
             
-            await self._page.goto(url, wait_until="domcontentloaded")
+            await self.goto(url, wait_until="domcontentloaded")
             await self._safe_wait_for_load()
             
             # Esperar a que el contenido principal esté visible
@@ -176,7 +176,7 @@ class SkyNovelsScraper(BaseScraper):
                 raise RuntimeError("Playwright page not initialized")
             
             print(f"Obteniendo capítulos de: {url}")
-            await self._page.goto(url, wait_until="domcontentloaded")
+            await self.goto(url, wait_until="domcontentloaded")
             await self._safe_wait_for_load()
             
             # Esperar a que el contenido principal esté visible
@@ -365,7 +365,7 @@ class SkyNovelsScraper(BaseScraper):
                 raise RuntimeError("Playwright page not initialized")
             
             print(f"Obteniendo contenido del capítulo en: {url}")
-            await self._page.goto(url, wait_until="domcontentloaded")
+            await self.goto(url, wait_until="domcontentloaded")
             await self._safe_wait_for_load()
             
             try:
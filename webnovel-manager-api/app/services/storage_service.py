@@ -1,6 +1,7 @@
+import asyncio
 import os
+import re
 import json
-import aiohttp
 import aiofiles
 from typing import Optional, Union, Dict, Any, List
 from pathlib import Path
@@ -8,6 +9,8 @@ from ..models.novel import NovelType
 from ..db.database import get_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from .content_index import ContentIndex
+from .http_client import http_clients
 
 
 class StorageService:
@@ -57,6 +60,11 @@ class StorageService:
             return base_path.with_suffix(".json")
         return base_path
     
+    async def _get_content_index(self, novel: Union[str, Dict[str, Any]], language: str = "en") -> ContentIndex:
+        """Get the inverted index over the cached raw chapters of a novel in one language."""
+        novel_info = await self._get_novel_info(novel)
+        return ContentIndex(self.novels_dir / f"{novel_info['title']} - {str(novel_info['_id'])}" / "index" / language)
+    
     async def _get_manhwa_images_dir(self, novel: Union[str, Dict[str, Any]], chapter_number: int) -> Path:
         """Get the directory for manhwa chapter images."""
         novel_info = await self._get_novel_info(novel)
@@ -80,6 +88,14 @@ class StorageService:
         elif content_type == "raw":
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
+            # Keep the content index in step with the cached text; segment writes and merges
+            # run in a thread so they do not stall the event loop
+            index = await self._get_content_index(novel, language)
+            try:
+                await asyncio.to_thread(index.add_chapter, chapter_number, content)
+            except Exception as e:
+                # The chapter is saved either way; rebuild_content_index catches the index up
+                print(f"Could not index chapter {chapter_number}, rebuild the content index to search it: {e}")
         elif content_type == "manhwa":
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(content, f, ensure_ascii=False, indent=2)
@@ -109,35 +125,79 @@ class StorageService:
         path = await self._get_chapter_path(novel, chapter_number, content_type, language)
         return path.exists()
     
+    async def search_chapters(self, novel: Union[str, Dict[str, Any]], query: str, language: str = "en", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find the cached chapters containing every word of `query`, in chapter order, with a
+        snippet around the first match read from the stored offset.
+        """
+        novel_info = await self._get_novel_info(novel)
+        index = await self._get_content_index(novel_info, language)
+        # Segment reads and snippet reads run in a thread so they do not stall the event loop
+        hits = await asyncio.to_thread(index.search, query, limit)
+        locations = [(await self._get_chapter_path(novel_info, chapter_number, "raw", language), offset) for chapter_number, offset, _ in hits]
+        snippets = await asyncio.to_thread(self._read_snippets, locations)
+        return [
+            {"chapter_number": chapter_number, "occurrences": occurrences, "snippet": snippet}
+            for (chapter_number, _, occurrences), snippet in zip(hits, snippets)
+        ]
+    
+    def _read_snippets(self, locations: List[tuple]) -> List[Optional[str]]:
+        """Read the snippet of each (path, offset) pair."""
+        return [self._read_snippet(path, offset) for path, offset in locations]
+    
+    def _read_snippet(self, path: Path, offset: int, before: int = 80, after: int = 160) -> Optional[str]:
+        """Read a few bytes around `offset` of a chapter file, without loading the file."""
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            f.seek(max(offset - before, 0))
+            window = f.read(before + after)
+        # The window may cut a multi-byte character at either end
+        text = window.decode("utf-8", errors="ignore")
+        return re.sub(r"\s+", " ", text).strip()
+    
+    async def rebuild_content_index(self, novel: Union[str, Dict[str, Any]], language: str = "en") -> int:
+        """Index every cached raw chapter of a novel from scratch. Returns the number of chapters indexed."""
+        novel_info = await self._get_novel_info(novel)
+        chapters_dir = self.novels_dir / f"{novel_info['title']} - {str(novel_info['_id'])}" / "chapters"
+        chapters = {}
+        for path in chapters_dir.glob(f"chapter_*_raw_{language}.txt"):
+            match = re.match(rf"chapter_(-?\d+)_raw_{language}$", path.stem)
+            if match:
+                with open(path, "r", encoding="utf-8") as f:
+                    chapters[int(match.group(1))] = f.read()
+        index = await self._get_content_index(novel_info, language)
+        await asyncio.to_thread(index.rebuild, chapters)
+        return len(chapters)
+    
     async def save_manhwa_chapter(self, novel: Union[str, Dict[str, Any]], chapter_number: int, content: Dict[str, Any]) -> None:
         """Save a manhwa chapter with its images."""
         # Save images
         images_dir = await self._get_manhwa_images_dir(novel, chapter_number)
         saved_images = []
         
-        async with aiohttp.ClientSession() as session:
-            for img in content["images"]:
-                try:
-                    # Download image
-                    async with session.get(img["url"]) as response:
-                        if response.status == 200:
-                            # Generate safe filename
-                            ext = os.path.splitext(img["url"])[1] or ".jpg"
-                            filename = f"image_{img['index']:03d}{ext}"
-                            filepath = images_dir / filename
-                            
-                            # Save image
-                            async with aiofiles.open(filepath, 'wb') as f:
-                                await f.write(await response.read())
-                            
-                            # Update image info with local path
-                            saved_img = img.copy()
-                            saved_img["local_path"] = str(filepath)
-                            saved_images.append(saved_img)
-                except Exception as e:
-                    print(f"Error downloading image {img['url']}: {str(e)}")
-                    # Keep original image info if download fails
-                    saved_images.append(img)
+        for img in content["images"]:
+            try:
+                # Download image over the shared client of the image host
+                response = await http_clients.get(img["url"])
+                if response.status_code == 200:
+                    # Generate safe filename
+                    ext = os.path.splitext(img["url"])[1] or ".jpg"
+                    filename = f"image_{img['index']:03d}{ext}"
+                    filepath = images_dir / filename
+                    
+                    # Save image
+                    async with aiofiles.open(filepath, 'wb') as f:
+                        await f.write(response.content)
+                    
+                    # Update image info with local path
+                    saved_img = img.copy()
+                    saved_img["local_path"] = str(filepath)
+                    saved_images.append(saved_img)
+            except Exception as e:
+                print(f"Error downloading image {img['url']}: {str(e)}")
+                # Keep original image info if download fails
+                saved_images.append(img)
         
         # Update content with local paths
         content["images"] = saved_images
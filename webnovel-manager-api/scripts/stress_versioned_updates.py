@@ -0,0 +1,88 @@
+# Run from webnovel-manager-api/: python -m scripts.stress_versioned_updates
+# Uses a throwaway <MONGODB_DB_NAME>_stress database, dropped at the end.
+import asyncio
+import sys
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.db.database import NOVEL_COLLECTION
+from app.db.indexes import ensure_indexes
+from app.db.versioning import versioned_update_stats, VERSION_FIELD
+from app.models.novel import Chapter
+from app.services.chapter_service import chapter_service, EMPTY_COUNTERS
+from app.services.chapter_state_service import chapter_state_service, chapter_selection, load_progress, progress_counters
+
+# Chapters always listed by the source; markers mark these read one by one
+CHAPTERS = 300
+MARKERS = 8
+# Markers are spread over these users, so progress documents also race with each other's recounts
+USERS = ["alice", "bob"]
+# Concurrent fetches, each listing the base chapters plus a different number of extra ones
+FETCHERS = 4
+FETCHES_PER_FETCHER = 10
+
+def source_chapters(extra: int):
+    return [
+        Chapter(title=f"Chapter {n}", chapter_number=n, url=f"https://example.com/chapter-{n}")
+        for n in range(1, CHAPTERS + extra + 1)
+    ]
+
+async def marker(db, novel_id, offset: int):
+    """Mark every MARKERS-th chapter read for one user, one versioned update per chapter."""
+    marked = set()
+    user_id = USERS[offset % len(USERS)]
+    for number in range(offset + 1, CHAPTERS + 1, MARKERS):
+        await chapter_state_service.mark(db, user_id, novel_id, chapter_selection([number]), read=True)
+        marked.add(number)
+    return marked
+
+async def fetcher(db, novel_id, index: int):
+    for fetch in range(FETCHES_PER_FETCHER):
+        await chapter_service.merge_from_source(db, novel_id, source_chapters(index * FETCHES_PER_FETCHER + fetch))
+
+async def run_stress(db) -> bool:
+    """Race markers against fetchers on one novel; True when no update was lost and the counters are exact."""
+    result = await db[NOVEL_COLLECTION].insert_one({"title": "Stress", **EMPTY_COUNTERS, VERSION_FIELD: 0})
+    novel_id = result.inserted_id
+    await chapter_service.merge_from_source(db, novel_id, source_chapters(0))
+
+    start_time = time.time()
+    results = await asyncio.gather(
+        *(marker(db, novel_id, offset) for offset in range(MARKERS)),
+        *(fetcher(db, novel_id, index) for index in range(FETCHERS))
+    )
+    elapsed = time.time() - start_time
+
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    expected = await chapter_service.count_counters(db, novel_id)
+    stored = {counter: novel.get(counter) for counter in expected}
+    ok = stored == expected
+    print(f"{sum(map(len, results[:MARKERS]))} marks and {FETCHERS * FETCHES_PER_FETCHER} fetches in {elapsed:.2f} seconds")
+    print(f"Versioned updates: {versioned_update_stats}")
+    print(f"Novel counters stored {stored}, recounted {expected}")
+
+    for index, user_id in enumerate(USERS):
+        marked = set().union(*results[index:MARKERS:len(USERS)])
+        state = await chapter_state_service.get_state(db, user_id, novel_id)
+        progress = load_progress(state)
+        lost = sorted(number for number in marked if number not in progress["read"])
+        unexpected = sorted(number for number in range(1, CHAPTERS + 1) if number in progress["read"] and number not in marked)
+        recounted = await chapter_state_service.count_flags(db, novel_id, progress)
+        print(f"{user_id}: lost marks {len(lost)} {lost[:20]}, marks of others {len(unexpected)}, counters stored {progress_counters(state)}, recounted {recounted}")
+        ok = ok and not lost and not unexpected and progress_counters(state) == recounted
+    return ok
+
+async def main():
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db_name = f"{settings.MONGODB_DB_NAME}_stress"
+    db = client[db_name]
+    try:
+        await ensure_indexes(db)
+        ok = await run_stress(db)
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+import os
+from types import SimpleNamespace
+import deepl
+import pytest
+import mongomock.collection
+from mongomock_motor import AsyncMongoMockClient
+
+# The routers build the DeepL translation service when imported, which calls the API
+os.environ.setdefault("DEEPL_API_KEY", "test")
+
+
+class OfflineTranslator:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_usage(self):
+        return SimpleNamespace(character=SimpleNamespace(count=0, limit=0))
+
+    def create_glossary(self, *args, **kwargs):
+        return SimpleNamespace(glossary_id="test")
+
+
+deepl.Translator = OfflineTranslator
+
+from app.db.indexes import INDEXES  # noqa: E402
+
+
+# mongomock's bulk builder predates the `sort` / `namespace` arguments pymongo 4.9+ passes
+for _name in ("add_update", "add_replace", "add_delete"):
+    _original = getattr(mongomock.collection.BulkOperationBuilder, _name)
+
+    def _compatible(self, *args, _original=_original, **kwargs):
+        kwargs.pop("sort", None)
+        kwargs.pop("namespace", None)
+        return _original(self, *args, **kwargs)
+
+    setattr(mongomock.collection.BulkOperationBuilder, _name, _compatible)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """An in-memory database with the unique indexes the application declares."""
+    database = AsyncMongoMockClient()["webnovel_test"]
+    for collection_name, models in INDEXES.items():
+        for model in models:
+            document = model.document
+            if document.get("unique"):
+                await database[collection_name].create_index(
+                    list(document["key"].items()), unique=True, name=document["name"]
+                )
+    return database
@@ -0,0 +1,104 @@
+import pytest
+from app.core.config import settings
+from app.db.database import SCRAPER_LIMITS_COLLECTION
+from app.services import base_scraper
+from app.services.adaptive_concurrency import AdaptiveConcurrency, AdaptiveLimit
+from app.services.base_scraper import BaseScraper, ScraperConfig
+from app.services.host_limiter import HostLimiters
+
+HOST = "novels.example.com"
+
+
+def healthy_window(limit: AdaptiveLimit, in_flight: int) -> None:
+    for _ in range(settings.ADAPTIVE_WINDOW):
+        limit.record(0.1, False, in_flight)
+
+
+def test_grows_only_when_the_limit_is_used():
+    limit = AdaptiveLimit(HOST, 4)
+    # One request at a time, e.g. a politely sequential scraper
+    for _ in range(5):
+        healthy_window(limit, 1)
+    assert limit.concurrency == 4
+    assert limit.increases == 0
+
+    healthy_window(limit, 4)
+    assert limit.concurrency == 5
+    healthy_window(limit, 4)
+    assert limit.concurrency == 5
+    healthy_window(limit, 5)
+    assert limit.concurrency == 6
+
+
+def test_never_grows_past_the_declared_ceiling():
+    limit = AdaptiveLimit(HOST, 1)
+    limit.declare_ceiling(1)
+    for _ in range(5):
+        healthy_window(limit, 1)
+    assert limit.concurrency == 1
+
+    limit = AdaptiveLimit(HOST, 2)
+    limit.declare_ceiling(3)
+    for _ in range(5):
+        healthy_window(limit, 3)
+    assert limit.concurrency == 3
+
+
+def test_errors_cut_the_limit():
+    limit = AdaptiveLimit(HOST, 8)
+    limit.record(1.0, True, 8)
+    assert limit.concurrency == 4
+    # Requests in flight at the old limit fail too without cutting again
+    for _ in range(3):
+        limit.record(1.0, True, 8)
+    assert limit.concurrency == 4
+    assert limit.decreases == 1
+
+
+def test_scrapers_on_one_host_share_its_limit():
+    controller = AdaptiveConcurrency()
+    first = controller.limit_for(HOST, 8)
+    second = controller.limit_for(HOST, 2, ceiling=2)
+    assert first is second
+    assert first.concurrency == 2
+    # A scraper declaring no ceiling does not lift it
+    assert controller.limit_for(HOST, 8).ceiling == 2
+    assert controller.limit_for("other.example.com", 8).concurrency == 8
+
+
+@pytest.mark.anyio
+async def test_base_scrapers_drive_one_limit_per_host(monkeypatch):
+    controller = AdaptiveConcurrency()
+    limiters = HostLimiters()
+    monkeypatch.setattr(base_scraper, "adaptive_concurrency", controller)
+    monkeypatch.setattr(base_scraper, "host_limiters", limiters)
+
+    def scraper(name, max_concurrent_requests=None):
+        return BaseScraper(ScraperConfig(
+            name=name, base_url=f"https://{HOST}", content_type="novel", selectors={}, patterns={},
+            max_concurrent_requests=max_concurrent_requests
+        ))
+
+    fast, careful = scraper("fast"), scraper("careful", max_concurrent_requests=2)
+    url = f"https://{HOST}/book/1"
+    assert fast.host_limiter(url).max_concurrency == settings.HOST_MAX_CONCURRENCY
+    # The stricter scraper caps the host for both, and neither overwrites the other afterwards
+    assert careful.host_limiter(url).max_concurrency == 2
+    assert fast.host_limiter(url).max_concurrency == 2
+    assert list(controller.snapshot()) == [HOST]
+
+
+@pytest.mark.anyio
+async def test_limits_are_saved_per_host(db):
+    await db[SCRAPER_LIMITS_COLLECTION].insert_one({"_id": "novelbin", "limit": 9.0})
+    controller = AdaptiveConcurrency()
+    await controller.load(db)
+    limit = controller.limit_for(HOST, 4)
+    healthy_window(limit, 4)
+    await controller.save()
+
+    restored = AdaptiveConcurrency()
+    assert await restored.load(db) == 1
+    assert restored.limit_for(HOST).concurrency == 5
+    # Limits saved per scraper name are not taken for hosts
+    assert list(restored.snapshot()) == [HOST]
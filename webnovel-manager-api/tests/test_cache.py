@@ -0,0 +1,58 @@
+from app.core import cache
+from app.core.cache import TTLCache, invalidate_novel, invalidate_reading
+
+
+def test_get_set_and_lru_eviction():
+    ttl_cache = TTLCache("test", maxsize=2, ttl=60)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    assert ttl_cache.get("a") == (True, 1)
+    ttl_cache.set("c", 3)
+    # "b" was the least recently used
+    assert ttl_cache.get("b") == (False, None)
+    assert ttl_cache.get("c") == (True, 3)
+    assert ttl_cache.stats()["evictions"] == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    ttl_cache = TTLCache("test", maxsize=10, ttl=5)
+    ttl_cache.set("a", 1)
+    now[0] += 4.9
+    assert ttl_cache.get("a") == (True, 1)
+    now[0] += 0.2
+    assert ttl_cache.get("a") == (False, None)
+    assert ttl_cache.stats()["size"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    ttl_cache = TTLCache("test", maxsize=10, ttl=0)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") == (False, None)
+
+
+def test_invalidate_novel():
+    cache.novel_detail_cache.set("1", "one")
+    cache.novel_detail_cache.set("2", "two")
+    cache.novel_list_cache.set(("page",), "page")
+    cache.search_facet_cache.set(("facets",), "facets")
+    cache.reading_cache.set(("alice",), "reading")
+
+    invalidate_novel("1")
+    assert cache.novel_detail_cache.get("1") == (False, None)
+    assert cache.novel_detail_cache.get("2") == (True, "two")
+    for other in (cache.novel_list_cache, cache.search_facet_cache, cache.reading_cache):
+        assert other.stats()["size"] == 0
+
+    invalidate_novel()
+    assert cache.novel_detail_cache.get("2") == (False, None)
+
+
+def test_invalidate_reading_keeps_novels():
+    cache.novel_detail_cache.set("1", "one")
+    cache.reading_cache.set(("alice",), "reading")
+    invalidate_reading()
+    assert cache.reading_cache.get(("alice",)) == (False, None)
+    assert cache.novel_detail_cache.get("1") == (True, "one")
+    invalidate_novel()
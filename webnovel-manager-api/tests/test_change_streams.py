@@ -0,0 +1,37 @@
+from bson import ObjectId
+from app.core import cache
+from app.db.change_streams import ChangeStreamWatcher
+
+
+def fill_caches(novel_id):
+    cache.novel_detail_cache.set(str(novel_id), "detail")
+    cache.novel_detail_cache.set("other", "detail")
+    cache.reading_cache.set(("alice",), "reading")
+
+
+def test_novel_change_invalidates_that_novel():
+    novel_id = ObjectId()
+    fill_caches(novel_id)
+    ChangeStreamWatcher()._handle({"operationType": "update", "ns": {"coll": "novels"}, "documentKey": {"_id": novel_id}})
+    assert cache.novel_detail_cache.get(str(novel_id)) == (False, None)
+    assert cache.novel_detail_cache.get("other") == (True, "detail")
+    assert cache.reading_cache.get(("alice",)) == (False, None)
+
+
+def test_progress_change_invalidates_reading_only():
+    novel_id = ObjectId()
+    fill_caches(novel_id)
+    ChangeStreamWatcher()._handle({
+        "operationType": "update", "ns": {"coll": "reading_progress"}, "documentKey": {"_id": ObjectId()}
+    })
+    assert cache.reading_cache.get(("alice",)) == (False, None)
+    assert cache.novel_detail_cache.get(str(novel_id)) == (True, "detail")
+
+
+def test_drop_invalidates_everything():
+    novel_id = ObjectId()
+    fill_caches(novel_id)
+    watcher = ChangeStreamWatcher()
+    watcher._handle({"operationType": "dropDatabase", "ns": {"db": "webnovel_manager"}})
+    assert cache.novel_detail_cache.get("other") == (False, None)
+    assert watcher.events == 1
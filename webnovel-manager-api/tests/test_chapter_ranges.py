@@ -0,0 +1,46 @@
+from app.services.chapter_ranges import ChapterRanges, LOWEST_CHAPTER, HIGHEST_CHAPTER
+
+
+def test_add_merges_overlapping_and_adjacent_ranges():
+    ranges = ChapterRanges([[1, 3], [7, 9]])
+    ranges.add(4, 5)
+    assert ranges.to_list() == [[1, 5], [7, 9]]
+    ranges.add(6, 6)
+    assert ranges.to_list() == [[1, 9]]
+    ranges.add(20, 10)
+    assert ranges.to_list() == [[1, 9]]
+
+
+def test_remove_splits_ranges():
+    ranges = ChapterRanges([[1, 10]])
+    ranges.remove(4, 6)
+    assert ranges.to_list() == [[1, 3], [7, 10]]
+    ranges.remove(0, 1)
+    ranges.remove(10, 50)
+    assert ranges.to_list() == [[2, 3], [7, 9]]
+
+
+def test_contains():
+    ranges = ChapterRanges([[2, 3], [7, 9]])
+    assert [n for n in range(11) if n in ranges] == [2, 3, 7, 8, 9]
+    assert 0 not in ChapterRanges()
+    assert -5 in ChapterRanges.up_to(10)
+
+
+def test_update_and_equality():
+    ranges = ChapterRanges.up_to(10)
+    ranges.update(ChapterRanges([[3, 4]]), False)
+    assert ranges == ChapterRanges([[LOWEST_CHAPTER, 2], [5, 10]])
+    ranges.update(ChapterRanges([[3, 4]]), True)
+    assert ranges == ChapterRanges.up_to(10)
+    assert not ChapterRanges()
+
+
+def test_mongo_filter():
+    assert ChapterRanges().mongo_filter() == {"chapter_number": {"$in": []}}
+    assert ChapterRanges([[LOWEST_CHAPTER, HIGHEST_CHAPTER]]).mongo_filter() == {}
+    assert ChapterRanges.up_to(5).mongo_filter() == {"chapter_number": {"$lte": 5}}
+    assert ChapterRanges([[1, 2], [5, HIGHEST_CHAPTER]]).mongo_filter() == {"$or": [
+        {"chapter_number": {"$gte": 1, "$lte": 2}},
+        {"chapter_number": {"$gte": 5}},
+    ]}
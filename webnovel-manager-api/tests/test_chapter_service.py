@@ -0,0 +1,66 @@
+import pytest
+from bson import ObjectId
+from app.db.database import CHAPTER_COLLECTION, NOVEL_COLLECTION
+from app.models.novel import Chapter
+from app.services.chapter_service import chapter_service, diff_chapters
+from app.services.chapter_state_service import chapter_state_service, chapter_selection
+
+pytestmark = pytest.mark.anyio
+
+
+def chapter(number, title=None):
+    title = title or f"Chapter {number}"
+    return Chapter(title=title, chapter_number=number, chapter_title=title, url=f"https://example.com/c/{number}")
+
+
+def stored(number, title=None):
+    title = title or f"Chapter {number}"
+    return {"title": title, "chapter_number": number, "chapter_title": title, "url": f"https://example.com/c/{number}"}
+
+
+def test_diff_chapters():
+    current = {n: stored(n) for n in (1, 2, 3)}
+    diff = diff_chapters(current, [chapter(1), chapter(2, "Renamed"), chapter(4), chapter(4, "Listed twice")])
+
+    assert [c["chapter_number"] for c in diff["added"]] == [4]
+    assert diff["added"][0]["title"] == "Chapter 4"
+    assert [(c["chapter_number"], c["title"]) for c in diff["changed"]] == [(2, "Renamed")]
+    assert [c["chapter_number"] for c in diff["removed"]] == [3]
+    assert diff["unchanged"] == 1
+    assert diff["last_chapter_number"] == 4
+
+
+def test_diff_chapters_empty_source():
+    diff = diff_chapters({1: stored(1)}, [])
+    assert diff["removed"] == [stored(1)]
+    assert diff["last_chapter_number"] == 0
+
+
+async def test_merge_from_source_writes_the_delta(db):
+    novel_id = ObjectId()
+    await db[NOVEL_COLLECTION].insert_one({"_id": novel_id, "title": "Novel"})
+
+    await chapter_service.merge_from_source(db, novel_id, [chapter(n) for n in (1, 2, 3)])
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    assert novel["total_chapters"] == 3
+    assert novel["last_chapter_number"] == 3
+
+    await chapter_service.merge_from_source(db, novel_id, [chapter(1), chapter(2, "Renamed"), chapter(4), chapter(5)])
+    chapters = await db[CHAPTER_COLLECTION].find({"novel_id": novel_id}).sort("chapter_number", 1).to_list(None)
+    assert [c["chapter_number"] for c in chapters] == [1, 2, 4, 5]
+    assert chapters[1]["title"] == "Renamed"
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    assert novel["total_chapters"] == 4
+    assert novel["last_chapter_number"] == 5
+
+
+async def test_merge_from_source_recounts_progress(db):
+    novel_id = ObjectId()
+    await db[NOVEL_COLLECTION].insert_one({"_id": novel_id, "title": "Novel"})
+    await chapter_service.merge_from_source(db, novel_id, [chapter(n) for n in (1, 2, 3)])
+    await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(end=10), read=True)
+
+    # A chapter inserted below the reading position counts as read, a removed one no longer does
+    await chapter_service.merge_from_source(db, novel_id, [chapter(n) for n in (1, 2, 4, 5)])
+    state = await chapter_state_service.get_state(db, "alice", novel_id)
+    assert state["read_chapters"] == 4
@@ -0,0 +1,51 @@
+import pytest
+from bson import ObjectId
+from app.db.database import CHAPTER_COLLECTION
+from app.services.chapter_state_service import chapter_state_service, chapter_selection
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_chapters(db, novel_id, numbers):
+    await db[CHAPTER_COLLECTION].insert_many([{"novel_id": novel_id, "chapter_number": n} for n in numbers])
+
+
+def test_chapter_selection():
+    assert chapter_selection(numbers=[3, 1, 2]).to_list() == [[1, 3]]
+    assert chapter_selection(start=5, end=8).to_list() == [[5, 7]]
+    assert 10 ** 6 in chapter_selection()
+
+
+async def test_mark_stores_ranges_and_counters(db):
+    novel_id = ObjectId()
+    await add_chapters(db, novel_id, range(1, 11))
+
+    state = await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(end=6), read=True, downloaded=True)
+    assert state["read"] == [[-(2 ** 31), 5]]
+    assert state["read_chapters"] == 5
+    assert state["downloaded_chapters"] == 5
+
+    state = await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(numbers=[3]), read=False)
+    assert state["read_chapters"] == 4
+    assert state["downloaded_chapters"] == 5
+
+
+async def test_apply_later_changes_win(db):
+    novel_id = ObjectId()
+    await add_chapters(db, novel_id, range(1, 11))
+
+    state = await chapter_state_service.apply(db, "alice", novel_id, [
+        (chapter_selection(), {"read": True}),
+        (chapter_selection(start=8), {"read": False}),
+    ])
+    progress = await chapter_state_service.get_progress(db, "alice", novel_id)
+    assert 7 in progress["read"] and 8 not in progress["read"]
+    assert state["read_chapters"] == 7
+
+
+async def test_mark_without_change_does_not_write(db):
+    novel_id = ObjectId()
+    await add_chapters(db, novel_id, range(1, 4))
+    first = await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(), read=True)
+    again = await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(), read=True)
+    assert again["version"] == first["version"]
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from bson import ObjectId
+from app.services import content_index
+from app.services.content_index import ContentIndex, MAX_SEGMENTS
+from app.services.storage_service import StorageService
+
+
+def chapter_text(number: int) -> str:
+    return f"chapter{number} the dragon slept while the knight rode on"
+
+
+def test_search_and_resaved_chapters(tmp_path):
+    index = ContentIndex(tmp_path / "index")
+    index.add_chapters({1: "the dragon sleeps", 2: "a knight rides", 3: "the dragon wakes"})
+    assert [hit[0] for hit in index.search("dragon")] == [1, 3]
+    assert index.search("the dragon wakes") == [(3, 0, 3)]
+
+    index.add_chapter(1, "nothing to see")
+    assert [hit[0] for hit in index.search("dragon")] == [3]
+    assert index.search("dragon", limit=1) == [(3, 4, 1)]
+
+
+def test_tiered_merges_keep_writes_near_linear(tmp_path, monkeypatch):
+    written = []
+    write_segment = content_index.write_segment
+
+    def counting_write_segment(path, chapters):
+        written.append(len(chapters))
+        write_segment(path, chapters)
+
+    monkeypatch.setattr(content_index, "write_segment", counting_write_segment)
+    index = ContentIndex(tmp_path / "index")
+    chapters = 300
+    for number in range(chapters):
+        index.add_chapter(number, chapter_text(number))
+        assert len(index._segment_paths()) <= MAX_SEGMENTS
+
+    # Every chapter is rewritten once per tier (log4(300) < 5), not once per merge of everything
+    assert sum(written) < chapters * 6
+    assert [hit[0] for hit in index.search("dragon knight")] == list(range(chapters))
+    assert index.search("chapter123") == [(123, 0, 1)]
+
+
+def test_merges_keep_newer_postings(tmp_path):
+    index = ContentIndex(tmp_path / "index")
+    for number in range(20):
+        index.add_chapter(number, chapter_text(number))
+    index.add_chapter(5, "rewritten")
+    for number in range(20, 40):
+        index.add_chapter(number, chapter_text(number))
+    index.merge()
+
+    assert len(index._segment_paths()) == 1
+    assert 5 not in [hit[0] for hit in index.search("dragon")]
+    assert index.search("rewritten") == [(5, 0, 1)]
+
+
+def test_search_survives_segments_merged_away(tmp_path, monkeypatch):
+    index = ContentIndex(tmp_path / "index")
+    for number in range(3):
+        index.add_chapter(number, chapter_text(number))
+    stale = index._segment_paths()
+    index.merge()
+
+    # The first listing still names the segments the merge deleted
+    listings = [stale]
+    segment_paths = ContentIndex._segment_paths
+    monkeypatch.setattr(
+        ContentIndex, "_segment_paths", lambda self: listings.pop() if listings else segment_paths(self)
+    )
+    assert [hit[0] for hit in index.search("dragon")] == [0, 1, 2]
+
+
+def test_concurrent_saves(tmp_path):
+    directory = tmp_path / "index"
+
+    def save(number):
+        # Every save builds its own ContentIndex, as StorageService does
+        ContentIndex(directory).add_chapter(number, chapter_text(number))
+        ContentIndex(directory).search("dragon")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(save, range(200)))
+
+    assert [hit[0] for hit in ContentIndex(directory).search("dragon")] == list(range(200))
+
+
+@pytest.mark.anyio
+async def test_storage_search_and_best_effort_indexing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = StorageService()
+    novel = {"_id": ObjectId(), "title": "Saga"}
+    await storage.save_chapter(novel, 1, "the dragon sleeps", "raw")
+
+    def full_disk(self, chapter_number, text):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(ContentIndex, "add_chapter", full_disk)
+    # The chapter is still saved when indexing fails
+    await storage.save_chapter(novel, 2, "the dragon wakes", "raw")
+    assert await storage.get_chapter(novel, 2, "raw") == "the dragon wakes"
+    assert await storage.search_chapters(novel, "dragon") == [{"chapter_number": 1, "occurrences": 1, "snippet": "the dragon sleeps"}]
+
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+    assert await storage.rebuild_content_index(novel) == 2
+    assert [hit["chapter_number"] for hit in await storage.search_chapters(novel, "dragon")] == [1, 2]
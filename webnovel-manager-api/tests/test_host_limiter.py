@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services.host_limiter import HostLimiters, HostLimiter, parse_retry_after
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://novels.example.com/book/1"
+
+
+def limits(limiter: HostLimiter):
+    return limiter.rate, limiter.burst, limiter.max_concurrency
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+async def test_defaults_do_not_cap_declared_limits():
+    limiters = HostLimiters()
+    declared = (10.0, 20, 8)
+    assert limits(limiters.get(URL, *declared)) == declared
+    # A caller without a ScraperConfig, e.g. scraper_service.fetch_html
+    assert limits(limiters.get(URL)) == declared
+    assert limits(limiters.get(URL, *declared)) == declared
+
+
+async def test_declared_limits_replace_defaults_then_stricter_wins():
+    limiters = HostLimiters()
+    assert limits(limiters.get(URL)) == (settings.HOST_REQUESTS_PER_SECOND, settings.HOST_BURST, settings.HOST_MAX_CONCURRENCY)
+    # Looser than the defaults, still applied
+    assert limits(limiters.get(URL, 50.0, 100, 32)) == (50.0, 100, 32)
+    # A second scraper on the host declaring only a stricter rate
+    assert limits(limiters.get(URL, rate=5.0)) == (5.0, 100, 32)
+    assert limits(limiters.get(URL, 50.0, 100, 32)) == (5.0, 100, 32)
+    # Other hosts are untouched
+    assert limiters.get("https://other.example.com/").rate == settings.HOST_REQUESTS_PER_SECOND
+
+
+async def test_concurrency_is_capped():
+    limiter = HostLimiters().get(URL, rate=1000.0, burst=1000, max_concurrency=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(10)))
+    assert peak == 2
+    assert limiter.active == 0
+    assert limiter.requests == 10
+
+
+async def test_waiting_for_a_token_does_not_hold_a_slot():
+    limiter = HostLimiters().get(URL, rate=1.0, burst=1, max_concurrency=2)
+    entered = asyncio.Event()
+    release = asyncio.Event()
+
+    async def first():
+        async with limiter.slot():
+            entered.set()
+            await release.wait()
+
+    holder = asyncio.create_task(first())
+    await entered.wait()
+    # The bucket is empty: the second request waits about a second for its token
+    waiter = asyncio.create_task(limiter.slot().__aenter__())
+    await asyncio.sleep(0.05)
+    assert limiter.active == 1
+    assert limiter.waiting == 1
+
+    waiter.cancel()
+    release.set()
+    await holder
+    assert limiter.active == 0 and limiter.waiting == 0
+
+
+async def test_retry_after_pauses_the_host():
+    limiters = HostLimiters()
+    limiter = limiters.get(URL)
+    assert limiters.honor_retry_after(URL, 200, "30") is None
+    assert limiters.honor_retry_after(URL, 429, "30") == 30
+    assert limiter.snapshot()["blocked_for_seconds"] == pytest.approx(30, abs=0.5)
+    assert limiter.throttled == 1
+
+
+async def test_limits_that_would_stall_are_rejected():
+    with pytest.raises(ValueError):
+        HostLimiter("novels.example.com", 0.0, 1, 1)
+    limiters = HostLimiters()
+    for declared in ({"rate": 0.0}, {"rate": -1.0}, {"burst": 0}, {"max_concurrency": 0}):
+        with pytest.raises(ValueError):
+            limiters.get(URL, **declared)
+    # The limiter is left as it was
+    assert limits(limiters.get(URL)) == (settings.HOST_REQUESTS_PER_SECOND, settings.HOST_BURST, settings.HOST_MAX_CONCURRENCY)
@@ -0,0 +1,166 @@
+import gzip
+import httpx
+import pytest
+from app.services import base_scraper, scraper_service
+from app.services.adaptive_concurrency import AdaptiveConcurrency
+from app.services.base_scraper import BaseScraper, ScraperConfig
+from app.services.host_limiter import HostLimiters
+from app.services.http_cache import HttpCache
+
+pytestmark = pytest.mark.anyio
+
+URL = "https://novels.example.com/book/1"
+PAGE = "<html>" + "chapter list " * 200 + "</html>"
+
+
+class Source:
+    """Answers like a server honoring If-None-Match, recording the headers of every request."""
+
+    def __init__(self, body: str = PAGE, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    async def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        request = httpx.Request("GET", url, headers=headers)
+        if headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, request=request, text=self.body, headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(tmp_path / "http_cache", max_bytes=1024 * 1024, parsed_entries=8)
+
+
+@pytest.fixture
+def source(monkeypatch, cache):
+    source = Source()
+    for module in (base_scraper, scraper_service):
+        monkeypatch.setattr(module, "http_clients", source)
+        monkeypatch.setattr(module, "http_cache", cache)
+        monkeypatch.setattr(module, "host_limiters", HostLimiters())
+    monkeypatch.setattr(base_scraper, "adaptive_concurrency", AdaptiveConcurrency())
+    return source
+
+
+def scraper():
+    return BaseScraper(ScraperConfig(name="test", base_url="https://novels.example.com", content_type="novel", selectors={}, patterns={}))
+
+
+async def test_revalidated_pages_are_served_from_disk(cache, source):
+    first = scraper()
+    assert await first.fetch_html(URL) == PAGE
+    assert not first.last_fetch.unchanged
+
+    second = scraper()
+    assert await second.fetch_html(URL) == PAGE
+    assert source.requests[1]["If-None-Match"] == '"v1"'
+    assert second.last_fetch.revalidated and second.last_fetch.unchanged
+    stats = await cache.stats()
+    assert stats["not_modified"] == 1
+    assert stats["bytes_saved"] == len(PAGE)
+
+
+async def test_304_without_body_downloads_again(cache, source, monkeypatch):
+    await scraper().fetch_html(URL)
+    entry, validators = await cache.lookup(URL)
+    assert validators
+
+    # The body is pruned after lookup() sent its validators
+    lookup = cache.lookup
+
+    async def lookup_then_prune(url):
+        found = await lookup(url)
+        cache._paths(url)[1].unlink()
+        return found
+
+    monkeypatch.setattr(cache, "lookup", lookup_then_prune)
+
+    async def no_backoff(seconds):
+        raise AssertionError("the page must be downloaded again without a retry")
+
+    monkeypatch.setattr(base_scraper.asyncio, "sleep", no_backoff)
+
+    fetcher = scraper()
+    assert await fetcher.fetch_html(URL) == PAGE
+    assert "If-None-Match" in source.requests[1]
+    assert "If-None-Match" not in source.requests[2]
+    assert fetcher.last_fetch.unchanged and not fetcher.last_fetch.revalidated
+    # Cached again for the next revalidation
+    assert cache._paths(URL)[1].exists()
+
+
+async def test_scraper_service_downloads_again_after_304_without_body(cache, source, monkeypatch):
+    assert await scraper_service.fetch_html(URL) == PAGE
+    lookup = cache.lookup
+
+    async def lookup_then_prune(url):
+        found = await lookup(url)
+        cache._paths(url)[1].unlink()
+        return found
+
+    monkeypatch.setattr(cache, "lookup", lookup_then_prune)
+    assert await scraper_service.fetch_html(URL) == PAGE
+    assert len(source.requests) == 3
+
+
+async def test_disk_bytes_count_bodies_only(cache, source):
+    await scraper().fetch_html(URL)
+    meta_path, body_path = cache._paths(URL)
+    assert (await cache.stats())["disk_bytes"] == body_path.stat().st_size == len(gzip.compress(PAGE.encode(), compresslevel=6))
+
+    await cache.forget(URL)
+    assert not meta_path.exists() and not body_path.exists()
+    assert (await cache.stats())["disk_bytes"] == 0
+
+
+async def test_old_bodies_are_pruned(tmp_path):
+    cache = HttpCache(tmp_path / "http_cache", max_bytes=1, parsed_entries=8)
+    request = httpx.Request("GET", URL)
+    response = httpx.Response(200, request=request, text=PAGE, headers={"ETag": '"v1"'})
+    await cache.resolve(URL, None, response)
+    assert not cache._paths(URL)[1].exists()
+    assert (await cache.stats())["disk_bytes"] == 0
+    # The validators are gone with the body, so no 304 can be asked for
+    entry, validators = await cache.lookup(URL)
+    assert entry is not None and validators == {}
+
+
+async def test_bodies_on_disk_are_counted_once_and_pruned_oldest_first(tmp_path):
+    directory = tmp_path / "http_cache"
+    urls = [f"{URL}/{n}" for n in range(3)]
+
+    async def store(cache, url):
+        response = httpx.Response(200, request=httpx.Request("GET", url), text=PAGE, headers={"ETag": '"v1"'})
+        await cache.resolve(url, None, response)
+
+    first = HttpCache(directory, max_bytes=1024 * 1024, parsed_entries=8)
+    for url in urls[:2]:
+        await store(first, url)
+    size = first._paths(urls[0])[1].stat().st_size
+
+    # A new process finds the bodies already on disk, and makes room for a third one
+    second = HttpCache(directory, max_bytes=size * 2, parsed_entries=8)
+    assert (await second.stats())["disk_bytes"] == size * 2
+    await store(second, urls[2])
+    assert [second._paths(url)[1].exists() for url in urls] == [False, False, True]
+    assert (await second.stats())["disk_bytes"] == size
+
+
+async def test_parse_is_skipped_for_an_unchanged_body(cache):
+    parses = []
+
+    def parse():
+        parses.append(1)
+        return {"chapters": [1, 2]}
+
+    first = cache.parse("toc", "hash-1", parse)
+    first["chapters"].append(3)
+    assert cache.parse("toc", "hash-1", parse) == {"chapters": [1, 2]}
+    assert len(parses) == 1
+    cache.parse("toc", "hash-2", parse)
+    assert len(parses) == 2
+    assert (await cache.stats())["parse_skips"] == 1
@@ -0,0 +1,83 @@
+import pytest
+from bson import ObjectId, json_util
+from fastapi import HTTPException
+from app.db.database import NOVEL_COLLECTION
+from app.routers import admin
+from app.services.library_io import library_io, LibraryImportError, EXPORT_FORMAT, EXPORT_VERSION
+
+pytestmark = pytest.mark.anyio
+
+HEADER = json_util.dumps({"type": "header", "format": EXPORT_FORMAT, "version": EXPORT_VERSION})
+
+
+def novel_line(source_url: str) -> str:
+    return json_util.dumps({"type": "novel", "doc": {"_id": ObjectId(), "title": source_url, "source_url": source_url}})
+
+
+async def stream(lines):
+    for line in lines:
+        yield line
+
+
+async def test_rejected_write_reports_committed_lines(db):
+    lines = [
+        HEADER,
+        novel_line("https://example.com/a"),
+        novel_line("https://example.com/b"),
+        # Same source_url as line 2 under another _id
+        novel_line("https://example.com/a"),
+        novel_line("https://example.com/c"),
+    ]
+    checkpoints = []
+
+    async def on_commit(committed):
+        checkpoints.append(committed)
+
+    with pytest.raises(LibraryImportError) as error:
+        await library_io.import_lines(db, stream(lines), batch_size=2, on_commit=on_commit)
+    assert error.value.committed_lines == 3
+    assert checkpoints == [3]
+    assert "Line 4 rejected" in str(error.value)
+
+    # Resuming after the fixed line imports the rest
+    lines[3] = novel_line("https://example.com/d")
+    stats = await library_io.import_lines(db, stream(lines), skip_lines=error.value.committed_lines)
+    assert stats["lines"] == 5 and stats["novels"] == 2
+    assert await db[NOVEL_COLLECTION].count_documents({}) == 4
+
+
+async def test_malformed_line_reports_committed_lines(db):
+    lines = [HEADER, novel_line("https://example.com/a"), "{not json"]
+    with pytest.raises(LibraryImportError) as error:
+        await library_io.import_lines(db, stream(lines))
+    assert error.value.committed_lines == 2
+    assert await db[NOVEL_COLLECTION].count_documents({}) == 1
+
+
+async def test_bad_extended_json_reports_committed_lines(db):
+    lines = [
+        HEADER,
+        novel_line("https://example.com/a"),
+        novel_line("https://example.com/b"),
+        '{"type": "novel", "doc": {"_id": {"$oid": "zz"}, "title": "c", "source_url": "https://example.com/c"}}',
+    ]
+    with pytest.raises(LibraryImportError) as error:
+        await library_io.import_lines(db, stream(lines), batch_size=1)
+    assert error.value.committed_lines == 3
+    assert "Line 4" in str(error.value)
+    assert await db[NOVEL_COLLECTION].count_documents({}) == 2
+
+
+async def test_import_endpoint_exposes_checkpoint(db):
+    body = "\n".join([HEADER, novel_line("https://example.com/a"), novel_line("https://example.com/a")])
+
+    class Body:
+        async def stream(self):
+            yield body.encode("utf-8")
+
+    with pytest.raises(HTTPException) as error:
+        await admin.import_library(Body(), skip_lines=0, db=db)
+    assert error.value.status_code == 400
+    # Both novels were in the one rejected batch
+    assert error.value.detail["committed_lines"] == 0
+    assert "Line 3 rejected" in error.value.detail["message"]
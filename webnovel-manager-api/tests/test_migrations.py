@@ -0,0 +1,45 @@
+import pytest
+from bson import ObjectId
+from app.db.database import NOVEL_COLLECTION, CHAPTER_COLLECTION
+from app.db.migrations.m002_embedded_chapters import EmbeddedChapters
+from app.db.migrations.runner import MigrationContext
+
+pytestmark = pytest.mark.anyio
+
+
+def embedded(number, title):
+    chapter = {"title": title, "chapter_title": title, "url": f"https://example.com/{title}", "read": False}
+    if number is not None:
+        chapter["chapter_number"] = number
+    return chapter
+
+
+async def test_embedded_chapters_keep_novels_with_unkeyable_chapters(db):
+    clean, duplicated, unnumbered = ObjectId(), ObjectId(), ObjectId()
+    await db[NOVEL_COLLECTION].insert_many([
+        {"_id": clean, "title": "Clean", "source_url": "https://example.com/clean",
+         "chapters": [embedded(1, "one"), embedded(2, "two")]},
+        # 001_chapter_numbers numbers both prologues 0
+        {"_id": duplicated, "title": "Duplicated", "source_url": "https://example.com/duplicated",
+         "chapters": [embedded(0, "prologue"), embedded(0, "side story"), embedded(1, "one")]},
+        {"_id": unnumbered, "title": "Unnumbered", "source_url": "https://example.com/unnumbered",
+         "chapters": [embedded(1, "one"), embedded(None, "extra")]},
+    ])
+
+    stats = await EmbeddedChapters().run(MigrationContext(db, batch_size=2))
+
+    assert stats["chapters"] == 2
+    assert stats["novels"] == 1
+    assert stats["kept_novels"] == sorted([str(duplicated), str(unnumbered)])
+    assert await db[CHAPTER_COLLECTION].count_documents({"novel_id": clean}) == 2
+    assert await db[CHAPTER_COLLECTION].count_documents({"novel_id": {"$in": [duplicated, unnumbered]}}) == 0
+    # Nothing is lost: the unkeyable novels still have every embedded chapter
+    kept = await db[NOVEL_COLLECTION].find_one({"_id": duplicated})
+    assert [chapter["title"] for chapter in kept["chapters"]] == ["prologue", "side story", "one"]
+    assert "chapters" not in await db[NOVEL_COLLECTION].find_one({"_id": clean})
+
+    # Once the numbers are fixed a re-run moves them
+    await db[NOVEL_COLLECTION].update_one({"_id": duplicated}, {"$set": {"chapters.1.chapter_number": -1}})
+    stats = await EmbeddedChapters().run(MigrationContext(db, batch_size=2))
+    assert stats["kept_novels"] == [str(unnumbered)]
+    assert await db[CHAPTER_COLLECTION].count_documents({"novel_id": duplicated}) == 3
@@ -0,0 +1,50 @@
+import pytest
+from fastapi import HTTPException
+from app.db.database import NOVEL_COLLECTION
+from app.db.loader import NovelLoader
+from app.models.novel import NovelCreate, NovelUpdate
+from app.routers import novels
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_novel_rejects_duplicates_before_scraping(db, monkeypatch):
+    scraped = []
+
+    async def scrape_novel_info(url, source_name):
+        scraped.append(url)
+        return {"title": "Scraped", "description": "Scraped", "cover_image_url": None, "tags": [], "status": "Ongoing"}
+
+    monkeypatch.setattr(novels, "scrape_novel_info", scrape_novel_info)
+    await novels.create_novel(NovelCreate(title="A", source_url="https://example.com/a", source_name="Example"), db)
+    assert len(scraped) == 1
+
+    with pytest.raises(HTTPException) as error:
+        await novels.create_novel(NovelCreate(title="A", source_url="https://example.com/a", source_name="Example"), db)
+    assert error.value.status_code == 409
+    assert len(scraped) == 1
+
+
+async def test_create_novel_without_unique_index(db, monkeypatch):
+    async def scrape_novel_info(url, source_name):
+        raise AssertionError("a duplicate must not be scraped")
+
+    monkeypatch.setattr(novels, "scrape_novel_info", scrape_novel_info)
+    await db[NOVEL_COLLECTION].drop_indexes()
+    await db[NOVEL_COLLECTION].insert_one({"title": "A", "description": "A", "source_url": "https://example.com/a"})
+
+    with pytest.raises(HTTPException) as error:
+        await novels.create_novel(NovelCreate(title="A", source_url="https://example.com/a", source_name="Example"), db)
+    assert error.value.status_code == 409
+    assert await db[NOVEL_COLLECTION].count_documents({}) == 1
+
+
+async def test_update_novel_to_existing_source_url_conflicts(db):
+    await db[NOVEL_COLLECTION].insert_one({"title": "A", "source_url": "https://example.com/a"})
+    other = await db[NOVEL_COLLECTION].insert_one({"title": "B", "source_url": "https://example.com/b"})
+
+    with pytest.raises(HTTPException) as error:
+        await novels.update_novel(
+            other.inserted_id, NovelUpdate(source_url="https://example.com/a"), db, NovelLoader(db), "alice"
+        )
+    assert error.value.status_code == 409
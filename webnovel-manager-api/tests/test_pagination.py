@@ -0,0 +1,70 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.db.database import NOVEL_COLLECTION
+from app.db.pagination import encode_cursor, decode_cursor, InvalidCursor
+from app.routers.novels import _load_novels_page
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cursor_round_trip():
+    last_id = ObjectId()
+    cursor = encode_cursor("title", "asc", "Omniscient", last_id)
+    assert decode_cursor(cursor, "title", "asc") == ("Omniscient", last_id)
+
+
+def test_cursor_checks_the_sort():
+    cursor = encode_cursor("title", "asc", None, ObjectId())
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "title", "desc")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not a cursor", "title", "asc")
+
+
+async def collect(db, sort_order, limit):
+    """Every page of the listing sorted by last_updated_chapters, following next_cursor."""
+    titles, cursor = [], None
+    while True:
+        page = await _load_novels_page(db, 0, limit, None, "last_updated_chapters", sort_order, cursor)
+        titles.extend(novel["title"] for novel in page["novels"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return titles
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", [1, 2, 3])
+async def test_keyset_pages_cover_every_novel_once(db, sort_order, limit):
+    # Ties on the sort key, and never fetched novels whose key is null or missing
+    day = [datetime(2025, 1, d) for d in (1, 2, 3)]
+    updated = {"a": day[1], "b": day[0], "c": day[2], "d": day[1], "e": day[0], "f": None, "g": None}
+    documents = [{"title": title, "last_updated_chapters": value} for title, value in updated.items()]
+    documents.append({"title": "h"})
+    await db[NOVEL_COLLECTION].insert_many([
+        {**document, "added_at": day[0], "source_url": f"https://example.com/{document['title']}"}
+        for document in documents
+    ])
+
+    titles = await collect(db, sort_order, limit)
+    assert sorted(titles) == list("abcdefgh")
+    ids = {novel["title"]: novel["_id"] async for novel in db[NOVEL_COLLECTION].find()}
+    # Null and missing keys sort first, ties by _id
+    order = sorted(titles, key=lambda title: (updated.get(title) is not None, updated.get(title) or day[0], ids[title]))
+    assert titles == (order if sort_order == "asc" else order[::-1])
+
+
+async def test_page_size_limits(db):
+    await db[NOVEL_COLLECTION].insert_many([
+        {"title": f"Novel {i}", "source_url": f"https://example.com/{i}", "added_at": datetime(2024, 1, i + 1)}
+        for i in range(3)
+    ])
+    # Offset mode keeps accepting any limit, 0 meaning all of them
+    assert len(await _load_novels_page(db, 0, 0, None, None, "desc", None)) == 3
+    assert len(await _load_novels_page(db, 1, 1000, None, None, "desc", None)) == 2
+    # Keyset pages are capped
+    for limit in (0, 501):
+        with pytest.raises(HTTPException) as error:
+            await _load_novels_page(db, 0, limit, None, "added_at", "desc", None)
+        assert error.value.status_code == 400
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+import pytest
+from app.core.cache import search_facet_cache
+from app.db.database import NOVEL_COLLECTION
+from app.services.search_service import search_service, search_filter
+
+pytestmark = pytest.mark.anyio
+
+PROJECTION = {"title": 1}
+
+
+class RecordingDb:
+    """Passes collections through, remembering every aggregation pipeline run on them."""
+
+    def __init__(self, db):
+        self.db = db
+        self.pipelines = []
+
+    def __getitem__(self, name):
+        collection = self.db[name]
+        recording = self
+
+        class Collection:
+            def aggregate(self, pipeline):
+                recording.pipelines.append(pipeline)
+                return collection.aggregate(pipeline)
+
+        return Collection()
+
+
+@pytest.fixture
+async def library(db):
+    search_facet_cache.clear()
+    start = datetime(2024, 1, 1)
+    await db[NOVEL_COLLECTION].insert_many([
+        {
+            "title": f"Novel {i}",
+            "source_url": f"https://example.com/{i}",
+            "status": "Ongoing" if i % 3 else "Completed",
+            "source_name": "Example",
+            "source_language": "en",
+            "tags": ["fantasy", "action"] if i % 2 else ["fantasy"],
+            "added_at": start + timedelta(days=i),
+        }
+        for i in range(7)
+    ])
+    yield db
+    search_facet_cache.clear()
+
+
+async def test_pages_are_sorted_outside_facet(library):
+    db = RecordingDb(library)
+    found = await search_service.search(db, search_filter(), PROJECTION, skip=2, limit=2)
+
+    assert [novel["title"] for novel in found["results"]] == ["Novel 4", "Novel 3"]
+    assert found["total"] == 7
+    assert found["facets"]["status"] == [{"value": "Ongoing", "count": 4}, {"value": "Completed", "count": 3}]
+    assert found["facets"]["tags"] == [{"value": "fantasy", "count": 7}, {"value": "action", "count": 3}]
+    # The page is its own query, sorted right after $match where the added_at index serves it
+    assert len(db.pipelines) == 2
+    for pipeline in db.pipelines:
+        facet = next((stage["$facet"] for stage in pipeline if "$facet" in stage), None)
+        if facet is None:
+            assert list(pipeline[1]) == ["$sort"]
+        else:
+            assert "results" not in facet
+            assert not any("$sort" in stage for stage in facet["total"])
+
+
+async def test_later_pages_reuse_cached_facets(library):
+    db = RecordingDb(library)
+    query = search_filter(tags=["action"])
+    first = await search_service.search(db, query, PROJECTION, skip=0, limit=2)
+    second = await search_service.search(db, query, PROJECTION, skip=2, limit=2)
+
+    assert [novel["title"] for novel in first["results"]] == ["Novel 5", "Novel 3"]
+    assert [novel["title"] for novel in second["results"]] == ["Novel 1"]
+    assert second["total"] == first["total"] == 3
+    assert second["facets"] == first["facets"]
+    # Two queries for the first page, only the results for the second
+    assert len(db.pipelines) == 3
+    assert not any("$facet" in stage for stage in db.pipelines[-1])
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.cache import novel_detail_cache
+from app.core.config import settings
+from app.core.users import get_user_id
+from app.db.database import CHAPTER_COLLECTION, NOVEL_COLLECTION, READING_PROGRESS_COLLECTION
+from app.db.loader import NovelLoader
+from app.db.migrations.m004_user_progress import UserProgress
+from app.db.migrations.runner import MigrationContext
+from app.routers import novels
+from app.services.chapter_state_service import chapter_state_service, chapter_selection
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_novel(db, chapters):
+    novel_id = (await db[NOVEL_COLLECTION].insert_one({
+        "title": "Shared",
+        "source_url": f"https://example.com/{ObjectId()}",
+        "source_name": "Example",
+        "total_chapters": len(chapters),
+        "added_at": datetime(2024, 1, 1),
+        "version": 0,
+    })).inserted_id
+    await db[CHAPTER_COLLECTION].insert_many([{"novel_id": novel_id, "chapter_number": n} for n in chapters])
+    return novel_id
+
+
+def test_user_id_header():
+    assert get_user_id(None) == settings.DEFAULT_USER_ID
+    assert get_user_id("") == settings.DEFAULT_USER_ID
+    assert get_user_id("bob@home") == "bob@home"
+    with pytest.raises(HTTPException) as error:
+        get_user_id("bob smith")
+    assert error.value.status_code == 400
+
+
+async def test_users_keep_their_own_progress(db):
+    novel_id = await add_novel(db, range(1, 11))
+    novel_before = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+
+    await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(end=8), read=True)
+    await chapter_state_service.mark(db, "bob", novel_id, chapter_selection(numbers=[2]), read=True, downloaded=True)
+    await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(numbers=[3]), read=False)
+
+    alice = await chapter_state_service.get_state(db, "alice", novel_id)
+    bob = await chapter_state_service.get_state(db, "bob", novel_id)
+    assert (alice["read_chapters"], alice["downloaded_chapters"]) == (6, 0)
+    assert (bob["read_chapters"], bob["downloaded_chapters"]) == (1, 1)
+    assert 3 not in (await chapter_state_service.get_progress(db, "alice", novel_id))["read"]
+    # Progress writes never touch the shared novel document
+    assert await db[NOVEL_COLLECTION].find_one({"_id": novel_id}) == novel_before
+
+    states = await chapter_state_service.get_states(db, "bob", [novel_id, ObjectId()])
+    assert list(states) == [novel_id]
+
+
+async def test_refresh_recounts_every_user(db):
+    novel_id = await add_novel(db, range(1, 6))
+    await chapter_state_service.mark(db, "alice", novel_id, chapter_selection(), read=True)
+    await chapter_state_service.mark(db, "bob", novel_id, chapter_selection(start=3), read=True)
+
+    # New chapters fall inside both users' ranges
+    await db[CHAPTER_COLLECTION].insert_many([{"novel_id": novel_id, "chapter_number": n} for n in (6, 7)])
+    assert await chapter_state_service.refresh_counters(db, novel_id) == 2
+
+    assert (await chapter_state_service.get_state(db, "alice", novel_id))["read_chapters"] == 7
+    assert (await chapter_state_service.get_state(db, "bob", novel_id))["read_chapters"] == 5
+
+
+async def test_novel_detail_shows_the_users_progress(db):
+    novel_detail_cache.clear()
+    novel_id = await add_novel(db, range(1, 11))
+
+    await novels.update_reading_progress(novel_id, 6, db, NovelLoader(db), "alice")
+    # The second read is served from the shared detail cache
+    for _ in range(2):
+        alice = json.loads((await novels.get_novel_by_id(novel_id, db, "alice")).body)
+        bob = json.loads((await novels.get_novel_by_id(novel_id, db, "bob")).body)
+        assert (alice["read_chapters"], alice["reading_progress"]) == (5, 50)
+        assert (bob["read_chapters"], bob["reading_progress"]) == (0, 0)
+    novel_detail_cache.clear()
+
+
+async def test_migration_moves_novel_progress_to_the_default_user(db):
+    with_progress = await add_novel(db, range(1, 5))
+    without_progress = await add_novel(db, range(1, 5))
+    await db[NOVEL_COLLECTION].update_one(
+        {"_id": with_progress},
+        {"$set": {"progress": {"read": [[1, 2]], "downloaded": [[1, 4]]}, "read_chapters": 2, "downloaded_chapters": 4}}
+    )
+    await db[NOVEL_COLLECTION].update_one({"_id": without_progress}, {"$set": {"read_chapters": 0}})
+
+    stats = await UserProgress().run(MigrationContext(db, batch_size=10))
+
+    assert stats["novels_cleaned"] == 2
+    state = await chapter_state_service.get_state(db, settings.DEFAULT_USER_ID, with_progress)
+    assert state["read"] == [[1, 2]] and state["read_chapters"] == 2 and state["downloaded_chapters"] == 4
+    assert await db[READING_PROGRESS_COLLECTION].count_documents({}) == 1
+    for novel in await db[NOVEL_COLLECTION].find({}).to_list(length=None):
+        assert not {"progress", "read_chapters", "downloaded_chapters"} & set(novel)
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from bson import ObjectId
+from app.db import versioning
+from app.db.database import CHAPTER_COLLECTION, NOVEL_COLLECTION
+from app.db.versioning import update_versioned, versioned_update_stats, ConcurrentUpdateError, VERSION_FIELD
+from app.services import chapter_state_service as chapter_state_module
+from app.services.chapter_state_service import chapter_state_service, chapter_selection
+
+pytestmark = pytest.mark.anyio
+
+WRITERS = 8
+
+
+def racing(compute):
+    """`compute` that lets every other writer read the same version before it writes."""
+    async def compute_then_yield(document, attempt):
+        update = await compute(document, attempt)
+        await asyncio.sleep(0)
+        return update
+    return compute_then_yield
+
+
+async def test_concurrent_writers_merge(db):
+    novel_id = (await db[NOVEL_COLLECTION].insert_one({"title": "Race", "tags": [], VERSION_FIELD: 0})).inserted_id
+    conflicts = versioned_update_stats["conflicts"]
+
+    async def add_tag(tag):
+        async def compute(novel, attempt):
+            return {"$set": {"tags": [*novel["tags"], tag]}}
+        return await update_versioned(db, NOVEL_COLLECTION, {"_id": novel_id}, racing(compute), {"tags": 1})
+
+    await asyncio.gather(*(add_tag(f"tag-{i}") for i in range(WRITERS)))
+
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    # A blind $set would keep only the last writer's tag
+    assert sorted(novel["tags"]) == sorted(f"tag-{i}" for i in range(WRITERS))
+    assert novel[VERSION_FIELD] == WRITERS
+    assert versioned_update_stats["conflicts"] > conflicts
+
+
+async def test_concurrent_marks_keep_every_chapter(db, monkeypatch):
+    novel_id = ObjectId()
+    await db[CHAPTER_COLLECTION].insert_many([{"novel_id": novel_id, "chapter_number": n} for n in range(1, 41)])
+
+    async def racing_update_versioned(db, collection, key, compute, *args, **kwargs):
+        return await update_versioned(db, collection, key, racing(compute), *args, **kwargs)
+
+    monkeypatch.setattr(chapter_state_module, "update_versioned", racing_update_versioned)
+    conflicts = versioned_update_stats["conflicts"]
+
+    async def marker(offset):
+        # The first marks race to create the progress document itself
+        for number in range(offset + 1, 41, WRITERS):
+            await chapter_state_service.mark(db, "alice", novel_id, chapter_selection([number]), read=True)
+
+    await asyncio.gather(*(marker(offset) for offset in range(WRITERS)))
+
+    progress = await chapter_state_service.get_progress(db, "alice", novel_id)
+    assert progress["read"].to_list() == [[1, 40]]
+    state = await chapter_state_service.get_state(db, "alice", novel_id)
+    assert state["read_chapters"] == 40
+    assert state[VERSION_FIELD] == 40
+    assert versioned_update_stats["conflicts"] > conflicts
+
+
+async def test_gives_up_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(versioning, "MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(versioning, "RETRY_BACKOFF_SECONDS", 0)
+    novel_id = (await db[NOVEL_COLLECTION].insert_one({"title": "Busy", VERSION_FIELD: 0})).inserted_id
+    exhausted = versioned_update_stats["exhausted"]
+    attempts = []
+
+    async def compute(novel, attempt):
+        attempts.append(attempt)
+        # Another writer always gets there first
+        await db[NOVEL_COLLECTION].update_one({"_id": novel_id}, {"$inc": {VERSION_FIELD: 1}})
+        return {"$set": {"title": "Mine"}}
+
+    with pytest.raises(ConcurrentUpdateError):
+        await update_versioned(db, NOVEL_COLLECTION, {"_id": novel_id}, compute, {"title": 1})
+
+    assert attempts == [0, 1, 2]
+    assert versioned_update_stats["exhausted"] == exhausted + 1
+    novel = await db[NOVEL_COLLECTION].find_one({"_id": novel_id})
+    assert novel["title"] == "Busy"
+    assert novel[VERSION_FIELD] == 3
@@ -170,9 +170,11 @@ export function useNovel(id: string) {
       }
 
       if (response.data) {
-        const newChapters = response.data.chapters
-        if (JSON.stringify(chapters) !== JSON.stringify(newChapters)) {
-          setChapters(newChapters)
+        // The API only returns the delta, so reload the visible page when something changed
+        const { added_count, changed_count, removed_count } = response.data
+        if (added_count + changed_count + removed_count > 0) {
+          await fetchNovel(isReversed ? "desc" : "asc")
+          return
         }
         
         if (novel) {
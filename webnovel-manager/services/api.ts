@@ -1,4 +1,4 @@
-import type { Novel, NovelDetail, Chapter, ChapterDownloadResponse, ApiResponse, ChapterListResponse, ManhwaResponse } from "@/types"
+import type { Novel, NovelDetail, Chapter, ChapterDownloadResponse, ApiResponse, ChapterListResponse, ChapterFetchResponse, ContinueReadingItem, NovelBatchItem, NovelSearchResponse, ManhwaResponse } from "@/types"
 import { API_BASE_URL, ERROR_MESSAGES, STORAGE_KEYS } from "@/constants"
 
 // Generic API client with error handling
@@ -66,6 +66,28 @@ export const novelsAPI = {
   getAll: async () => {
     return client<Novel[]>("/novels")
   },
+  getMany: async (ids: string[]) => {
+    return client<{ results: NovelBatchItem[] }>("/novels/batch", { data: { ids } })
+  },
+  search: async (
+    q?: string,
+    filters: { status?: string; source_name?: string; source_language?: string; tags?: string[] } = {},
+    skip: number = 0,
+    limit: number = 20
+  ) => {
+    const params = new URLSearchParams()
+    if (q) params.append("q", q)
+    if (filters.status) params.append("status", filters.status)
+    if (filters.source_name) params.append("source_name", filters.source_name)
+    if (filters.source_language) params.append("source_language", filters.source_language)
+    filters.tags?.forEach((tag) => params.append("tags", tag))
+    params.append("skip", skip.toString())
+    params.append("limit", limit.toString())
+    return client<NovelSearchResponse>(`/novels/search?${params.toString()}`)
+  },
+  getContinueReading: async (limit: number = 50) => {
+    return client<ContinueReadingItem[]>(`/novels/continue-reading?limit=${limit}`)
+  },
   getById: async (id: string) => {
     return client<NovelDetail>(`/novels/${id}`)
   },
@@ -171,7 +193,7 @@ export const chaptersAPI = {
       }
     })
   },
-  fetchFromSource: async (novelId: string): Promise<ApiResponse<ChapterListResponse>> => {
+  fetchFromSource: async (novelId: string): Promise<ApiResponse<ChapterFetchResponse>> => {
     try {
       const response = await fetch(`${API_BASE_URL}/novels/${novelId}/chapters/fetch`, {
         method: "POST",
@@ -170,3 +170,43 @@ export interface ChapterListResponse {
   page_size: number;
   total_pages: number;
 }
+
+export interface ChapterFetchResponse {
+  added: Chapter[];
+  changed: Chapter[];
+  removed: number[];
+  added_count: number;
+  changed_count: number;
+  removed_count: number;
+  unchanged_count: number;
+  total: number;
+}
+
+export interface ContinueReadingItem {
+  _id: string;
+  title: string;
+  cover_image_url: string | null;
+  type: string;
+  total_chapters: number;
+  read_chapters: number;
+  unread_chapters: number;
+  last_updated_chapters: string | null;
+  next_chapter: Omit<Chapter, "read" | "downloaded"> | null;
+}
+
+export interface FacetCount {
+  value: string | null;
+  count: number;
+}
+
+export interface NovelSearchResponse {
+  results: (NovelSummary & { score: number | null })[];
+  total: number;
+  facets: Record<"status" | "source_name" | "source_language" | "tags", FacetCount[]>;
+}
+
+export interface NovelBatchItem {
+  id: string;
+  found: boolean;
+  novel: NovelSummary | null;
+}